@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Measure per-step workflow overhead as episode history grows.
+
+Agents are stubs (no LLM, no tools), so the timings isolate graph and state bookkeeping.
+With append-only channels the late-step cost should match the early-step cost.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+from manus_three_agent.core import CriticOutput, PlanOutput, PlanStep, WorkerOutput, build_initial_state
+from manus_three_agent.environments.simulator import GenericSimulatorEnvironment
+from manus_three_agent.graph import build_workflow, recursion_limit_for
+
+
+class _StubArchitect:
+    def __init__(self, num_steps: int) -> None:
+        self.num_steps = num_steps
+
+    def plan(self, **_: object) -> PlanOutput:
+        return PlanOutput(steps=[PlanStep(title=f"step {i}") for i in range(self.num_steps)])
+
+
+class _StubWorker:
+    def execute(self, *, step_index: int, **_: object) -> WorkerOutput:
+        return WorkerOutput(summary=f"step {step_index}", output="x" * 200)
+
+
+class _StubCritic:
+    def review(self, **_: object) -> CriticOutput:
+        return CriticOutput(decision="continue", feedback="Proceed to next step.")
+
+
+class _TimedEnvironment(GenericSimulatorEnvironment):
+    def __init__(self) -> None:
+        self.stamps: list[float] = []
+
+    def step(self, **kwargs):  # type: ignore[override]
+        self.stamps.append(time.perf_counter())
+        return super().step(**kwargs)
+
+
+def run(max_steps: int) -> dict[str, float]:
+    environment = _TimedEnvironment()
+    workflow = build_workflow(_StubArchitect(max_steps), _StubWorker(), _StubCritic(), environment)  # type: ignore[arg-type]
+    state = build_initial_state(
+        goal="benchmark",
+        observation="ready",
+        max_steps=max_steps,
+        dynamic_replanning=True,
+        use_cot=False,
+        agentic_mode="codeact",
+    )
+    started = time.perf_counter()
+    final_state = workflow.invoke(state, config={"recursion_limit": recursion_limit_for(max_steps)})
+    elapsed = time.perf_counter() - started
+
+    deltas = [(b - a) * 1000 for a, b in zip(environment.stamps, environment.stamps[1:])]
+    decile = max(1, len(deltas) // 10)
+    early = statistics.median(deltas[:decile])
+    late = statistics.median(deltas[-decile:])
+    return {
+        "steps": float(final_state["step_count"]),
+        "total_s": round(elapsed, 3),
+        "early_step_ms": round(early, 3),
+        "late_step_ms": round(late, 3),
+        "late_to_early": round(late / early, 2) if early > 0 else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark per-step overhead for long episodes.")
+    parser.add_argument("--max-steps", type=int, nargs="+", default=[100, 500, 2000])
+    args = parser.parse_args()
+
+    for max_steps in args.max_steps:
+        result = run(max_steps)
+        print(" ".join(f"{key}={value}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+import time
+from collections.abc import Sequence
 from typing import Any
 
-from manus_three_agent.core.schemas import PlanOutput, PlanStep
-from manus_three_agent.core.types import ModelConfig
+from manus_three_agent.core.schemas import PlanOutput, PlanRevision, PlanStep, WorkerOutput
+from manus_three_agent.core.types import ContextPolicyConfig, ModelConfig, PlanLibraryConfig
 from manus_three_agent.prompts import PromptTemplates
 from manus_three_agent.tracing import TraceCollector
+from manus_three_agent.utils.cascade import CascadeStats, ModelCascade
+from manus_three_agent.utils.context_window import HistoryWindow
+from manus_three_agent.utils.deadline import Deadline
 from manus_three_agent.utils.llm import LLMClient
+from manus_three_agent.utils.llm_runtime import LLMRuntime
+from manus_three_agent.utils.plan_library import PlanLibrary, PlanRecord
+from manus_three_agent.utils.replay import ReplayStore
 
 
 class ArchitectAgent:
@@ -17,47 +25,168 @@ class ArchitectAgent:
         tracer: TraceCollector | None = None,
         force_mock: bool = False,
         agentic_mode: str = "codeact",
+        replay: ReplayStore | None = None,
+        context_policy: ContextPolicyConfig | None = None,
+        first_action: bool = False,
+        plan_library: PlanLibrary | None = None,
+        plan_library_config: PlanLibraryConfig | None = None,
+        deadline: Deadline | None = None,
+        cascade_stats: CascadeStats | None = None,
+        llm_runtime: LLMRuntime | None = None,
     ) -> None:
         self.model_config = model_config
         self.prompts = prompts
         self.tracer = tracer
         self.force_mock = force_mock
         self.agentic_mode = agentic_mode
-        self.llm = LLMClient(trace_hook=self._on_llm_trace)
+        self.first_action = first_action
+        self.plan_library = plan_library
+        self.plan_library_config = plan_library_config or PlanLibraryConfig()
+        self.deadline = deadline
+        self.llm = LLMClient(trace_hook=self._on_llm_trace, replay=replay, deadline=deadline, runtime=llm_runtime)
+        self.cascade = ModelCascade(self.llm, model_config, role="architect", tracer=tracer, stats=cascade_stats)
+        self.history_window = HistoryWindow(context_policy or ContextPolicyConfig())
 
     def plan(
         self,
         *,
         goal: str,
         observation: str,
-        action_history: list[dict[str, Any]],
+        action_history: Sequence[dict[str, Any]],
         use_cot: bool,
         step: int,
     ) -> PlanOutput:
+        reference: PlanRecord | None = None
+        if self.plan_library is not None and not action_history:
+            reference, reused = self._consult_library(self.plan_library, goal, step=step)
+            if reused is not None:
+                return reused
+
         if self.force_mock or not self.llm.enabled:
             return self._mock_plan(goal)
 
+        # Only the opening plan also proposes the first worker action.
+        with_first_action = self.first_action and not action_history
+        role = "architect"
+        if with_first_action:
+            role = "architect_first_action"
+        elif reference is not None:
+            role = "architect_warm_start"
+        history_view, context_stats = self.history_window.render(action_history)
         system_prompt, user_prompt = self.prompts.render(
-            "architect",
+            role,
             goal=goal,
             observation=observation,
-            action_history=action_history,
+            action_history=history_view,
             use_cot=use_cot,
             agentic_mode=self.agentic_mode,
             mode_guideline=self._mode_guideline(),
+            **self.cascade.prompt_vars("this plan reaches the goal."),
+            reference_goal=reference.goal if reference else "",
+            reference_plan=reference.steps if reference else [],
         )
-        raw = self.llm.chat_json(
-            model=self.model_config.model,
+        raw = self.cascade.chat_json(
             system_prompt=system_prompt,
             user_prompt=user_prompt,
-            generation_config=self.model_config.to_openai_chat_params(),
-            trace_context={"agent": "architect", "step": step, "agentic_mode": self.agentic_mode},
+            trace_context={
+                "agent": "architect",
+                "step": step,
+                "agentic_mode": self.agentic_mode,
+                **({"context": context_stats} if context_stats else {}),
+                **({"warm_start": reference.run_id} if role == "architect_warm_start" else {}),
+            },
+            accept=_validate_plan,
         )
         steps = [PlanStep.model_validate(item) for item in raw.get("steps", [])]
         if not steps:
             return self._mock_plan(goal)
+        first_action = raw.get("first_action") if with_first_action else None
+        if isinstance(first_action, dict):
+            try:
+                return PlanOutput(steps=steps, first_action=WorkerOutput.model_validate(first_action))
+            except ValueError:
+                pass
         return PlanOutput(steps=steps)
 
+    def replan(
+        self,
+        *,
+        goal: str,
+        observation: str,
+        action_history: Sequence[dict[str, Any]],
+        completed_steps: list[PlanStep],
+        remaining_steps: list[PlanStep],
+        feedback: str,
+        use_cot: bool,
+        step: int,
+    ) -> PlanRevision:
+        """Revise only the unexecuted suffix: keep a prefix of ``remaining_steps`` and append new steps."""
+        if self.force_mock or not self.llm.enabled:
+            return PlanRevision(keep=len(remaining_steps))
+
+        history_view, context_stats = self.history_window.render(action_history)
+        system_prompt, user_prompt = self.prompts.render(
+            "architect_replan",
+            goal=goal,
+            observation=observation,
+            action_history=history_view,
+            completed_steps=[plan_step.title for plan_step in completed_steps],
+            remaining_steps=[plan_step.model_dump() for plan_step in remaining_steps],
+            feedback=feedback,
+            use_cot=use_cot,
+            agentic_mode=self.agentic_mode,
+            mode_guideline=self._mode_guideline(),
+            **self.cascade.prompt_vars("this plan reaches the goal."),
+        )
+        raw = self.cascade.chat_json(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            trace_context={
+                "agent": "architect",
+                "step": step,
+                "agentic_mode": self.agentic_mode,
+                "replan": {"completed_steps": len(completed_steps), "remaining_steps": len(remaining_steps)},
+                **({"context": context_stats} if context_stats else {}),
+            },
+            validate=PlanRevision.model_validate,
+        )
+        revision = PlanRevision.model_validate(raw)
+        return revision.model_copy(update={"keep": min(revision.keep, len(remaining_steps))})
+
+    def _consult_library(
+        self, library: PlanLibrary, goal: str, *, step: int
+    ) -> tuple[PlanRecord | None, PlanOutput | None]:
+        """Return ``(warm_start_reference, reused_plan)`` for the opening plan and trace the lookup."""
+        started = time.perf_counter()
+        record, score = library.lookup(goal, agentic_mode=self.agentic_mode)
+        latency_ms = round((time.perf_counter() - started) * 1000, 3)
+
+        cfg = self.plan_library_config
+        outcome = "miss"
+        if record is not None and score >= cfg.reuse_threshold:
+            outcome = "reuse"
+        elif record is not None and score >= cfg.warm_start_threshold and not self.force_mock and self.llm.enabled:
+            outcome = "warm_start"
+
+        stats = library.record_outcome(outcome)
+        if self.tracer:
+            self.tracer.log_event(
+                event_type="plan_library",
+                step=step,
+                payload={
+                    "outcome": outcome,
+                    "score": round(score, 4),
+                    "latency_ms": latency_ms,
+                    "match_goal": record.goal if record else "",
+                    "match_run_id": record.run_id if record else "",
+                    **stats,
+                },
+            )
+
+        if record is not None and outcome == "reuse":
+            return None, PlanOutput(steps=[PlanStep.model_validate(item) for item in record.steps])
+        return (record if outcome == "warm_start" else None), None
+
     def _mock_plan(self, goal: str) -> PlanOutput:
         if self.agentic_mode == "react":
             return PlanOutput(
@@ -88,3 +217,9 @@ class ArchitectAgent:
         if self.agentic_mode == "react":
             return "Prefer thought-action-observation loops with concise rationale."
         return "Prefer executable, tool-grounded, testable actions."
+
+
+def _validate_plan(raw: dict[str, Any]) -> None:
+    """Acceptance check for a cheaper cascade tier; the final model's plan is parsed leniently instead."""
+    if not PlanOutput.model_validate(raw).steps:
+        raise ValueError("Plan has no steps")
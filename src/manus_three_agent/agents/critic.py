@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import Any
 
 from manus_three_agent.core.schemas import CriticOutput
-from manus_three_agent.core.types import ModelConfig
+from manus_three_agent.core.types import ContextPolicyConfig, CriticPolicyConfig, ModelConfig
 from manus_three_agent.prompts import PromptTemplates
 from manus_three_agent.tracing import TraceCollector
+from manus_three_agent.utils.cascade import CascadeStats, ModelCascade
+from manus_three_agent.utils.context_window import HistoryWindow
+from manus_three_agent.utils.deadline import Deadline
 from manus_three_agent.utils.llm import LLMClient
+from manus_three_agent.utils.llm_runtime import LLMRuntime
+from manus_three_agent.utils.replay import ReplayStore
 
 
 class CriticAgent:
@@ -17,20 +23,30 @@ class CriticAgent:
         tracer: TraceCollector | None = None,
         force_mock: bool = False,
         agentic_mode: str = "codeact",
+        replay: ReplayStore | None = None,
+        context_policy: ContextPolicyConfig | None = None,
+        review_policy: CriticPolicyConfig | None = None,
+        deadline: Deadline | None = None,
+        cascade_stats: CascadeStats | None = None,
+        llm_runtime: LLMRuntime | None = None,
     ) -> None:
         self.model_config = model_config
         self.prompts = prompts
         self.tracer = tracer
         self.force_mock = force_mock
         self.agentic_mode = agentic_mode
-        self.llm = LLMClient(trace_hook=self._on_llm_trace)
+        self.deadline = deadline
+        self.llm = LLMClient(trace_hook=self._on_llm_trace, replay=replay, deadline=deadline, runtime=llm_runtime)
+        self.cascade = ModelCascade(self.llm, model_config, role="critic", tracer=tracer, stats=cascade_stats)
+        self.history_window = HistoryWindow(context_policy or ContextPolicyConfig())
+        self.review_policy = review_policy or CriticPolicyConfig()
 
     def review(
         self,
         *,
         goal: str,
         observation: str,
-        action_history: list[dict[str, Any]],
+        action_history: Sequence[dict[str, Any]],
         current_step_idx: int,
         plan_length: int,
         step: int,
@@ -38,34 +54,74 @@ class CriticAgent:
         if self.force_mock or not self.llm.enabled:
             return self._mock_review(observation, action_history, current_step_idx, plan_length)
 
+        history_view, context_stats = self.history_window.render(action_history)
         system_prompt, user_prompt = self.prompts.render(
             "critic",
             goal=goal,
             observation=observation,
-            action_history=action_history,
+            action_history=history_view,
             current_step_idx=current_step_idx,
             plan_length=plan_length,
             agentic_mode=self.agentic_mode,
             mode_guideline=self._mode_guideline(),
+            **self.cascade.prompt_vars("of this decision"),
         )
-        raw = self.llm.chat_json(
-            model=self.model_config.model,
+        raw = self.cascade.chat_json(
             system_prompt=system_prompt,
             user_prompt=user_prompt,
-            generation_config=self.model_config.to_openai_chat_params(),
-            trace_context={"agent": "critic", "step": step, "agentic_mode": self.agentic_mode},
+            trace_context={
+                "agent": "critic",
+                "step": step,
+                "agentic_mode": self.agentic_mode,
+                **({"context": context_stats} if context_stats else {}),
+            },
+            validate=CriticOutput.model_validate,
         )
         return CriticOutput.model_validate(raw)
 
+    def fast_path(
+        self,
+        *,
+        observation: str,
+        action_history: Sequence[dict[str, Any]],
+        current_step_idx: int,
+        plan_length: int,
+        step_count: int,
+    ) -> tuple[CriticOutput | None, str]:
+        """Return a rule-based review and the skip reason when the policy does not require the LLM."""
+        policy = self.review_policy
+        if policy.mode == "always":
+            return None, ""
+
+        if policy.mode == "every_n":
+            escalate = step_count % policy.every_n_steps == 0
+            reason = f"off_cadence_every_{policy.every_n_steps}"
+        elif policy.mode == "on_signal":
+            escalate = self._has_error_signal(observation)
+            reason = "no_error_signal"
+        elif policy.mode == "plan_end":
+            escalate = current_step_idx >= plan_length
+            reason = "mid_plan"
+        else:
+            escalate = self._has_error_signal(observation) or current_step_idx >= plan_length
+            reason = "rule_gate_passed"
+
+        if escalate:
+            return None, ""
+        return self._mock_review(observation, action_history, current_step_idx, plan_length), reason
+
+    def _has_error_signal(self, observation: str) -> bool:
+        obs = observation.lower()
+        return any(marker in obs for marker in self.review_policy.error_markers)
+
     def _mock_review(
         self,
         observation: str,
-        action_history: list[dict[str, Any]],
+        action_history: Sequence[dict[str, Any]],
         current_step_idx: int,
         plan_length: int,
     ) -> CriticOutput:
-        obs = observation.lower()
-        if "error" in obs or "failed" in obs:
+        if self._has_error_signal(observation):
             return CriticOutput(
                 decision="replan",
                 feedback="Detected possible failure signal in observation.",
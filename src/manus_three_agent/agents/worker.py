@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any
 
-from manus_three_agent.core.schemas import PlanStep, ToolRequest, WorkerOutput
-from manus_three_agent.core.types import ModelConfig
+from manus_three_agent.core.schemas import PlanStep, ToolRequest, WorkerMacroOutput, WorkerOutput
+from manus_three_agent.core.types import ContextPolicyConfig, ModelConfig
 from manus_three_agent.prompts import PromptTemplates
 from manus_three_agent.tools.base import ToolRegistry
 from manus_three_agent.tracing import TraceCollector
+from manus_three_agent.utils.cascade import CascadeStats, ModelCascade
+from manus_three_agent.utils.context_window import truncate_to_tokens
+from manus_three_agent.utils.deadline import Deadline
 from manus_three_agent.utils.llm import LLMClient
+from manus_three_agent.utils.llm_runtime import LLMRuntime
+from manus_three_agent.utils.replay import ReplayStore
 
 
 class WorkerAgent:
@@ -19,6 +25,12 @@ class WorkerAgent:
         tracer: TraceCollector | None = None,
         force_mock: bool = False,
         agentic_mode: str = "codeact",
+        replay: ReplayStore | None = None,
+        tool_concurrency: int = 4,
+        context_policy: ContextPolicyConfig | None = None,
+        deadline: Deadline | None = None,
+        cascade_stats: CascadeStats | None = None,
+        llm_runtime: LLMRuntime | None = None,
     ) -> None:
         self.model_config = model_config
         self.prompts = prompts
@@ -26,7 +38,12 @@ class WorkerAgent:
         self.tracer = tracer
         self.force_mock = force_mock
         self.agentic_mode = agentic_mode
-        self.llm = LLMClient(trace_hook=self._on_llm_trace)
+        self.tool_concurrency = tool_concurrency
+        self.context_policy = context_policy or ContextPolicyConfig()
+        self.deadline = deadline
+        self.llm = LLMClient(trace_hook=self._on_llm_trace, replay=replay, deadline=deadline, runtime=llm_runtime)
+        self.cascade = ModelCascade(self.llm, model_config, role="worker", tracer=tracer, stats=cascade_stats)
+        self._speculation_pool: ThreadPoolExecutor | None = None
 
     def execute(
         self,
@@ -38,7 +55,49 @@ class WorkerAgent:
         total_steps: int,
         use_cot: bool,
         step: int,
+        proposal: WorkerOutput | None = None,
     ) -> WorkerOutput:
+        """Run one plan step; ``proposal`` skips the model call with an action from ``propose``."""
+        if proposal is None:
+            proposal = self.propose(
+                goal=goal,
+                plan_step=plan_step,
+                observation=observation,
+                step_index=step_index,
+                total_steps=total_steps,
+                use_cot=use_cot,
+                step=step,
+            )
+        return self._run_tools(proposal, step=step)
+
+    def propose_in_background(self, **kwargs: Any) -> Future[WorkerOutput]:
+        """Run ``propose`` on this worker's single speculation thread."""
+        if self._speculation_pool is None:
+            self._speculation_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speculative-worker")
+        return self._speculation_pool.submit(self.propose, speculative=True, **kwargs)
+
+    def close(self) -> None:
+        """Stop the speculation thread; a proposal that has not started yet is cancelled."""
+        if self._speculation_pool is not None:
+            self._speculation_pool.shutdown(wait=False, cancel_futures=True)
+            self._speculation_pool = None
+
+    def propose(
+        self,
+        *,
+        goal: str,
+        plan_step: PlanStep,
+        observation: str,
+        step_index: int,
+        total_steps: int,
+        use_cot: bool,
+        step: int,
+        speculative: bool = False,
+    ) -> WorkerOutput:
+        """Choose the next action without running its tools, so it is safe to call speculatively.
+
+        ``speculative`` tags the traced model call, so it can be told apart until the proposal is committed.
+        """
         if self.force_mock or not self.llm.enabled:
             return self._mock_execute(plan_step, step_index, total_steps)
 
@@ -52,16 +111,63 @@ class WorkerAgent:
             use_cot=use_cot,
             agentic_mode=self.agentic_mode,
             mode_guideline=self._mode_guideline(),
+            **self.cascade.prompt_vars("this action is right"),
+        )
+        raw = self.cascade.chat_json(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            trace_context={
+                "agent": "worker",
+                "step": step,
+                "agentic_mode": self.agentic_mode,
+                **({"speculative": True} if speculative else {}),
+            },
+            validate=WorkerOutput.model_validate,
+        )
+        return WorkerOutput.model_validate(raw)
+
+    def propose_many(
+        self,
+        *,
+        goal: str,
+        plan_steps: list[PlanStep],
+        observation: str,
+        step_index: int,
+        total_steps: int,
+        use_cot: bool,
+        step: int,
+    ) -> list[WorkerOutput]:
+        """Choose actions for consecutive plan steps in one model call (a macro-action)."""
+        if self.force_mock or not self.llm.enabled:
+            return [
+                self._mock_execute(plan_step, step_index + offset, total_steps)
+                for offset, plan_step in enumerate(plan_steps)
+            ]
+
+        system_prompt, user_prompt = self.prompts.render(
+            "worker_macro",
+            goal=goal,
+            plan_steps=[plan_step.model_dump() for plan_step in plan_steps],
+            observation=observation,
+            step_index=step_index,
+            total_steps=total_steps,
+            use_cot=use_cot,
+            agentic_mode=self.agentic_mode,
+            mode_guideline=self._mode_guideline(),
+            **self.cascade.prompt_vars("this action is right"),
         )
-        raw = self.llm.chat_json(
-            model=self.model_config.model,
+        raw = self.cascade.chat_json(
             system_prompt=system_prompt,
             user_prompt=user_prompt,
-            generation_config=self.model_config.to_openai_chat_params(),
-            trace_context={"agent": "worker", "step": step, "agentic_mode": self.agentic_mode},
+            trace_context={
+                "agent": "worker",
+                "step": step,
+                "agentic_mode": self.agentic_mode,
+                "macro_steps": len(plan_steps),
+            },
+            validate=WorkerMacroOutput.model_validate,
         )
-        candidate = WorkerOutput.model_validate(raw)
-        return self._run_tools(candidate, step=step)
+        return WorkerMacroOutput.model_validate(raw).actions[: len(plan_steps)]
 
     def _mock_execute(self, plan_step: PlanStep, step_index: int, total_steps: int) -> WorkerOutput:
         is_last = step_index >= total_steps - 1
@@ -70,23 +176,27 @@ class WorkerAgent:
             tool_requests = [ToolRequest(name="calculator", arguments={"expression": "42 + 8"})]
 
         summary_prefix = "ReAct iteration" if self.agentic_mode == "react" else "Executed"
-        output = WorkerOutput(
+        return WorkerOutput(
             summary=f"{summary_prefix}: {plan_step.title}",
             output=f"Completed work item {step_index + 1}/{total_steps}.",
             is_final=is_last,
             final_answer="Delivered a compact final report." if is_last else "",
             tool_requests=tool_requests,
         )
-        return self._run_tools(output, step=step_index + 1)
 
     def _run_tools(self, output: WorkerOutput, *, step: int) -> WorkerOutput:
         if not output.tool_requests:
             return output
 
+        requests = [ToolRequest.model_validate(req) for req in output.tool_requests]
+        outcomes = self.tools.call_many(
+            [(req.name, req.arguments) for req in requests],
+            max_workers=self.tool_concurrency,
+            deadline=self.deadline,
+        )
+
         tool_results: list[dict[str, Any]] = []
-        for req in output.tool_requests:
-            req_obj = ToolRequest.model_validate(req)
-            result = self.tools.call(req_obj.name, req_obj.arguments)
+        for index, (req_obj, (result, latency_ms)) in enumerate(zip(requests, outcomes)):
             tool_results.append(result)
             if self.tracer:
                 self.tracer.log_event(
@@ -96,12 +206,20 @@ class WorkerAgent:
                         "name": req_obj.name,
                         "arguments": req_obj.arguments,
                         "result": result,
+                        "index": index,
+                        "latency_ms": latency_ms,
                     },
                 )
 
-        suffix = f" Tool results: {tool_results}" if tool_results else ""
+        suffix = f" Tool results: {self._render_tool_results(tool_results)}" if tool_results else ""
         return output.model_copy(update={"output": f"{output.output}{suffix}"})
 
+    def _render_tool_results(self, tool_results: list[dict[str, Any]]) -> str:
+        if not self.context_policy.enabled:
+            return str(tool_results)
+        budget = self.context_policy.tool_output_max_tokens
+        return "[" + ", ".join(truncate_to_tokens(repr(result), budget) for result in tool_results) + "]"
+
     def _on_llm_trace(self, payload: dict[str, Any]) -> None:
         if not self.tracer:
             return
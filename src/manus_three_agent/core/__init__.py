@@ -1,15 +1,44 @@
 from manus_three_agent.core.schemas import CriticOutput, EpisodeArtifact, PlanOutput, PlanStep, WorkerOutput
-from manus_three_agent.core.state import ManusState, build_initial_state
-from manus_three_agent.core.types import ModelConfig, RuntimeConfig
+from manus_three_agent.core.state import AppendLog, ManusState, build_initial_state, materialize_state
+from manus_three_agent.core.types import (
+    CascadeConfig,
+    ContextPolicyConfig,
+    CriticPolicyConfig,
+    EndpointConfig,
+    EndpointPoolConfig,
+    HedgingConfig,
+    LLMCacheConfig,
+    LLMRetryConfig,
+    ModelConfig,
+    PlanLibraryConfig,
+    ProviderCapabilityConfig,
+    RateLimitConfig,
+    RuntimeConfig,
+    SingleFlightConfig,
+)
 
 __all__ = [
+    "AppendLog",
+    "CascadeConfig",
+    "ContextPolicyConfig",
+    "CriticPolicyConfig",
     "CriticOutput",
+    "EndpointConfig",
+    "EndpointPoolConfig",
     "EpisodeArtifact",
+    "HedgingConfig",
+    "LLMCacheConfig",
+    "LLMRetryConfig",
     "ManusState",
     "ModelConfig",
+    "PlanLibraryConfig",
     "PlanOutput",
     "PlanStep",
+    "ProviderCapabilityConfig",
+    "RateLimitConfig",
     "RuntimeConfig",
+    "SingleFlightConfig",
     "WorkerOutput",
     "build_initial_state",
+    "materialize_state",
 ]
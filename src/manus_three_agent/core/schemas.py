@@ -12,6 +12,12 @@ class PlanStep(BaseModel):
 
 class PlanOutput(BaseModel):
     steps: list[PlanStep] = Field(default_factory=list)
+    first_action: WorkerOutput | None = None
+
+
+class PlanRevision(BaseModel):
+    keep: int = Field(default=0, ge=0)
+    steps: list[PlanStep] = Field(default_factory=list)
 
 
 class ToolRequest(BaseModel):
@@ -27,6 +33,10 @@ class WorkerOutput(BaseModel):
     tool_requests: list[ToolRequest] = Field(default_factory=list)
 
 
+class WorkerMacroOutput(BaseModel):
+    actions: list[WorkerOutput] = Field(min_length=1)
+
+
 class CriticOutput(BaseModel):
     decision: Literal["continue", "replan", "end"]
     feedback: str = ""
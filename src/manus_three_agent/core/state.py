@@ -1,6 +1,74 @@
 from __future__ import annotations
 
-from typing import Any, TypedDict
+import itertools
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Annotated, Any, TypedDict, overload
+
+
+class AppendLog(Sequence[Any]):
+    """Immutable, structurally shared view over an append-only buffer.
+
+    A log is a ``(buffer, length)`` pair. Extending the newest view appends to the shared
+    buffer and returns a longer view, so earlier views (for example the channel copies
+    LangGraph makes when routing) still see their own prefix. Extending an older view
+    copies its prefix first, which only happens when histories branch.
+    """
+
+    __slots__ = ("_items", "_length")
+
+    def __init__(self, items: Iterable[Any] = (), *, _shared: list[Any] | None = None, _length: int = 0) -> None:
+        if _shared is None:
+            self._items = list(items)
+            self._length = len(self._items)
+        else:
+            self._items = _shared
+            self._length = _length
+
+    def extend(self, items: Iterable[Any]) -> AppendLog:
+        buffer = self._items if self._length == len(self._items) else self._items[: self._length]
+        buffer.extend(items)
+        return AppendLog(_shared=buffer, _length=len(buffer))
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Any]: ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            return self._items[start:stop:step]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("AppendLog index out of range")
+        return self._items[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        return itertools.islice(self._items, self._length)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (AppendLog, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+def append_items(left: Sequence[Any], right: Sequence[Any]) -> AppendLog:
+    """Reducer for append-only channels: nodes return only the new items."""
+    log = left if isinstance(left, AppendLog) else AppendLog(left)
+    return log.extend(right)
+
+
+def materialize_state(state: dict[str, Any]) -> dict[str, Any]:
+    """Copy append-only channels into plain lists, e.g. before serializing a final state."""
+    return {key: list(value) if isinstance(value, AppendLog) else value for key, value in state.items()}
 
 
 class ManusState(TypedDict):
@@ -8,19 +76,26 @@ class ManusState(TypedDict):
     observation: str
     plan: list[dict[str, Any]]
     current_step_idx: int
-    action_history: list[dict[str, Any]]
-    review_history: list[dict[str, Any]]
+    action_history: Annotated[Sequence[dict[str, Any]], append_items]
+    review_history: Annotated[Sequence[dict[str, Any]], append_items]
     latest_action: dict[str, Any]
     step_count: int
     max_steps: int
     done: bool
     success: bool
+    stop_reason: str
     final_answer: str
     decision: str
-    notes: list[str]
+    notes: Annotated[Sequence[str], append_items]
     dynamic_replanning: bool
+    incremental_replanning: bool
     use_cot: bool
     agentic_mode: str
+    speculative: bool
+    macro_steps: int
+    pending_action: dict[str, Any]
+    speculation_hits: int
+    speculation_misses: int
 
 
 def build_initial_state(
@@ -31,6 +106,9 @@ def build_initial_state(
     dynamic_replanning: bool,
     use_cot: bool,
     agentic_mode: str,
+    speculative: bool = False,
+    macro_steps: int = 1,
+    incremental_replanning: bool = False,
 ) -> ManusState:
     return ManusState(
         goal=goal,
@@ -44,10 +122,17 @@ def build_initial_state(
         max_steps=max_steps,
         done=False,
         success=False,
+        stop_reason="",
         final_answer="",
         decision="continue",
         notes=[],
         dynamic_replanning=dynamic_replanning,
+        incremental_replanning=incremental_replanning,
         use_cot=use_cot,
         agentic_mode=agentic_mode,
+        speculative=speculative,
+        macro_steps=macro_steps,
+        pending_action={},
+        speculation_hits=0,
+        speculation_misses=0,
     )
@@ -6,6 +6,12 @@ from typing import Literal
 from pydantic import BaseModel, Field
 
 
+class CascadeConfig(BaseModel):
+    models: list[str] = Field(default_factory=list)
+    confidence_threshold: float | None = Field(default=None, ge=0.0, le=1.0)
+    cost_per_1k_tokens: dict[str, float] = Field(default_factory=dict)
+
+
 class ModelConfig(BaseModel):
     provider: str = "openai"
     model: str = "gpt-4.1-mini"
@@ -15,7 +21,9 @@ class ModelConfig(BaseModel):
     frequency_penalty: float | None = Field(default=None, ge=-2.0, le=2.0)
     presence_penalty: float | None = Field(default=None, ge=-2.0, le=2.0)
     timeout_seconds: float | None = Field(default=60.0, gt=0.0)
+    stream: bool = False
     extra_params: dict[str, Any] = Field(default_factory=dict)
+    cascade: CascadeConfig = Field(default_factory=CascadeConfig)
 
     def to_openai_chat_params(self) -> dict[str, Any]:
         params: dict[str, Any] = {
@@ -25,6 +33,7 @@ class ModelConfig(BaseModel):
             "frequency_penalty": self.frequency_penalty,
             "presence_penalty": self.presence_penalty,
             "timeout": self.timeout_seconds,
+            "stream": self.stream or None,
         }
         cleaned = {k: v for k, v in params.items() if v is not None}
         for key, value in self.extra_params.items():
@@ -33,11 +42,114 @@ class ModelConfig(BaseModel):
         return cleaned
 
 
+class LLMCacheConfig(BaseModel):
+    enabled: bool = False
+    deterministic_only: bool = True
+    ttl_seconds: float | None = Field(default=86400.0, gt=0.0)
+    max_memory_entries: int = Field(default=2048, ge=1)
+    disk_path: str = ""
+    max_disk_entries: int | None = Field(default=100000, ge=1)
+
+
+class EndpointConfig(BaseModel):
+    name: str
+    base_url: str
+    api_key_env: str = "OPENAI_API_KEY"
+    weight: float = Field(default=1.0, gt=0.0)
+    models: list[str] = Field(default_factory=list)
+
+
+class EndpointPoolConfig(BaseModel):
+    enabled: bool = False
+    routing: Literal["least_outstanding", "ewma"] = "least_outstanding"
+    endpoints: list[EndpointConfig] = Field(default_factory=list)
+    failure_threshold: int = Field(default=3, ge=1)
+    cooldown_seconds: float = Field(default=30.0, ge=0.0)
+    ewma_alpha: float = Field(default=0.3, gt=0.0, le=1.0)
+
+
+class SingleFlightConfig(BaseModel):
+    enabled: bool = False
+    deterministic_only: bool = True
+
+
+class RateLimitConfig(BaseModel):
+    enabled: bool = False
+    requests_per_second: float | None = Field(default=None, gt=0.0)
+    tokens_per_minute: int | None = Field(default=None, ge=1)
+    initial_concurrency: int = Field(default=8, ge=1)
+    min_concurrency: int = Field(default=1, ge=1)
+    max_concurrency: int = Field(default=64, ge=1)
+    decrease_factor: float = Field(default=0.5, gt=0.0, lt=1.0)
+    latency_target_ms: float | None = Field(default=None, gt=0.0)
+    latency_decrease_factor: float = Field(default=0.9, gt=0.0, le=1.0)
+
+
+class HedgingConfig(BaseModel):
+    enabled: bool = False
+    roles: list[str] = Field(default_factory=lambda: ["architect", "critic"])
+    quantile: float = Field(default=0.95, gt=0.0, lt=1.0)
+    min_samples: int = Field(default=20, ge=1)
+    window_size: int = Field(default=200, ge=1)
+    min_delay_seconds: float = Field(default=0.05, ge=0.0)
+
+
+class LLMRetryConfig(BaseModel):
+    transport_attempts: int = Field(default=3, ge=1)
+    rate_limit_attempts: int = Field(default=5, ge=1)
+    parse_attempts: int = Field(default=2, ge=1)
+    backoff_min_seconds: float = Field(default=1.0, ge=0.0)
+    backoff_max_seconds: float = Field(default=6.0, ge=0.0)
+    rate_limit_backoff_max_seconds: float = Field(default=30.0, ge=0.0)
+
+
+class ProviderCapabilityConfig(BaseModel):
+    path: str = ""
+
+
+class ContextPolicyConfig(BaseModel):
+    enabled: bool = False
+    window_last_k: int = Field(default=4, ge=0)
+    summary_max_tokens: int = Field(default=256, ge=0)
+    tool_output_max_tokens: int = Field(default=256, ge=16)
+
+
+class CriticPolicyConfig(BaseModel):
+    mode: Literal["always", "every_n", "on_signal", "plan_end", "gated"] = "always"
+    every_n_steps: int = Field(default=2, ge=1)
+    error_markers: list[str] = Field(default_factory=lambda: ["error", "failed"])
+
+
+class PlanLibraryConfig(BaseModel):
+    enabled: bool = False
+    report_dirs: list[str] = Field(default_factory=lambda: ["artifacts/reports"])
+    trace_dirs: list[str] = Field(default_factory=list)
+    reuse_threshold: float = Field(default=0.9, ge=0.0, le=1.0)
+    warm_start_threshold: float = Field(default=0.5, ge=0.0, le=1.0)
+
+
 class RuntimeConfig(BaseModel):
     seed: int = 7
     max_steps: int = Field(default=8, ge=1)
     dynamic_replanning: bool = True
+    incremental_replanning: bool = False
     use_cot: bool = False
     agentic_mode: Literal["codeact", "react"] = "codeact"
     save_artifacts: bool = True
     artifact_dir: str = "artifacts/reports"
+    speculative_worker: bool = False
+    worker_macro_steps: int = Field(default=1, ge=1)
+    architect_first_action: bool = False
+    tool_concurrency: int = Field(default=4, ge=1)
+    tool_timeout_seconds: float | None = Field(default=30.0, gt=0.0)
+    episode_deadline_seconds: float | None = Field(default=None, gt=0.0)
+    llm_cache: LLMCacheConfig = Field(default_factory=LLMCacheConfig)
+    llm_endpoints: EndpointPoolConfig = Field(default_factory=EndpointPoolConfig)
+    llm_single_flight: SingleFlightConfig = Field(default_factory=SingleFlightConfig)
+    llm_retry: LLMRetryConfig = Field(default_factory=LLMRetryConfig)
+    llm_rate_limit: RateLimitConfig = Field(default_factory=RateLimitConfig)
+    llm_hedging: HedgingConfig = Field(default_factory=HedgingConfig)
+    provider_capabilities: ProviderCapabilityConfig = Field(default_factory=ProviderCapabilityConfig)
+    context_policy: ContextPolicyConfig = Field(default_factory=ContextPolicyConfig)
+    critic_policy: CriticPolicyConfig = Field(default_factory=CriticPolicyConfig)
+    plan_library: PlanLibraryConfig = Field(default_factory=PlanLibraryConfig)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any
+
+import orjson
+from pydantic import BaseModel, Field
+
+
+class BatchTask(BaseModel):
+    id: str
+    goal: str
+    agentic_mode: str = ""
+    max_steps: int | None = Field(default=None, ge=1)
+    tags: list[str] = Field(default_factory=list)
+
+
+def load_batch_tasks(path: str) -> list[BatchTask]:
+    file_path = Path(path)
+    if not file_path.exists():
+        raise FileNotFoundError(f"Task file not found: {path}")
+
+    tasks: list[BatchTask] = []
+    seen_ids: set[str] = set()
+    with open(file_path, "rb") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            task = BatchTask.model_validate(orjson.loads(line))
+            if task.id in seen_ids:
+                raise ValueError(f"Duplicate task id '{task.id}' at line {line_no} of {path}")
+            seen_ids.add(task.id)
+            tasks.append(task)
+    return tasks
+
+
+def run_batch_tasks(
+    tasks: list[BatchTask],
+    run_task: Callable[[BatchTask], dict[str, Any]],
+    *,
+    concurrency: int = 4,
+    on_result: Callable[[dict[str, Any]], None] | None = None,
+) -> list[dict[str, Any]]:
+    """Run ``run_task`` for every task on a bounded thread pool.
+
+    Episodes spend nearly all their time waiting on model calls, so threads are enough
+    to overlap them. Failures are captured per task; results keep the input order.
+    """
+    results: list[dict[str, Any] | None] = [None] * len(tasks)
+
+    def _run(task: BatchTask) -> dict[str, Any]:
+        start_time = time.perf_counter()
+        try:
+            out = run_task(task)
+            status = "completed"
+            error = ""
+        except Exception as exc:
+            out = {}
+            status = "failed"
+            error = f"{type(exc).__name__}: {exc}"
+        return {
+            "task_id": task.id,
+            "tags": task.tags,
+            "status": status,
+            "error": error,
+            "latency_ms": round((time.perf_counter() - start_time) * 1000, 3),
+            **out,
+        }
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {executor.submit(_run, task): idx for idx, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            if on_result is not None:
+                on_result(result)
+
+    return [result for result in results if result is not None]
+
+
+def summarize_batch_results(results: list[dict[str, Any]], *, wall_time_s: float) -> dict[str, Any]:
+    completed = [r for r in results if r.get("status") == "completed"]
+    successes = [r for r in completed if r.get("metrics", {}).get("success")]
+    latencies = sorted(float(r.get("latency_ms", 0.0)) for r in results)
+
+    def _percentile(q: float) -> float:
+        if not latencies:
+            return 0.0
+        idx = min(len(latencies) - 1, int(round(q * (len(latencies) - 1))))
+        return latencies[idx]
+
+    return {
+        "num_tasks": len(results),
+        "completed": len(completed),
+        "failed": len(results) - len(completed),
+        "success_count": len(successes),
+        "success_rate": round(len(successes) / len(results), 4) if results else 0.0,
+        "deadline_exceeded": sum(
+            1 for r in completed if r.get("metrics", {}).get("termination_reason") == "deadline_exceeded"
+        ),
+        "mean_step_count": (
+            round(sum(int(r.get("metrics", {}).get("step_count", 0)) for r in completed) / len(completed), 3)
+            if completed
+            else 0.0
+        ),
+        "latency_ms_p50": _percentile(0.5),
+        "latency_ms_p95": _percentile(0.95),
+        "wall_time_s": round(wall_time_s, 3),
+        "episodes_per_s": round(len(results) / wall_time_s, 3) if wall_time_s > 0 else 0.0,
+    }
@@ -3,16 +3,25 @@ from __future__ import annotations
 from typing import Any
 
 
-def compute_episode_metrics(final_state: dict[str, Any]) -> dict[str, Any]:
+def compute_episode_metrics(final_state: dict[str, Any], cascade: dict[str, Any] | None = None) -> dict[str, Any]:
     action_history = list(final_state.get("action_history", []))
     review_history = list(final_state.get("review_history", []))
     success = bool(final_state.get("success", False))
     step_count = int(final_state.get("step_count", 0))
+    speculation_hits = int(final_state.get("speculation_hits", 0))
+    speculation_attempts = speculation_hits + int(final_state.get("speculation_misses", 0))
 
-    return {
+    metrics: dict[str, Any] = {
         "success": success,
         "step_count": step_count,
         "actions": len(action_history),
         "reviews": len(review_history),
-        "termination_reason": "success" if success else "stopped_or_failed",
+        "llm_reviews": sum(1 for review in review_history if review.get("reviewer") == "llm"),
+        "skipped_reviews": sum(1 for review in review_history if review.get("reviewer") == "rule"),
+        "speculation_attempts": speculation_attempts,
+        "speculation_hit_rate": round(speculation_hits / speculation_attempts, 3) if speculation_attempts else 0.0,
+        "termination_reason": "success" if success else final_state.get("stop_reason") or "stopped_or_failed",
     }
+    if cascade:
+        metrics["model_cascade"] = cascade
+    return metrics
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from copy import deepcopy
 from datetime import datetime, timezone
 from pathlib import Path
@@ -10,15 +11,21 @@ from dotenv import load_dotenv
 from rich import print
 
 from manus_three_agent.agents import ArchitectAgent, CriticAgent, WorkerAgent
-from manus_three_agent.core import EpisodeArtifact, ModelConfig, RuntimeConfig, build_initial_state
-from manus_three_agent.environments import build_environment
+from manus_three_agent.core import EpisodeArtifact, ModelConfig, RuntimeConfig, build_initial_state, materialize_state
+from manus_three_agent.environments import EnvironmentAdapter, build_environment
+from manus_three_agent.eval.batch import BatchTask, load_batch_tasks, run_batch_tasks, summarize_batch_results
 from manus_three_agent.eval.metrics import compute_episode_metrics
-from manus_three_agent.graph import build_workflow
-from manus_three_agent.prompts import PromptTemplates, get_mode_prompt_profile
-from manus_three_agent.tools import build_default_tool_registry
+from manus_three_agent.graph import build_workflow, recursion_limit_for
+from manus_three_agent.prompts import PROMPT_VARIANTS, PromptTemplates, get_mode_prompt_profile, with_prompt_variants
+from manus_three_agent.tools import ToolRegistry, build_default_tool_registry
 from manus_three_agent.tracing import TraceCollector, TraceConfig
-from manus_three_agent.training import build_trajectory_dataset
+from manus_three_agent.training import build_trajectory_dataset, build_trajectory_dataset_incremental
 from manus_three_agent.utils import load_yaml, set_seed, write_json
+from manus_three_agent.utils.cascade import CascadeStats
+from manus_three_agent.utils.deadline import Deadline
+from manus_three_agent.utils.llm_runtime import LLMRuntime
+from manus_three_agent.utils.plan_library import PlanLibrary
+from manus_three_agent.utils.replay import ReplayStore, find_replay_run_dir
 
 app = typer.Typer(no_args_is_help=True)
 ROLE_NAMES = ("architect", "worker", "critic")
@@ -154,19 +161,227 @@ def _load_prompt_overrides(path: str) -> tuple[dict[str, dict[str, Any]], dict[s
     if isinstance(shared, dict):
         shared_context = dict(shared)
 
+    prompt_roles = [*ROLE_NAMES, *(variant for variants in PROMPT_VARIANTS.values() for variant in variants)]
     if "roles" in payload and isinstance(payload.get("roles"), dict):
         roles_block = payload.get("roles", {})
-        for role in ROLE_NAMES:
+        for role in prompt_roles:
             role_payload = roles_block.get(role)
             if isinstance(role_payload, dict):
                 role_overrides[role] = role_payload
     else:
-        for role in ROLE_NAMES:
+        for role in prompt_roles:
             role_payload = payload.get(role)
             if isinstance(role_payload, dict):
                 role_overrides[role] = role_payload
 
-    return role_overrides, shared_context
+    return with_prompt_variants(role_overrides), shared_context
+
+
+def _apply_llm_cache_override(runtime_cfg: RuntimeConfig, enabled: bool | None) -> RuntimeConfig:
+    if enabled is None:
+        return runtime_cfg
+    cache_cfg = runtime_cfg.llm_cache.model_copy(update={"enabled": enabled})
+    return runtime_cfg.model_copy(update={"llm_cache": cache_cfg})
+
+
+def _load_plan_library(runtime_cfg: RuntimeConfig) -> PlanLibrary | None:
+    if not runtime_cfg.plan_library.enabled:
+        return None
+    return PlanLibrary.from_config(runtime_cfg.plan_library)
+
+
+def _build_prompt_layers(
+    agentic_mode: str,
+    *,
+    prompt_override: str,
+    prompt_context: str,
+) -> tuple[dict[str, dict[str, Any]], dict[str, Any]]:
+    mode_role_overrides, mode_shared_prompt_context = get_mode_prompt_profile(agentic_mode)
+    user_role_prompt_overrides, user_shared_prompt_context = _load_prompt_overrides(prompt_override)
+    extra_prompt_context = _load_optional_yaml(prompt_context) if prompt_context.strip() else {}
+    merged_role_prompt_overrides = _merge_role_overrides(mode_role_overrides, user_role_prompt_overrides)
+    merged_shared_prompt_context = _deep_merge_dict(mode_shared_prompt_context, user_shared_prompt_context)
+    merged_shared_prompt_context = _deep_merge_dict(merged_shared_prompt_context, extra_prompt_context)
+    return merged_role_prompt_overrides, merged_shared_prompt_context
+
+
+def _build_agents(
+    *,
+    model_cfgs: dict[str, ModelConfig],
+    prompts: PromptTemplates,
+    tools: ToolRegistry,
+    tracer: TraceCollector | None,
+    mock: bool,
+    agentic_mode: str,
+    runtime_cfg: RuntimeConfig,
+    replay: ReplayStore | None = None,
+    plan_library: PlanLibrary | None = None,
+    deadline: Deadline | None = None,
+    cascade_stats: CascadeStats | None = None,
+    llm_runtime: LLMRuntime | None = None,
+) -> tuple[ArchitectAgent, WorkerAgent, CriticAgent]:
+    architect = ArchitectAgent(
+        model_cfgs["architect"],
+        prompts,
+        tracer=tracer,
+        force_mock=mock,
+        agentic_mode=agentic_mode,
+        replay=replay,
+        context_policy=runtime_cfg.context_policy,
+        first_action=runtime_cfg.architect_first_action,
+        plan_library=plan_library,
+        plan_library_config=runtime_cfg.plan_library,
+        deadline=deadline,
+        cascade_stats=cascade_stats,
+        llm_runtime=llm_runtime,
+    )
+    worker = WorkerAgent(
+        model_cfgs["worker"],
+        prompts,
+        tools,
+        tracer=tracer,
+        force_mock=mock,
+        agentic_mode=agentic_mode,
+        replay=replay,
+        tool_concurrency=runtime_cfg.tool_concurrency,
+        context_policy=runtime_cfg.context_policy,
+        deadline=deadline,
+        cascade_stats=cascade_stats,
+        llm_runtime=llm_runtime,
+    )
+    critic = CriticAgent(
+        model_cfgs["critic"],
+        prompts,
+        tracer=tracer,
+        force_mock=mock,
+        agentic_mode=agentic_mode,
+        replay=replay,
+        context_policy=runtime_cfg.context_policy,
+        review_policy=runtime_cfg.critic_policy,
+        deadline=deadline,
+        cascade_stats=cascade_stats,
+        llm_runtime=llm_runtime,
+    )
+    return architect, worker, critic
+
+
+def _execute_episode(
+    *,
+    workflow: Any,
+    run_id: str,
+    goal: str,
+    runtime_cfg: RuntimeConfig,
+    model_cfgs: dict[str, ModelConfig],
+    environment: str,
+    env_adapter: EnvironmentAdapter,
+    tracer: TraceCollector,
+    prompt_info: dict[str, Any],
+    metadata: dict[str, Any],
+    workflow_config: dict[str, Any] | None = None,
+    cascade_stats: CascadeStats | None = None,
+    worker: WorkerAgent | None = None,
+) -> dict[str, Any]:
+    tracer.start_session(
+        goal=goal,
+        environment={"kind": environment, "name": env_adapter.name},
+        model_stack={role: model_cfgs[role].model_dump() for role in ROLE_NAMES},
+        runtime_config=runtime_cfg.model_dump(),
+        metadata={
+            **metadata,
+            "agentic_mode": runtime_cfg.agentic_mode,
+            "framework": "langgraph",
+            "architecture": "3-subagent-architect-worker-critic",
+            "prompts_dir": prompt_info.get("prompts_dir", ""),
+            "prompt_override": prompt_info.get("prompt_override", ""),
+            "prompt_context": prompt_info.get("prompt_context", ""),
+        },
+    )
+
+    initial_state = build_initial_state(
+        goal=goal,
+        max_steps=runtime_cfg.max_steps,
+        dynamic_replanning=runtime_cfg.dynamic_replanning,
+        incremental_replanning=runtime_cfg.incremental_replanning,
+        use_cot=runtime_cfg.use_cot,
+        agentic_mode=runtime_cfg.agentic_mode,
+        speculative=runtime_cfg.speculative_worker,
+        macro_steps=runtime_cfg.worker_macro_steps,
+        observation=env_adapter.reset(goal=goal),
+    )
+
+    try:
+        final_state: dict[str, Any] = materialize_state(
+            workflow.invoke(
+                initial_state,
+                config={"recursion_limit": recursion_limit_for(runtime_cfg.max_steps), **(workflow_config or {})},
+            )
+        )
+    except Exception as exc:
+        tracer.log_event(
+            event_type="episode_error",
+            step=initial_state["step_count"],
+            payload={"error_type": type(exc).__name__, "error_message": str(exc)},
+        )
+        tracer.close(
+            status="failed",
+            summary={"error_type": type(exc).__name__, "error_message": str(exc)},
+        )
+        raise
+    finally:
+        # The episode's worker is discarded afterwards; stop its speculation thread with it.
+        if worker is not None:
+            worker.close()
+
+    metrics = compute_episode_metrics(final_state, cascade_stats.snapshot() if cascade_stats else None)
+    tracer.log_event(
+        event_type="episode_end",
+        step=int(final_state.get("step_count", 0)),
+        payload={
+            "success": bool(final_state.get("success", False)),
+            "final_answer": str(final_state.get("final_answer", "")),
+            "metrics": metrics,
+        },
+    )
+    tracer.close(
+        status="completed",
+        summary={
+            "success": bool(final_state.get("success", False)),
+            "step_count": int(final_state.get("step_count", 0)),
+            "metrics": metrics,
+        },
+    )
+
+    artifact = EpisodeArtifact(
+        run_id=run_id,
+        goal=goal,
+        success=bool(final_state.get("success", False)),
+        step_count=int(final_state.get("step_count", 0)),
+        final_answer=str(final_state.get("final_answer", "")),
+        action_history=list(final_state.get("action_history", [])),
+        review_history=list(final_state.get("review_history", [])),
+        notes=list(final_state.get("notes", [])),
+    )
+
+    if runtime_cfg.save_artifacts:
+        out_dir = Path(runtime_cfg.artifact_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        write_json(
+            out_dir / f"episode_{run_id}.json",
+            {
+                "config": runtime_cfg.model_dump(),
+                "model": {role: model_cfgs[role].model_dump() for role in ROLE_NAMES},
+                "environment": {
+                    "name": env_adapter.name,
+                    "kind": environment,
+                },
+                "prompts": prompt_info,
+                "metrics": metrics,
+                "final_state": final_state,
+                "artifact": artifact.model_dump(),
+            },
+        )
+
+    return {"final_state": final_state, "metrics": metrics, "artifact": artifact}
 
 
 @app.command("run-episode")
@@ -199,6 +414,9 @@ def run_episode(
     architect_max_completion_tokens: int | None = typer.Option(None, help="Quick override for architect max_completion_tokens."),
     worker_max_completion_tokens: int | None = typer.Option(None, help="Quick override for worker max_completion_tokens."),
     critic_max_completion_tokens: int | None = typer.Option(None, help="Quick override for critic max_completion_tokens."),
+    llm_cache: bool | None = typer.Option(None, "--llm-cache/--no-llm-cache", help="Override runtime llm_cache.enabled."),
+    replay: str = typer.Option("", help="Serve LLM responses from a recorded trace run directory."),
+    replay_strict: bool = typer.Option(False, help="Fail when the replayed episode diverges from the recording."),
     print_effective_config: bool = typer.Option(False, help="Print merged runtime/model/prompt config before execution."),
 ) -> None:
     load_dotenv()
@@ -231,12 +449,11 @@ def run_episode(
         inline_overrides=inline_model_overrides,
     )
 
-    mode_role_overrides, mode_shared_prompt_context = get_mode_prompt_profile(effective_mode)
-    user_role_prompt_overrides, user_shared_prompt_context = _load_prompt_overrides(prompt_override)
-    extra_prompt_context = _load_optional_yaml(prompt_context) if prompt_context.strip() else {}
-    merged_role_prompt_overrides = _merge_role_overrides(mode_role_overrides, user_role_prompt_overrides)
-    merged_shared_prompt_context = _deep_merge_dict(mode_shared_prompt_context, user_shared_prompt_context)
-    merged_shared_prompt_context = _deep_merge_dict(merged_shared_prompt_context, extra_prompt_context)
+    merged_role_prompt_overrides, merged_shared_prompt_context = _build_prompt_layers(
+        effective_mode,
+        prompt_override=prompt_override,
+        prompt_context=prompt_context,
+    )
 
     if trace:
         trace_cfg.enabled = True
@@ -251,6 +468,7 @@ def run_episode(
     if max_steps is not None:
         runtime_updates["max_steps"] = max_steps
     runtime_cfg = runtime_cfg.model_copy(update=runtime_updates)
+    runtime_cfg = _apply_llm_cache_override(runtime_cfg, llm_cache)
 
     if print_effective_config:
         print(
@@ -268,6 +486,7 @@ def run_episode(
         )
 
     set_seed(runtime_cfg.seed)
+    llm_runtime = LLMRuntime.from_config(runtime_cfg)
 
     run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
     tracer = TraceCollector(config=trace_cfg, run_id=run_id)
@@ -278,127 +497,53 @@ def run_episode(
         role_overrides=merged_role_prompt_overrides,
         shared_context=merged_shared_prompt_context,
     )
-    tools = build_default_tool_registry()
-
-    architect = ArchitectAgent(
-        model_cfgs["architect"],
-        prompts,
-        tracer=tracer,
-        force_mock=mock,
-        agentic_mode=runtime_cfg.agentic_mode,
-    )
-    worker = WorkerAgent(
-        model_cfgs["worker"],
-        prompts,
-        tools,
-        tracer=tracer,
-        force_mock=mock,
-        agentic_mode=runtime_cfg.agentic_mode,
-    )
-    critic = CriticAgent(
-        model_cfgs["critic"],
-        prompts,
+    tools = build_default_tool_registry(default_timeout_seconds=runtime_cfg.tool_timeout_seconds)
+    replay_store = ReplayStore.from_run_dir(replay, strict=replay_strict) if replay.strip() else None
+    plan_library = _load_plan_library(runtime_cfg)
+    cascade_stats = CascadeStats()
+
+    architect, worker, critic = _build_agents(
+        model_cfgs=model_cfgs,
+        prompts=prompts,
+        tools=tools,
         tracer=tracer,
-        force_mock=mock,
+        mock=mock,
         agentic_mode=runtime_cfg.agentic_mode,
+        runtime_cfg=runtime_cfg,
+        replay=replay_store,
+        plan_library=plan_library,
+        deadline=Deadline.after(runtime_cfg.episode_deadline_seconds),
+        cascade_stats=cascade_stats,
+        llm_runtime=llm_runtime,
     )
+    workflow = build_workflow(architect, worker, critic, env_adapter, tracer)
 
-    tracer.start_session(
+    result = _execute_episode(
+        workflow=workflow,
+        cascade_stats=cascade_stats,
+        worker=worker,
+        run_id=run_id,
         goal=goal,
-        environment={"kind": environment, "name": env_adapter.name},
-        model_stack={role: model_cfgs[role].model_dump() for role in ROLE_NAMES},
-        runtime_config=runtime_cfg.model_dump(),
-        metadata={
-            "mock": mock,
+        runtime_cfg=runtime_cfg,
+        model_cfgs=model_cfgs,
+        environment=environment,
+        env_adapter=env_adapter,
+        tracer=tracer,
+        prompt_info={
             "agentic_mode": runtime_cfg.agentic_mode,
-            "framework": "langgraph",
-            "architecture": "3-subagent-architect-worker-critic",
             "prompts_dir": prompts_dir,
             "prompt_override": prompt_override,
             "prompt_context": prompt_context,
+        },
+        metadata={
+            "mock": mock,
             "model_override": model_override,
             "inline_model_overrides": inline_model_overrides,
+            "replay": replay,
         },
     )
-
-    workflow = build_workflow(architect, worker, critic, env_adapter, tracer)
-
-    initial_state = build_initial_state(
-        goal=goal,
-        max_steps=runtime_cfg.max_steps,
-        dynamic_replanning=runtime_cfg.dynamic_replanning,
-        use_cot=runtime_cfg.use_cot,
-        agentic_mode=runtime_cfg.agentic_mode,
-        observation=env_adapter.reset(goal=goal),
-    )
-
-    try:
-        final_state: dict[str, Any] = workflow.invoke(initial_state)
-    except Exception as exc:
-        tracer.log_event(
-            event_type="episode_error",
-            step=initial_state["step_count"],
-            payload={"error_type": type(exc).__name__, "error_message": str(exc)},
-        )
-        tracer.close(
-            status="failed",
-            summary={"error_type": type(exc).__name__, "error_message": str(exc)},
-        )
-        raise
-
-    metrics = compute_episode_metrics(final_state)
-    tracer.log_event(
-        event_type="episode_end",
-        step=int(final_state.get("step_count", 0)),
-        payload={
-            "success": bool(final_state.get("success", False)),
-            "final_answer": str(final_state.get("final_answer", "")),
-            "metrics": metrics,
-        },
-    )
-    tracer.close(
-        status="completed",
-        summary={
-            "success": bool(final_state.get("success", False)),
-            "step_count": int(final_state.get("step_count", 0)),
-            "metrics": metrics,
-        },
-    )
-
-    artifact = EpisodeArtifact(
-        run_id=run_id,
-        goal=goal,
-        success=bool(final_state.get("success", False)),
-        step_count=int(final_state.get("step_count", 0)),
-        final_answer=str(final_state.get("final_answer", "")),
-        action_history=list(final_state.get("action_history", [])),
-        review_history=list(final_state.get("review_history", [])),
-        notes=list(final_state.get("notes", [])),
-    )
-
-    if runtime_cfg.save_artifacts:
-        out_dir = Path(runtime_cfg.artifact_dir)
-        out_dir.mkdir(parents=True, exist_ok=True)
-        write_json(
-            out_dir / f"episode_{run_id}.json",
-            {
-                "config": runtime_cfg.model_dump(),
-                "model": {role: model_cfgs[role].model_dump() for role in ROLE_NAMES},
-                "environment": {
-                    "name": env_adapter.name,
-                    "kind": environment,
-                },
-                "prompts": {
-                    "agentic_mode": runtime_cfg.agentic_mode,
-                    "prompts_dir": prompts_dir,
-                    "prompt_override": prompt_override,
-                    "prompt_context": prompt_context,
-                },
-                "metrics": metrics,
-                "final_state": final_state,
-                "artifact": artifact.model_dump(),
-            },
-        )
+    artifact: EpisodeArtifact = result["artifact"]
+    metrics = result["metrics"]
 
     print("[bold green]Episode finished[/bold green]")
     print(
@@ -410,18 +555,230 @@ def run_episode(
             "environment": env_adapter.name,
             "trace_enabled": trace_cfg.enabled,
             "trace_run_id": run_id if trace_cfg.enabled else "",
+            **llm_runtime.stats(),
+            "replay": replay_store.stats() if replay_store else {},
+            "plan_library": plan_library.stats() if plan_library else {},
             "mock_mode": mock,
             "agentic_mode": runtime_cfg.agentic_mode,
         }
     )
+    llm_runtime.close()
+
+
+@app.command("run-batch")
+def run_batch(
+    tasks: str = typer.Option(..., help="Task JSONL with id, goal, agentic_mode, max_steps, tags."),
+    base_config: str = typer.Option("configs/base.yaml", help="Path to base runtime config."),
+    model_config: str = typer.Option("configs/models.yaml", help="Path to base model config."),
+    model_override: str = typer.Option("", help="Optional YAML overrides for model hyperparameters."),
+    prompts_dir: str = typer.Option("configs/prompts", help="Prompt template directory."),
+    prompt_override: str = typer.Option("", help="Optional YAML overrides for prompts."),
+    prompt_context: str = typer.Option("", help="Optional YAML with extra prompt variables."),
+    trace_config: str = typer.Option("configs/tracing.yaml", help="Path to tracing config."),
+    trace: bool = typer.Option(False, help="Enable runtime trace logging for every episode."),
+    mock: bool = typer.Option(False, help="Force mock subagent outputs and skip model calls."),
+    environment: str = typer.Option("simulator", help="Environment adapter: simulator"),
+    concurrency: int = typer.Option(4, min=1, help="Maximum number of episodes running at once."),
+    output_dir: str = typer.Option("", help="Batch report directory (defaults to runtime artifact_dir)."),
+    seed: int | None = typer.Option(None, help="Optional runtime seed override."),
+    llm_cache: bool | None = typer.Option(None, "--llm-cache/--no-llm-cache", help="Override runtime llm_cache.enabled."),
+    replay: str = typer.Option("", help="Trace root of a recorded batch; each task replays its '<id>_<task_id>' run."),
+    replay_strict: bool = typer.Option(False, help="Fail a task when it diverges from its recording."),
+) -> None:
+    load_dotenv()
+
+    runtime_cfg = _load_runtime_config(base_config)
+    if seed is not None:
+        runtime_cfg = runtime_cfg.model_copy(update={"seed": seed})
+    runtime_cfg = _apply_llm_cache_override(runtime_cfg, llm_cache)
+    trace_cfg = _load_trace_config(trace_config)
+    if trace:
+        trace_cfg.enabled = True
+    model_cfgs = _load_model_configs(model_config, model_override=model_override)
+    batch_tasks = load_batch_tasks(tasks)
+
+    for task in batch_tasks:
+        mode = task.agentic_mode.strip().lower() or runtime_cfg.agentic_mode
+        if mode not in {"codeact", "react"}:
+            raise ValueError(f"Unsupported agentic_mode '{mode}' for task '{task.id}'. Use codeact or react.")
+
+    set_seed(runtime_cfg.seed)
+    llm_runtime = LLMRuntime.from_config(runtime_cfg)
+
+    batch_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    report_dir = Path(output_dir or runtime_cfg.artifact_dir) / f"batch_{batch_id}"
+    env_adapter = build_environment(environment)
+    tools = build_default_tool_registry(default_timeout_seconds=runtime_cfg.tool_timeout_seconds)
+    # Loaded once up front, so episodes of this batch only see plans from earlier runs.
+    plan_library = _load_plan_library(runtime_cfg)
+    prompts_by_mode: dict[str, PromptTemplates] = {}
+    for mode in ("codeact", "react"):
+        role_overrides, shared_context = _build_prompt_layers(
+            mode,
+            prompt_override=prompt_override,
+            prompt_context=prompt_context,
+        )
+        prompts_by_mode[mode] = PromptTemplates(
+            config_dir=prompts_dir,
+            role_overrides=role_overrides,
+            shared_context=shared_context,
+        )
+
+    # Compile the graph once; each episode injects its own agents/tracer via config.
+    default_agents = _build_agents(
+        model_cfgs=model_cfgs,
+        prompts=prompts_by_mode[runtime_cfg.agentic_mode],
+        tools=tools,
+        tracer=None,
+        mock=mock,
+        agentic_mode=runtime_cfg.agentic_mode,
+        runtime_cfg=runtime_cfg,
+        llm_runtime=llm_runtime,
+    )
+    workflow = build_workflow(*default_agents, env_adapter)
+
+    def _run_task(task: BatchTask) -> dict[str, Any]:
+        mode = task.agentic_mode.strip().lower() or runtime_cfg.agentic_mode
+        task_runtime_updates: dict[str, Any] = {
+            "agentic_mode": mode,
+            "artifact_dir": str(report_dir / "episodes"),
+        }
+        if task.max_steps is not None:
+            task_runtime_updates["max_steps"] = task.max_steps
+        task_runtime_cfg = runtime_cfg.model_copy(update=task_runtime_updates)
+
+        run_id = f"{batch_id}_{task.id}"
+        replay_store: ReplayStore | None = None
+        if replay.strip():
+            replay_dir = find_replay_run_dir(replay, task.id)
+            if replay_dir is None:
+                raise FileNotFoundError(f"No recorded run for task '{task.id}' under {replay}")
+            replay_store = ReplayStore.from_run_dir(replay_dir, strict=replay_strict)
+
+        tracer = TraceCollector(config=trace_cfg, run_id=run_id)
+        cascade_stats = CascadeStats()
+        architect, worker, critic = _build_agents(
+            model_cfgs=model_cfgs,
+            prompts=prompts_by_mode[mode],
+            tools=tools,
+            tracer=tracer,
+            mock=mock,
+            agentic_mode=mode,
+            runtime_cfg=task_runtime_cfg,
+            replay=replay_store,
+            plan_library=plan_library,
+            deadline=Deadline.after(task_runtime_cfg.episode_deadline_seconds),
+            cascade_stats=cascade_stats,
+            llm_runtime=llm_runtime,
+        )
+        result = _execute_episode(
+            workflow=workflow,
+            cascade_stats=cascade_stats,
+            worker=worker,
+            workflow_config={
+                "configurable": {
+                    "architect": architect,
+                    "worker": worker,
+                    "critic": critic,
+                    "tracer": tracer,
+                }
+            },
+            run_id=run_id,
+            goal=task.goal,
+            runtime_cfg=task_runtime_cfg,
+            model_cfgs=model_cfgs,
+            environment=environment,
+            env_adapter=env_adapter,
+            tracer=tracer,
+            prompt_info={
+                "agentic_mode": mode,
+                "prompts_dir": prompts_dir,
+                "prompt_override": prompt_override,
+                "prompt_context": prompt_context,
+            },
+            metadata={
+                "mock": mock,
+                "model_override": model_override,
+                "batch_id": batch_id,
+                "task_id": task.id,
+                "tags": task.tags,
+                "replay": str(replay_store.source) if replay_store else "",
+            },
+        )
+        artifact: EpisodeArtifact = result["artifact"]
+        return {
+            "run_id": run_id,
+            "agentic_mode": mode,
+            "success": artifact.success,
+            "step_count": artifact.step_count,
+            "final_answer": artifact.final_answer,
+            "metrics": result["metrics"],
+            "replay": replay_store.stats() if replay_store else {},
+        }
+
+    def _on_result(result: dict[str, Any]) -> None:
+        status_color = "green" if result["status"] == "completed" else "red"
+        print(f"[{status_color}]{result['task_id']}[/{status_color}] {result['status']} ({result['latency_ms']} ms)")
+
+    start_time = time.perf_counter()
+    results = run_batch_tasks(batch_tasks, _run_task, concurrency=concurrency, on_result=_on_result)
+    summary = summarize_batch_results(results, wall_time_s=time.perf_counter() - start_time)
+
+    write_json(
+        report_dir / "report.json",
+        {
+            "batch_id": batch_id,
+            "tasks_path": tasks,
+            "concurrency": concurrency,
+            "config": runtime_cfg.model_dump(),
+            "model": {role: model_cfgs[role].model_dump() for role in ROLE_NAMES},
+            "environment": {"name": env_adapter.name, "kind": environment},
+            "mock_mode": mock,
+            "trace_enabled": trace_cfg.enabled,
+            **llm_runtime.stats(),
+            "plan_library": plan_library.stats() if plan_library else {},
+            "summary": summary,
+            "results": results,
+        },
+    )
+
+    llm_runtime.close()
+
+    print("[bold green]Batch finished[/bold green]")
+    print({**summary, "report_dir": str(report_dir)})
 
 
 @app.command("build-trajectories")
 def build_trajectories(
     trace_dir: str = typer.Option("artifacts/traces", help="Trace directory root."),
     output: str = typer.Option("data/processed/trajectory_sft.jsonl", help="Output jsonl path."),
+    progress_every: int = typer.Option(100, min=1, help="Report progress every N run directories (N exported runs with --incremental)."),
+    incremental: bool = typer.Option(False, help="Skip unchanged runs using a per-run manifest and cached shards."),
+    workers: int = typer.Option(1, min=1, help="Process pool size for incremental export."),
+    manifest: str = typer.Option("", help="Manifest path (defaults to '<output>.manifest.json')."),
 ) -> None:
-    summary = build_trajectory_dataset(trace_dir=trace_dir, output_path=output)
+    def _progress(update: dict[str, Any]) -> None:
+        print(
+            f"[cyan]{update['runs_done']}/{update['runs_total']} runs[/cyan] "
+            f"{update['num_records']} records ({update['elapsed_seconds']}s)"
+        )
+
+    if incremental:
+        summary = build_trajectory_dataset_incremental(
+            trace_dir=trace_dir,
+            output_path=output,
+            workers=workers,
+            manifest_path=manifest,
+            progress=_progress,
+            progress_every=progress_every,
+        )
+    else:
+        summary = build_trajectory_dataset(
+            trace_dir=trace_dir,
+            output_path=output,
+            progress=_progress,
+            progress_every=progress_every,
+        )
     print("[bold green]Trajectory dataset built[/bold green]")
     print(summary)
 
@@ -1,3 +1,3 @@
-from manus_three_agent.graph.workflow import build_workflow
+from manus_three_agent.graph.workflow import build_workflow, recursion_limit_for
 
-__all__ = ["build_workflow"]
+__all__ = ["build_workflow", "recursion_limit_for"]
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, wait
 from typing import Any
 
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, START, StateGraph
 
 from manus_three_agent.agents.architect import ArchitectAgent
 from manus_three_agent.agents.critic import CriticAgent
 from manus_three_agent.agents.worker import WorkerAgent
-from manus_three_agent.core.schemas import PlanStep
+from manus_three_agent.core.schemas import PlanStep, WorkerOutput
 from manus_three_agent.core.state import ManusState
 from manus_three_agent.environments.base import EnvironmentAdapter
 from manus_three_agent.environments.simulator import GenericSimulatorEnvironment
 from manus_three_agent.graph.transitions import route_after_critic
 from manus_three_agent.tracing import TraceCollector
+from manus_three_agent.utils.deadline import DeadlineExceeded
 
 
 def architect_node(
@@ -27,11 +32,16 @@ def architect_node(
             payload={
                 "goal": state["goal"],
                 "observation": state["observation"],
-                "action_history": state["action_history"],
+                "action_history": list(state["action_history"]),
                 "agentic_mode": state["agentic_mode"],
             },
         )
 
+    if state.get("incremental_replanning") and 0 < state["current_step_idx"] <= len(state["plan"]):
+        update = _revise_plan_suffix(state, architect, tracer)
+        if update is not None:
+            return update
+
     plan = architect.plan(
         goal=state["goal"],
         observation=state["observation"],
@@ -41,18 +51,77 @@ def architect_node(
     )
     steps = [step.model_dump() for step in plan.steps]
 
+    first_action = plan.first_action.model_dump() if plan.first_action is not None else None
+
     if tracer:
         tracer.log_event(
             event_type="architect_output",
             step=state["step_count"],
-            payload={"steps": steps},
+            payload={"steps": steps, "first_action": first_action},
         )
 
+    pending_action: dict[str, Any] = {}
+    if first_action is not None:
+        pending_action = {
+            "step_count": state["step_count"],
+            "current_step_idx": 0,
+            "action": first_action,
+            "source": "architect",
+        }
+
     return {
         "plan": steps,
         "current_step_idx": 0,
         "decision": "continue",
-        "notes": state["notes"] + ["Architect created/replaced execution plan."],
+        "notes": ["Architect created/replaced execution plan."],
+        "pending_action": pending_action,
+    }
+
+
+def _revise_plan_suffix(
+    state: ManusState,
+    architect: ArchitectAgent,
+    tracer: TraceCollector | None,
+) -> dict[str, Any] | None:
+    """Splice a revised suffix after the executed prefix; ``None`` falls back to a full replan."""
+    current_idx = state["current_step_idx"]
+    completed = [PlanStep.model_validate(item) for item in state["plan"][:current_idx]]
+    remaining = [PlanStep.model_validate(item) for item in state["plan"][current_idx:]]
+    review_history = state["review_history"]
+    revision = architect.replan(
+        goal=state["goal"],
+        observation=state["observation"],
+        action_history=state["action_history"],
+        completed_steps=completed,
+        remaining_steps=remaining,
+        feedback=str(review_history[-1].get("feedback", "")) if review_history else "",
+        use_cot=state["use_cot"],
+        step=state["step_count"],
+    )
+    suffix = remaining[: revision.keep] + revision.steps
+    if not suffix:
+        return None
+
+    steps = [step.model_dump() for step in completed + suffix]
+    if tracer:
+        tracer.log_event(
+            event_type="architect_output",
+            step=state["step_count"],
+            payload={
+                "steps": steps,
+                "mode": "incremental",
+                "completed_steps": current_idx,
+                "kept_steps": revision.keep,
+                "new_steps": len(revision.steps),
+            },
+        )
+
+    return {
+        "plan": steps,
+        "current_step_idx": current_idx,
+        "decision": "continue",
+        "notes": [f"Architect revised plan after step {current_idx}, keeping {revision.keep} remaining step(s)."],
+        "pending_action": {},
     }
 
 
@@ -82,7 +151,7 @@ def worker_node(
             "success": False,
             "decision": "end",
             "final_answer": "Stopped: max steps reached.",
-            "notes": state["notes"] + ["Reached max steps budget."],
+            "notes": ["Reached max steps budget."],
         }
 
     if not plan:
@@ -92,7 +161,7 @@ def worker_node(
             "done": decision == "end",
             "success": False,
             "final_answer": "No plan available." if decision == "end" else state["final_answer"],
-            "notes": state["notes"] + ["Worker found empty plan."],
+            "notes": ["Worker found empty plan."],
         }
 
     if current_idx >= len(plan):
@@ -101,72 +170,113 @@ def worker_node(
             "success": len(state["action_history"]) > 0,
             "decision": "end",
             "final_answer": state["final_answer"] or "Plan completed.",
-            "notes": state["notes"] + ["Worker exhausted plan steps."],
+            "notes": ["Worker exhausted plan steps."],
         }
 
-    current_step = PlanStep.model_validate(plan[current_idx])
-    if tracer:
-        tracer.log_event(
-            event_type="worker_input",
-            step=step_count,
-            payload={
-                "current_step_idx": current_idx,
-                "current_step": current_step.model_dump(),
-                "observation": state["observation"],
-                "agentic_mode": state["agentic_mode"],
-            },
-        )
-
-    action = worker.execute(
-        goal=state["goal"],
-        plan_step=current_step,
-        observation=state["observation"],
-        step_index=current_idx,
-        total_steps=len(plan),
-        use_cot=state["use_cot"],
-        step=step_count,
-    )
+    pending = state.get("pending_action") or {}
+    proposals: list[WorkerOutput | None] = [None]
+    proposal_source = ""
+    if pending.get("step_count") == step_count and pending.get("current_step_idx") == current_idx:
+        proposals = [WorkerOutput.model_validate(pending["action"])]
+        proposal_source = str(pending.get("source", ""))
+    else:
+        window = min(state.get("macro_steps", 1), len(plan) - current_idx, max_steps - step_count)
+        if window > 1:
+            proposal_source = "macro"
+            proposals = list(
+                worker.propose_many(
+                    goal=state["goal"],
+                    plan_steps=[PlanStep.model_validate(item) for item in plan[current_idx : current_idx + window]],
+                    observation=state["observation"],
+                    step_index=current_idx,
+                    total_steps=len(plan),
+                    use_cot=state["use_cot"],
+                    step=step_count,
+                )
+            )
 
-    new_step_count = step_count + 1
-    new_action_history = state["action_history"] + [action.model_dump()]
+    # Each sub-step of a macro-action is applied and traced exactly like a single step.
+    observation = state["observation"]
+    final_answer = state["final_answer"]
+    actions: list[dict[str, Any]] = []
+    notes: list[str] = []
+    done = success = False
+    for offset, proposal in enumerate(proposals):
+        step_idx = current_idx + offset
+        current_step = PlanStep.model_validate(plan[step_idx])
+        if tracer:
+            tracer.log_event(
+                event_type="worker_input",
+                step=step_count + offset,
+                payload={
+                    "current_step_idx": step_idx,
+                    "current_step": current_step.model_dump(),
+                    "observation": observation,
+                    "agentic_mode": state["agentic_mode"],
+                    "speculative": proposal_source == "speculation",
+                    "proposal_source": proposal_source,
+                    "macro_index": offset,
+                    "macro_size": len(proposals),
+                },
+            )
 
-    if tracer:
-        tracer.log_event(
-            event_type="worker_output",
-            step=new_step_count,
-            payload={"action": action.model_dump()},
+        action = worker.execute(
+            goal=state["goal"],
+            plan_step=current_step,
+            observation=observation,
+            step_index=step_idx,
+            total_steps=len(plan),
+            use_cot=state["use_cot"],
+            step=step_count + offset,
+            proposal=proposal,
         )
 
-    env_result = environment.step(action=action, step_count=new_step_count)
+        new_step_count = step_count + offset + 1
+        action_payload = action.model_dump()
 
-    if tracer:
-        tracer.log_event(
-            event_type="environment_step",
-            step=new_step_count,
-            payload={
-                "observation": env_result.observation,
-                "done": env_result.done,
-                "success": env_result.success,
-                "final_answer": env_result.final_answer,
-                "notes": env_result.notes,
-            },
-        )
+        if tracer:
+            tracer.log_event(
+                event_type="worker_output",
+                step=new_step_count,
+                payload={"action": action_payload},
+            )
 
-    done = bool(action.is_final or env_result.done)
-    success = bool(action.is_final or env_result.success)
-    final_answer = action.final_answer or env_result.final_answer or state["final_answer"]
+        env_result = environment.step(action=action, step_count=new_step_count)
+
+        if tracer:
+            tracer.log_event(
+                event_type="environment_step",
+                step=new_step_count,
+                payload={
+                    "observation": env_result.observation,
+                    "done": env_result.done,
+                    "success": env_result.success,
+                    "final_answer": env_result.final_answer,
+                    "notes": env_result.notes,
+                },
+            )
+
+        actions.append(action_payload)
+        notes.extend(env_result.notes)
+        observation = env_result.observation
+        done = bool(action.is_final or env_result.done)
+        success = bool(action.is_final or env_result.success)
+        final_answer = action.final_answer or env_result.final_answer or final_answer
+        if done:
+            break
 
     return {
-        "latest_action": action.model_dump(),
-        "action_history": new_action_history,
-        "observation": env_result.observation,
-        "step_count": new_step_count,
-        "current_step_idx": current_idx + 1,
+        "latest_action": actions[-1],
+        "action_history": actions,
+        "observation": observation,
+        "step_count": step_count + len(actions),
+        "current_step_idx": current_idx + len(actions),
         "done": done,
         "success": success,
         "final_answer": final_answer,
         "decision": "end" if done else "continue",
-        "notes": state["notes"] + env_result.notes,
+        "notes": notes,
+        "pending_action": {},
     }
 
 
@@ -174,6 +284,7 @@ def critic_node(
     state: ManusState,
     critic: CriticAgent,
     tracer: TraceCollector | None = None,
+    worker: WorkerAgent | None = None,
 ) -> dict[str, Any]:
     if tracer:
         tracer.log_event(
@@ -188,6 +299,9 @@ def critic_node(
             },
         )
 
+    reviewer = "state"
+    skip_reason = ""
+    speculation: Future[WorkerOutput] | None = None
     if state["done"]:
         out_decision = "end"
         out_feedback = "Episode already marked done by worker/environment."
@@ -197,14 +311,32 @@ def critic_node(
         out_feedback = "Worker requested replanning."
         should_succeed = False
     else:
-        review = critic.review(
-            goal=state["goal"],
+        review, skip_reason = critic.fast_path(
             observation=state["observation"],
             action_history=state["action_history"],
             current_step_idx=state["current_step_idx"],
             plan_length=len(state["plan"]),
-            step=state["step_count"],
+            step_count=state["step_count"],
         )
+        if review is None:
+            if state.get("speculative") and worker is not None:
+                speculation = _start_speculation(state, worker)
+            try:
+                review = critic.review(
+                    goal=state["goal"],
+                    observation=state["observation"],
+                    action_history=state["action_history"],
+                    current_step_idx=state["current_step_idx"],
+                    plan_length=len(state["plan"]),
+                    step=state["step_count"],
+                )
+            except BaseException:
+                if speculation is not None:
+                    _settle(speculation)
+                raise
+            reviewer = "llm"
+        else:
+            reviewer = "rule"
         out_decision = review.decision
         out_feedback = review.feedback
         should_succeed = review.should_succeed
@@ -213,7 +345,10 @@ def critic_node(
         "decision": out_decision,
         "feedback": out_feedback,
         "should_succeed": should_succeed,
+        "reviewer": reviewer,
     }
+    if skip_reason:
+        review_event["skip_reason"] = skip_reason
 
     if tracer:
         tracer.log_event(
@@ -222,6 +357,8 @@ def critic_node(
             payload=review_event,
         )
 
+    speculation_update = _resolve_speculation(state, speculation, out_decision, tracer) if speculation else {}
+
     if out_decision == "end" and not state["done"]:
         final_answer = state["final_answer"] or "Critic decided to end run."
         return {
@@ -229,17 +366,154 @@ def critic_node(
             "done": True,
             "success": should_succeed,
             "final_answer": final_answer,
-            "review_history": state["review_history"] + [review_event],
-            "notes": state["notes"] + [out_feedback],
+            "review_history": [review_event],
+            "notes": [out_feedback],
+            **speculation_update,
         }
 
     return {
         "decision": out_decision,
-        "review_history": state["review_history"] + [review_event],
-        "notes": state["notes"] + [out_feedback],
+        "review_history": [review_event],
+        "notes": [out_feedback],
+        **speculation_update,
     }
 
 
+def _start_speculation(state: ManusState, worker: WorkerAgent) -> Future[WorkerOutput] | None:
+    """Propose the next worker action in the background while the critic reviews the last one.
+
+    Only the model call is speculative; tools run once the proposal is committed.
+    """
+    current_idx = state["current_step_idx"]
+    plan = state["plan"]
+    if current_idx >= len(plan) or state["step_count"] >= state["max_steps"]:
+        return None
+
+    return worker.propose_in_background(
+        goal=state["goal"],
+        plan_step=PlanStep.model_validate(plan[current_idx]),
+        observation=state["observation"],
+        step_index=current_idx,
+        total_steps=len(plan),
+        use_cot=state["use_cot"],
+        step=state["step_count"],
+    )
+
+
+def _settle(speculation: Future[WorkerOutput]) -> None:
+    """Cancel a discarded proposal, or wait for it so it never logs after the node (or trace) is done."""
+    if not speculation.cancel():
+        wait([speculation])
+
+
+def _resolve_speculation(
+    state: ManusState,
+    speculation: Future[WorkerOutput],
+    decision: str,
+    tracer: TraceCollector | None,
+) -> dict[str, Any]:
+    hits = state.get("speculation_hits", 0)
+    misses = state.get("speculation_misses", 0)
+    start_time = time.perf_counter()
+    proposal: WorkerOutput | None = None
+    error = ""
+    if decision == "continue":
+        try:
+            proposal = speculation.result()
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+    else:
+        _settle(speculation)
+
+    update: dict[str, Any]
+    if proposal is not None:
+        hits += 1
+        update = {
+            "pending_action": {
+                "step_count": state["step_count"],
+                "current_step_idx": state["current_step_idx"],
+                "action": proposal.model_dump(),
+                "source": "speculation",
+            },
+            "speculation_hits": hits,
+        }
+    else:
+        misses += 1
+        update = {"speculation_misses": misses}
+
+    if tracer:
+        tracer.log_event(
+            event_type="speculation",
+            step=state["step_count"],
+            payload={
+                "outcome": "committed" if proposal is not None else "discarded",
+                "decision": decision,
+                "error": error,
+                "wait_ms": round((time.perf_counter() - start_time) * 1000, 3),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 3),
+            },
+        )
+    return update
+
+
+def deadline_stop(
+    state: ManusState,
+    tracer: TraceCollector | None,
+    *,
+    node: str,
+    error: str,
+) -> dict[str, Any]:
+    """End the episode because its wall-clock budget ran out; work done so far is kept."""
+    if tracer:
+        tracer.log_event(
+            event_type="episode_stop",
+            step=state["step_count"],
+            payload={"reason": "deadline_exceeded", "node": node, "error": error},
+        )
+    return {
+        "done": True,
+        "success": False,
+        "decision": "end",
+        "stop_reason": "deadline_exceeded",
+        "final_answer": state["final_answer"] or "Stopped: episode deadline reached.",
+        "notes": ["Reached episode deadline."],
+        "pending_action": {},
+    }
+
+
+def _until_deadline(
+    name: str,
+    node: Callable[[ManusState, RunnableConfig | None], dict[str, Any]],
+    agent: Any,
+    tracer: TraceCollector | None,
+) -> Callable[[ManusState, RunnableConfig | None], dict[str, Any]]:
+    """Run ``node`` unless the agent's episode deadline has passed, and stop cleanly if it passes mid-call."""
+
+    def _run(state: ManusState, config: RunnableConfig) -> dict[str, Any]:
+        deadline = getattr(_configurable(config, name, agent), "deadline", None)
+        try:
+            if deadline is not None and not state["done"]:
+                deadline.check()
+            return node(state, config)
+        except DeadlineExceeded as exc:
+            return deadline_stop(state, _configurable(config, "tracer", tracer), node=name, error=str(exc))
+
+    return _run
+
+
+def recursion_limit_for(max_steps: int) -> int:
+    """Superstep budget for an episode: a replan costs three supersteps per worker step."""
+    return 3 * max_steps + 10
+
+
+def _configurable(config: RunnableConfig | None, key: str, default: Any) -> Any:
+    configurable = (config or {}).get("configurable") or {}
+    value = configurable.get(key)
+    return default if value is None else value
+
+
 def build_workflow(
     architect: ArchitectAgent,
     worker: WorkerAgent,
@@ -250,10 +524,50 @@ def build_workflow(
     environment_adapter = environment or GenericSimulatorEnvironment()
     trace_collector = tracer
 
+    # Per-episode components may be supplied through ``config["configurable"]`` so that
+    # one compiled graph can serve many concurrent episodes (see ``run-batch``).
     graph = StateGraph(ManusState)
-    graph.add_node("architect", lambda s: architect_node(s, architect, trace_collector))
-    graph.add_node("worker", lambda s: worker_node(s, worker, environment_adapter, trace_collector))
-    graph.add_node("critic", lambda s: critic_node(s, critic, trace_collector))
+    graph.add_node(
+        "architect",
+        _until_deadline(
+            "architect",
+            lambda s, config: architect_node(
+                s,
+                _configurable(config, "architect", architect),
+                _configurable(config, "tracer", trace_collector),
+            ),
+            architect,
+            trace_collector,
+        ),
+    )
+    graph.add_node(
+        "worker",
+        _until_deadline(
+            "worker",
+            lambda s, config: worker_node(
+                s,
+                _configurable(config, "worker", worker),
+                _configurable(config, "environment", environment_adapter),
+                _configurable(config, "tracer", trace_collector),
+            ),
+            worker,
+            trace_collector,
+        ),
+    )
+    graph.add_node(
+        "critic",
+        _until_deadline(
+            "critic",
+            lambda s, config: critic_node(
+                s,
+                _configurable(config, "critic", critic),
+                _configurable(config, "tracer", trace_collector),
+                _configurable(config, "worker", worker),
+            ),
+            critic,
+            trace_collector,
+        ),
+    )
 
     graph.add_edge(START, "architect")
     graph.add_edge("architect", "worker")
@@ -1,4 +1,4 @@
-from manus_three_agent.prompts.modes import get_mode_prompt_profile
+from manus_three_agent.prompts.modes import PROMPT_VARIANTS, get_mode_prompt_profile, with_prompt_variants
 from manus_three_agent.prompts.templates import PromptTemplates
 
-__all__ = ["PromptTemplates", "get_mode_prompt_profile"]
+__all__ = ["PROMPT_VARIANTS", "PromptTemplates", "get_mode_prompt_profile", "with_prompt_variants"]
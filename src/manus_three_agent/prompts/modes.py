@@ -2,12 +2,32 @@ from __future__ import annotations
 
 from typing import Any
 
+# Alternate prompts a role renders for some calls; each keeps its own user template (and task).
+PROMPT_VARIANTS: dict[str, tuple[str, ...]] = {
+    "architect": ("architect_first_action", "architect_replan", "architect_warm_start"),
+    "worker": ("worker_macro",),
+}
+
 
 def get_mode_prompt_profile(mode: str) -> tuple[dict[str, dict[str, Any]], dict[str, Any]]:
     normalized = mode.strip().lower()
     if normalized == "react":
-        return _react_profile()
-    return _codeact_profile()
+        role_overrides, shared_context = _react_profile()
+    else:
+        role_overrides, shared_context = _codeact_profile()
+    return with_prompt_variants(role_overrides), shared_context
+
+
+def with_prompt_variants(role_overrides: dict[str, dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Give each variant prompt its base role's ``system`` override unless the variant sets its own."""
+    merged = {role: dict(values) for role, values in role_overrides.items()}
+    for role, variants in PROMPT_VARIANTS.items():
+        system = role_overrides.get(role, {}).get("system")
+        if system is None:
+            continue
+        for variant in variants:
+            merged.setdefault(variant, {}).setdefault("system", system)
+    return merged
 
 
 def _codeact_profile() -> tuple[dict[str, dict[str, Any]], dict[str, Any]]:
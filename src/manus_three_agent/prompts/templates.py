@@ -1,42 +1,108 @@
 from __future__ import annotations
 
+import string
+import threading
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 from manus_three_agent.utils.io import load_yaml
 
 
+@dataclass(frozen=True)
+class CompiledPrompt:
+    system: str
+    user_template: str
+    fields: frozenset[str]
+    mtime_ns: int | None
+
+
 class PromptTemplates:
+    """Role prompt templates, parsed and merged with overrides once per role.
+
+    With ``hot_reload=True`` the role file's mtime is checked on each render and the
+    template is recompiled when it changes.
+    """
+
     def __init__(
         self,
         config_dir: str = "configs/prompts",
         role_overrides: dict[str, dict[str, Any]] | None = None,
         shared_context: dict[str, Any] | None = None,
+        hot_reload: bool = False,
     ) -> None:
         self.config_dir = Path(config_dir)
         self.role_overrides = role_overrides or {}
         self.shared_context = shared_context or {}
+        self.hot_reload = hot_reload
+        self._compiled: dict[str, CompiledPrompt] = {}
+        self._lock = threading.Lock()
 
     def get(self, role: str) -> dict[str, str]:
-        data = load_yaml(str(self.config_dir / f"{role}.yaml"))
-        override = self.role_overrides.get(role, {})
-        system = str(override.get("system", data.get("system", "")))
-        user_template = str(override.get("user_template", data.get("user_template", "")))
+        compiled = self.compile(role)
         return {
-            "system": system,
-            "user_template": user_template,
+            "system": compiled.system,
+            "user_template": compiled.user_template,
         }
 
+    def compile(self, role: str) -> CompiledPrompt:
+        compiled = self._compiled.get(role)
+        if compiled is not None and not (self.hot_reload and self._is_stale(role, compiled)):
+            return compiled
+
+        with self._lock:
+            compiled = self._compiled.get(role)
+            if compiled is None or (self.hot_reload and self._is_stale(role, compiled)):
+                compiled = self._load(role)
+                self._compiled[role] = compiled
+            return compiled
+
     def render(self, role: str, **kwargs: Any) -> tuple[str, str]:
-        prompt_cfg = self.get(role)
-        system_template = prompt_cfg["system"]
-        user_template = prompt_cfg["user_template"]
+        compiled = self.compile(role)
         render_args = {
             **self.shared_context,
             **kwargs,
         }
+        missing = sorted(compiled.fields - render_args.keys())
+        if missing:
+            raise ValueError(f"Missing prompt variable '{missing[0]}' for role '{role}'")
+        return compiled.system.format(**render_args), compiled.user_template.format(**render_args)
+
+    def _load(self, role: str) -> CompiledPrompt:
+        path = self._role_path(role)
+        data = load_yaml(str(path))
+        override = self.role_overrides.get(role, {})
+        system = str(override.get("system", data.get("system", "")))
+        user_template = str(override.get("user_template", data.get("user_template", "")))
+        return CompiledPrompt(
+            system=system,
+            user_template=user_template,
+            fields=frozenset(_template_fields(system, role) | _template_fields(user_template, role)),
+            mtime_ns=path.stat().st_mtime_ns,
+        )
+
+    def _is_stale(self, role: str, compiled: CompiledPrompt) -> bool:
         try:
-            return system_template.format(**render_args), user_template.format(**render_args)
-        except KeyError as exc:
-            missing = str(exc).strip("'")
-            raise ValueError(f"Missing prompt variable '{missing}' for role '{role}'") from exc
+            return self._role_path(role).stat().st_mtime_ns != compiled.mtime_ns
+        except FileNotFoundError:
+            return False
+
+    def _role_path(self, role: str) -> Path:
+        return self.config_dir / f"{role}.yaml"
+
+
+def _template_fields(template: str, role: str) -> set[str]:
+    try:
+        parsed = list(string.Formatter().parse(template))
+    except ValueError as exc:
+        raise ValueError(f"Invalid prompt template for role '{role}': {exc}") from exc
+
+    fields: set[str] = set()
+    for _, field_name, _, _ in parsed:
+        if field_name is None:
+            continue
+        name = field_name.split(".", 1)[0].split("[", 1)[0]
+        if not name or name.isdigit():
+            raise ValueError(f"Positional prompt field '{{{field_name}}}' is not supported for role '{role}'")
+        fields.add(name)
+    return fields
@@ -1,4 +1,5 @@
 from manus_three_agent.tools.base import ToolRegistry
 from manus_three_agent.tools.factory import build_default_tool_registry
+from manus_three_agent.tools.http import HttpFetcher, get_default_fetcher, set_default_fetcher
 
-__all__ = ["ToolRegistry", "build_default_tool_registry"]
+__all__ = ["HttpFetcher", "ToolRegistry", "build_default_tool_registry", "get_default_fetcher", "set_default_fetcher"]
@@ -1,21 +1,33 @@
 from __future__ import annotations
 
+import threading
+import time
 from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, wait
 from typing import Any
 
+from manus_three_agent.utils.deadline import Deadline
+
 ToolFn = Callable[[dict[str, Any]], dict[str, Any]]
 
 
 class ToolRegistry:
-    def __init__(self) -> None:
+    def __init__(self, default_timeout_seconds: float | None = None) -> None:
         self._tools: dict[str, ToolFn] = {}
+        self._timeouts: dict[str, float | None] = {}
+        self.default_timeout_seconds = default_timeout_seconds
 
-    def register(self, name: str, fn: ToolFn) -> None:
+    def register(self, name: str, fn: ToolFn, *, timeout_seconds: float | None = None) -> None:
         self._tools[name] = fn
+        self._timeouts[name] = timeout_seconds
 
     def has(self, name: str) -> bool:
         return name in self._tools
 
+    def timeout_for(self, name: str) -> float | None:
+        timeout = self._timeouts.get(name)
+        return timeout if timeout is not None else self.default_timeout_seconds
+
     def call(self, name: str, arguments: dict[str, Any]) -> dict[str, Any]:
         if name not in self._tools:
             return {
@@ -39,3 +51,92 @@ class ToolRegistry:
                 "name": name,
                 "arguments": arguments,
             }
+
+    def call_many(
+        self,
+        requests: list[tuple[str, dict[str, Any]]],
+        *,
+        max_workers: int = 4,
+        deadline: Deadline | None = None,
+    ) -> list[tuple[dict[str, Any], float]]:
+        """Run independent tool calls concurrently; returns ``(result, latency_ms)`` in request order.
+
+        At most ``max_workers`` calls run at once, and each call's timeout starts when it is
+        dispatched, not when the batch was submitted. A call that exceeds its tool's timeout
+        (or the episode ``deadline``) is reported as failed; its thread is abandoned rather
+        than joined, and its slot goes to the next queued call.
+        """
+        if not requests:
+            return []
+        if deadline is not None:
+            deadline.check()
+        timeouts = [self.timeout_for(name) for name, _ in requests]
+        sequential = len(requests) == 1 or max_workers <= 1
+        if sequential and deadline is None and all(timeout is None for timeout in timeouts):
+            return [self._timed_call(name, arguments) for name, arguments in requests]
+
+        slots = max(1, min(max_workers, len(requests)))
+        results: list[tuple[dict[str, Any], float] | None] = [None] * len(requests)
+        running: dict[Future[tuple[dict[str, Any], float]], tuple[int, float, float | None]] = {}
+        queued = iter(enumerate(requests))
+        exhausted = False
+        while running or not exhausted:
+            while not exhausted and len(running) < slots:
+                item = next(queued, None)
+                if item is None:
+                    exhausted = True
+                    break
+                index, (name, arguments) = item
+                limit = timeouts[index]
+                if deadline is not None:
+                    remaining = deadline.remaining()
+                    if remaining <= 0.0:
+                        results[index] = (self._timeout_result(name, arguments, 0.0), 0.0)
+                        continue
+                    limit = remaining if limit is None else min(limit, remaining)
+                running[self._dispatch(name, arguments)] = (index, time.perf_counter(), limit)
+            if not running:
+                continue
+
+            now = time.perf_counter()
+            expiries = [started + limit for _, started, limit in running.values() if limit is not None]
+            wait(list(running), timeout=max(0.0, min(expiries) - now) if expiries else None, return_when=FIRST_COMPLETED)
+            now = time.perf_counter()
+            for future, (index, started, limit) in list(running.items()):
+                if future.done():
+                    results[index] = future.result()
+                elif limit is not None and now - started >= limit:
+                    name, arguments = requests[index]
+                    results[index] = (self._timeout_result(name, arguments, limit), round((now - started) * 1000, 3))
+                else:
+                    continue
+                del running[future]
+        return [result for result in results if result is not None]
+
+    def _dispatch(self, name: str, arguments: dict[str, Any]) -> Future[tuple[dict[str, Any], float]]:
+        future: Future[tuple[dict[str, Any], float]] = Future()
+
+        def _run() -> None:
+            future.set_result(self._timed_call(name, arguments))
+
+        threading.Thread(target=_run, name=f"tool-{name}", daemon=True).start()
+        return future
+
+    def _timeout_result(self, name: str, arguments: dict[str, Any], limit: float) -> dict[str, Any]:
+        return {
+            "ok": False,
+            "error": _timeout_error(limit, self.timeout_for(name)),
+            "name": name,
+            "arguments": arguments,
+        }
+
+    def _timed_call(self, name: str, arguments: dict[str, Any]) -> tuple[dict[str, Any], float]:
+        start_time = time.perf_counter()
+        result = self.call(name, arguments)
+        return result, round((time.perf_counter() - start_time) * 1000, 3)
+
+
+def _timeout_error(timeout: float | None, tool_timeout: float | None) -> str:
+    if tool_timeout is None or (timeout is not None and timeout < tool_timeout):
+        return "deadline_exceeded"
+    return f"timeout:{tool_timeout}s"
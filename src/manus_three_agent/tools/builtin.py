@@ -4,9 +4,12 @@ import math
 import re
 from typing import Any
 
-import requests
+from manus_three_agent.tools.http import get_default_fetcher
 
 _SAFE_EXPR = re.compile(r"^[0-9\s\+\-\*\/\(\)\.,a-zA-Z_]+$")
+_TITLE = re.compile(r"<title[^>]*>(.*?)</title>", flags=re.IGNORECASE | re.DOTALL)
+_WHITESPACE = re.compile(r"\s+")
+_MIN_FETCH_BYTES = 64 * 1024
 
 
 def calculator_tool(arguments: dict[str, Any]) -> dict[str, Any]:
@@ -27,20 +30,24 @@ def fetch_url_tool(arguments: dict[str, Any]) -> dict[str, Any]:
     if not url:
         return {"ok": False, "error": "empty_url"}
 
-    response = requests.get(url, timeout=12)
+    # Titles usually sit in <head>; read a fixed prefix rather than the whole page.
+    max_bytes = int(arguments.get("max_bytes", max(_MIN_FETCH_BYTES, max_chars * 4)))
+    response = get_default_fetcher().fetch(url, max_bytes=max_bytes, timeout=12)
     content_type = response.headers.get("content-type", "")
-    text = response.text[:max_chars]
+    body = response.text
     title = ""
 
-    title_match = re.search(r"<title>(.*?)</title>", response.text, flags=re.IGNORECASE | re.DOTALL)
+    title_match = _TITLE.search(body)
     if title_match:
-        title = re.sub(r"\\s+", " ", title_match.group(1)).strip()
+        title = _WHITESPACE.sub(" ", title_match.group(1)).strip()
 
     return {
         "ok": response.ok,
-        "status": response.status_code,
-        "url": str(response.url),
+        "status": response.status,
+        "url": response.url,
         "content_type": content_type,
         "title": title,
-        "content_preview": re.sub(r"\\s+", " ", text).strip(),
+        "content_preview": _WHITESPACE.sub(" ", body[:max_chars]).strip(),
+        "truncated": response.truncated,
+        "cache": response.cache,
     }
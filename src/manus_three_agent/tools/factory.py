@@ -4,8 +4,8 @@ from manus_three_agent.tools.base import ToolRegistry
 from manus_three_agent.tools.builtin import calculator_tool, fetch_url_tool
 
 
-def build_default_tool_registry() -> ToolRegistry:
-    registry = ToolRegistry()
+def build_default_tool_registry(default_timeout_seconds: float | None = None) -> ToolRegistry:
+    registry = ToolRegistry(default_timeout_seconds=default_timeout_seconds)
     registry.register("calculator", calculator_tool)
-    registry.register("fetch_url", fetch_url_tool)
+    registry.register("fetch_url", fetch_url_tool, timeout_seconds=15.0)
     return registry
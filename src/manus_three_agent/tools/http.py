@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    encoding: str
+    truncated: bool
+    fetched_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int
+    ok: bool
+    headers: dict[str, str]
+    body: bytes
+    encoding: str
+    truncated: bool
+    cache: str
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.encoding or "utf-8", errors="replace")
+
+
+class HttpFetcher:
+    """Keep-alive ``requests`` session with capped streaming reads and a revalidating cache.
+
+    Fresh entries (younger than ``ttl_seconds``) are served locally; stale entries with an
+    ETag or Last-Modified are revalidated with a conditional GET.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 300.0,
+        max_entries: int = 256,
+        pool_maxsize: int = 16,
+        user_agent: str = "manus-3subagent-repro/0.1",
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["User-Agent"] = user_agent
+        self._cache: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fetch(self, url: str, *, max_bytes: int, timeout: float = 12.0) -> FetchResult:
+        cached = self._get_cached(url)
+        if cached is not None and not (cached.truncated and len(cached.body) < max_bytes):
+            if time.monotonic() - cached.fetched_at <= self.ttl_seconds:
+                return self._result(cached, max_bytes=max_bytes, cache="hit")
+        else:
+            cached = None
+
+        headers: dict[str, str] = {}
+        if cached is not None:
+            if cached.headers.get("etag"):
+                headers["If-None-Match"] = cached.headers["etag"]
+            if cached.headers.get("last-modified"):
+                headers["If-Modified-Since"] = cached.headers["last-modified"]
+
+        with self.session.get(url, timeout=timeout, stream=True, headers=headers) as response:
+            if response.status_code == 304 and cached is not None:
+                cached.fetched_at = time.monotonic()
+                self._put_cached(url, cached)
+                return self._result(cached, max_bytes=max_bytes, cache="revalidated")
+
+            body, truncated = _read_capped(response, max_bytes)
+            entry = CachedResponse(
+                url=str(response.url),
+                status=response.status_code,
+                headers={k.lower(): v for k, v in response.headers.items()},
+                body=body,
+                encoding=response.encoding or "utf-8",
+                truncated=truncated,
+            )
+
+        if entry.status == 200:
+            self._put_cached(url, entry)
+        return self._result(entry, max_bytes=max_bytes, cache="miss")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _get_cached(self, url: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._cache.get(url)
+            if entry is not None:
+                self._cache.move_to_end(url)
+            return entry
+
+    def _put_cached(self, url: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._cache[url] = entry
+            self._cache.move_to_end(url)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def _result(self, entry: CachedResponse, *, max_bytes: int, cache: str) -> FetchResult:
+        return FetchResult(
+            url=entry.url,
+            status=entry.status,
+            ok=200 <= entry.status < 400,
+            headers=entry.headers,
+            body=entry.body[:max_bytes],
+            encoding=entry.encoding,
+            truncated=entry.truncated or len(entry.body) > max_bytes,
+            cache=cache,
+        )
+
+
+def _read_capped(response: requests.Response, max_bytes: int) -> tuple[bytes, bool]:
+    chunks: list[bytes] = []
+    size = 0
+    for chunk in response.iter_content(chunk_size=16 * 1024):
+        if not chunk:
+            continue
+        remaining = max_bytes - size
+        if len(chunk) > remaining:
+            chunks.append(chunk[:remaining])
+            return b"".join(chunks), True
+        chunks.append(chunk)
+        size += len(chunk)
+    return b"".join(chunks), False
+
+
+_DEFAULT_FETCHER: HttpFetcher | None = None
+_DEFAULT_FETCHER_LOCK = threading.Lock()
+
+
+def get_default_fetcher() -> HttpFetcher:
+    global _DEFAULT_FETCHER
+    with _DEFAULT_FETCHER_LOCK:
+        if _DEFAULT_FETCHER is None:
+            _DEFAULT_FETCHER = HttpFetcher()
+        return _DEFAULT_FETCHER
+
+
+def set_default_fetcher(fetcher: HttpFetcher | None) -> None:
+    global _DEFAULT_FETCHER
+    with _DEFAULT_FETCHER_LOCK:
+        _DEFAULT_FETCHER = fetcher
+
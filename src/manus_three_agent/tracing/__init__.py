@@ -1,4 +1,12 @@
 from manus_three_agent.tracing.collector import TraceCollector
+from manus_three_agent.tracing.reader import event_segment_paths, iter_run_events
 from manus_three_agent.tracing.schemas import TraceConfig, TraceEvent, TraceSession
 
-__all__ = ["TraceCollector", "TraceConfig", "TraceEvent", "TraceSession"]
+__all__ = [
+    "TraceCollector",
+    "TraceConfig",
+    "TraceEvent",
+    "TraceSession",
+    "event_segment_paths",
+    "iter_run_events",
+]
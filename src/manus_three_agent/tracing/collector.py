@@ -16,7 +16,16 @@ class TraceCollector:
         self._event_count = 0
 
         if self.enabled:
-            self.writer = TraceWriter(base_dir=config.base_dir, run_id=run_id)
+            self.writer = TraceWriter(
+                base_dir=config.base_dir,
+                run_id=run_id,
+                flush_bytes=config.flush_bytes,
+                flush_interval_seconds=config.flush_interval_seconds,
+                background=config.background_writer,
+                queue_size=config.queue_size,
+                compression=config.compression,
+                segment_max_bytes=config.segment_max_bytes,
+            )
 
     @classmethod
     def disabled(cls) -> "TraceCollector":
@@ -41,7 +50,7 @@ class TraceCollector:
             environment=environment,
             model_stack=model_stack,
             runtime_config=runtime_config,
-            metadata=metadata or {},
+            metadata={**(metadata or {}), "trace_codec": self.writer.codec},
         )
         self.writer.write_session(self.session.model_dump())
 
@@ -67,8 +76,16 @@ class TraceCollector:
         self.writer.append_event(event.model_dump())
         self._event_count += 1
 
+    def flush(self) -> None:
+        if self.writer is not None:
+            self.writer.flush()
+
     def close(self, *, status: str, summary: dict[str, Any] | None = None) -> None:
-        if not self.enabled or self.writer is None or self.session is None:
+        if not self.enabled or self.writer is None:
+            return
+
+        self.writer.close()
+        if self.session is None:
             return
 
         self.session.finished_at = utc_now_iso()
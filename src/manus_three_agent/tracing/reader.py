@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from manus_three_agent.utils.io import iter_jsonl
+
+_SEGMENT_NAME = re.compile(r"^events(?:\.(\d+))?\.jsonl(?:\.gz|\.zst)?$")
+
+
+def event_segment_paths(run_dir: Path) -> list[Path]:
+    """Return a run's event files in write order (plain, compressed and rotated segments)."""
+    if not run_dir.is_dir():
+        return []
+
+    segments: list[tuple[int, Path]] = []
+    for path in run_dir.iterdir():
+        match = _SEGMENT_NAME.match(path.name)
+        if match is None or not path.is_file():
+            continue
+        index = int(match.group(1)) if match.group(1) is not None else -1
+        segments.append((index, path))
+    return [path for _, path in sorted(segments)]
+
+
+def iter_run_events(run_dir: Path) -> Iterator[dict[str, Any]]:
+    for path in event_segment_paths(run_dir):
+        yield from iter_jsonl(path)
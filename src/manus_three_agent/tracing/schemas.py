@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -10,6 +10,12 @@ class TraceConfig(BaseModel):
     enabled: bool = False
     base_dir: str = "artifacts/traces"
     schema_version: str = "1.0.0"
+    flush_bytes: int = Field(default=64 * 1024, ge=0)
+    flush_interval_seconds: float = Field(default=1.0, gt=0.0)
+    background_writer: bool = False
+    queue_size: int = Field(default=10000, ge=1)
+    compression: Literal["none", "gzip", "zstd"] = "none"
+    segment_max_bytes: int | None = Field(default=None, ge=1)
 
 
 class TraceSession(BaseModel):
@@ -1,20 +1,221 @@
 from __future__ import annotations
 
+import queue
+import threading
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
-from manus_three_agent.utils.io import append_jsonl, write_json
+import orjson
+
+from manus_three_agent.tracing.reader import event_segment_paths
+from manus_three_agent.utils.compression import CODEC_SUFFIXES, compress_chunk, resolve_codec
+from manus_three_agent.utils.io import write_json
+
+_STOP = object()
 
 
 class TraceWriter:
-    def __init__(self, *, base_dir: str, run_id: str) -> None:
+    """Append-only ``events.jsonl`` writer with an open handle and batched flushes.
+
+    Lines are serialized on the caller thread and buffered until ``flush_bytes`` or
+    ``flush_interval_seconds`` is exceeded. With ``background=True`` the buffer is drained
+    by a writer thread fed through a bounded queue, so callers never touch the disk.
+
+    Each flush may be compressed as an independent gzip member / zstd frame, and output
+    rolls over to ``events.<n>.jsonl[.gz|.zst]`` once a segment reaches ``segment_max_bytes``.
+
+    Events appended after ``close()`` are dropped and counted in ``dropped_events``. A write
+    error on the writer thread is kept and re-raised from the next ``flush()`` or ``close()``.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_dir: str,
+        run_id: str,
+        flush_bytes: int = 64 * 1024,
+        flush_interval_seconds: float = 1.0,
+        background: bool = False,
+        queue_size: int = 10000,
+        compression: str = "none",
+        segment_max_bytes: int | None = None,
+    ) -> None:
         self.run_dir = Path(base_dir) / run_id
         self.session_path = self.run_dir / "session.json"
-        self.events_path = self.run_dir / "events.jsonl"
         self.run_dir.mkdir(parents=True, exist_ok=True)
+        self.codec = resolve_codec(compression)
+        self.segment_max_bytes = segment_max_bytes
+        self._segment_index = self._resume_segment_index()
+        self.events_path = self._segment_path(self._segment_index)
+        self._segment_bytes = self.events_path.stat().st_size if self.events_path.exists() else 0
+
+        self.flush_bytes = flush_bytes
+        self.flush_interval_seconds = flush_interval_seconds
+        self._lock = threading.Lock()
+        self._submit_lock = threading.Lock()
+        self._handle: BinaryIO | None = None
+        self._buffer: list[bytes] = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+        self._closed = False
+        self._error: BaseException | None = None
+        self.dropped_events = 0
+
+        self._queue: queue.Queue[Any] | None = None
+        self._thread: threading.Thread | None = None
+        if background:
+            self._queue = queue.Queue(maxsize=queue_size)
+            self._thread = threading.Thread(
+                target=self._drain,
+                name=f"trace-writer-{run_id}",
+                daemon=True,
+            )
+            self._thread.start()
 
     def write_session(self, payload: dict[str, Any]) -> None:
         write_json(self.session_path, payload)
 
     def append_event(self, payload: dict[str, Any]) -> None:
-        append_jsonl(self.events_path, payload)
+        line = orjson.dumps(payload) + b"\n"
+        if self._queue is not None:
+            with self._submit_lock:
+                if not self._closed and self._writer_alive():
+                    self._queue.put(line)
+                    return
+            self._drop(1)
+            return
+        with self._lock:
+            if self._closed:
+                self.dropped_events += 1
+                return
+            self._buffer_line(line)
+
+    def flush(self) -> None:
+        if self._queue is not None and self._writer_alive():
+            self._queue.join()
+        with self._lock:
+            self._raise_pending()
+            self._flush_locked()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        if self._queue is not None and self._thread is not None:
+            with self._submit_lock:
+                self._closed = True
+                if self._writer_alive():
+                    self._queue.put(_STOP)
+            self._thread.join()
+            self._drain_leftovers()
+        self._closed = True
+        with self._lock:
+            try:
+                self._raise_pending()
+                self._flush_locked()
+            finally:
+                if self._handle is not None:
+                    self._handle.close()
+                    self._handle = None
+
+    def _drain(self) -> None:
+        assert self._queue is not None
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval_seconds)
+            except queue.Empty:
+                with self._lock:
+                    if self._buffer:
+                        self._guarded(self._flush_locked)
+                continue
+            try:
+                if item is _STOP:
+                    return
+                with self._lock:
+                    self._guarded(self._buffer_line, item)
+            finally:
+                self._queue.task_done()
+
+    def _guarded(self, write: Any, *args: Any) -> None:
+        """Keep the writer thread alive on a write error so producers and ``flush()`` never hang."""
+        if self._error is not None:
+            self.dropped_events += len(args)
+            return
+        try:
+            write(*args)
+        except Exception as exc:
+            self._error = exc
+            self.dropped_events += len(self._buffer)
+            self._buffer.clear()
+            self._buffered_bytes = 0
+
+    def _drain_leftovers(self) -> None:
+        """Write lines still queued when the writer thread stopped early on a fatal error."""
+        assert self._queue is not None
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP:
+                with self._lock:
+                    self._guarded(self._buffer_line, item)
+            self._queue.task_done()
+
+    def _writer_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _drop(self, count: int) -> None:
+        with self._lock:
+            self.dropped_events += count
+
+    def _raise_pending(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError(f"trace writer failed for {self.run_dir}") from error
+
+    def _buffer_line(self, line: bytes) -> None:
+        self._buffer.append(line)
+        self._buffered_bytes += len(line)
+        if (
+            self._buffered_bytes >= self.flush_bytes
+            or time.monotonic() - self._last_flush >= self.flush_interval_seconds
+        ):
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        if self.segment_max_bytes is not None and self._segment_bytes >= self.segment_max_bytes:
+            self._rotate_locked()
+        if self._handle is None:
+            self._handle = open(self.events_path, "ab")
+        chunk = compress_chunk(b"".join(self._buffer), self.codec)
+        self._handle.write(chunk)
+        self._handle.flush()
+        self._segment_bytes += len(chunk)
+        self._buffer.clear()
+        self._buffered_bytes = 0
+
+    def _rotate_locked(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        self._segment_index += 1
+        self.events_path = self._segment_path(self._segment_index)
+        self._segment_bytes = 0
+
+    def _segment_path(self, index: int) -> Path:
+        suffix = CODEC_SUFFIXES[self.codec]
+        if self.segment_max_bytes is None:
+            return self.run_dir / f"events.jsonl{suffix}"
+        return self.run_dir / f"events.{index:05d}.jsonl{suffix}"
+
+    def _resume_segment_index(self) -> int:
+        if self.segment_max_bytes is None:
+            return 0
+        existing = [p for p in event_segment_paths(self.run_dir) if p.name.split(".")[1].isdigit()]
+        if not existing:
+            return 0
+        return int(existing[-1].name.split(".")[1])
@@ -1,3 +1,4 @@
 from manus_three_agent.training.build_sft_data import build_trajectory_dataset
+from manus_three_agent.training.incremental import build_trajectory_dataset_incremental
 
-__all__ = ["build_trajectory_dataset"]
+__all__ = ["build_trajectory_dataset", "build_trajectory_dataset_incremental"]
@@ -1,23 +1,21 @@
 from __future__ import annotations
 
+import os
+import time
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
 from typing import Any
 
 import orjson
 
+from manus_three_agent.tracing.reader import iter_run_events
+from manus_three_agent.utils.io import iter_jsonl
 
-def load_jsonl(path: Path) -> list[dict[str, Any]]:
-    if not path.exists():
-        return []
+ProgressHook = Callable[[dict[str, Any]], None]
 
-    rows: list[dict[str, Any]] = []
-    with open(path, "rb") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            rows.append(orjson.loads(line))
-    return rows
+
+def load_jsonl(path: Path) -> list[dict[str, Any]]:
+    return list(iter_jsonl(path))
 
 
 def iter_run_dirs(trace_dir: Path) -> list[Path]:
@@ -26,93 +24,150 @@ def iter_run_dirs(trace_dir: Path) -> list[Path]:
     return sorted([p for p in trace_dir.iterdir() if p.is_dir()])
 
 
-def build_sft_records(trace_dir: Path) -> list[dict[str, Any]]:
-    records: list[dict[str, Any]] = []
-
-    for run_dir in iter_run_dirs(trace_dir):
-        events = load_jsonl(run_dir / "events.jsonl")
-        role_inputs: dict[tuple[str, int], dict[str, Any]] = {}
-
-        for event in events:
-            event_type = str(event.get("event_type", ""))
-            payload = event.get("payload", {})
-            run_id = str(event.get("run_id", ""))
-            step = int(event.get("step", 0))
-
-            if event_type == "llm_call":
-                system_prompt = str(payload.get("system_prompt", "")).strip()
-                user_prompt = str(payload.get("user_prompt", "")).strip()
-                parsed_output = payload.get("parsed_output")
-                role = str(payload.get("agent", "unknown"))
-                if not system_prompt or not user_prompt or parsed_output is None:
-                    continue
-
-                records.append(
-                    {
-                        "run_id": run_id,
-                        "step": step,
-                        "role": role,
-                        "source_event": "llm_call",
-                        "messages": [
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": user_prompt},
-                            {
-                                "role": "assistant",
-                                "content": orjson.dumps(parsed_output).decode("utf-8"),
-                            },
-                        ],
-                    }
-                )
+def iter_run_records(run_dir: Path) -> Iterator[dict[str, Any]]:
+    """Stream SFT records for one run; only unmatched ``*_input`` payloads are held in memory.
+
+    A speculative worker call is held until its step's ``speculation`` event and kept only when
+    the proposal was committed, so discarded actions that never ran are not exported.
+    """
+    role_inputs: dict[tuple[str, int], dict[str, Any]] = {}
+    speculative: dict[int, list[dict[str, Any]]] = {}
+
+    for event in iter_run_events(run_dir):
+        event_type = str(event.get("event_type", ""))
+        payload = event.get("payload", {})
+        run_id = str(event.get("run_id", ""))
+        step = int(event.get("step", 0))
+
+        if event_type == "speculation":
+            held = speculative.pop(step, [])
+            if payload.get("outcome") == "committed":
+                yield from held
+            continue
+
+        if event_type == "llm_call":
+            system_prompt = str(payload.get("system_prompt", "")).strip()
+            user_prompt = str(payload.get("user_prompt", "")).strip()
+            parsed_output = payload.get("parsed_output")
+            role = str(payload.get("agent", "unknown"))
+            # Failed, invalid, or rejected answers (e.g. an escalated cascade tier) are not training targets.
+            if payload.get("status") != "success":
                 continue
-
-            if event_type.endswith("_input"):
-                role = event_type.replace("_input", "")
-                role_inputs[(role, step)] = payload
+            if not system_prompt or not user_prompt or parsed_output is None:
                 continue
 
-            if event_type.endswith("_output"):
-                role = event_type.replace("_output", "")
-                input_payload = role_inputs.get((role, step), {})
-                records.append(
+            record = {
+                "run_id": run_id,
+                "step": step,
+                "role": role,
+                "source_event": "llm_call",
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
                     {
-                        "run_id": run_id,
-                        "step": step,
-                        "role": role,
-                        "source_event": event_type,
-                        "messages": [
-                            {"role": "system", "content": f"{role} role boundary trace"},
-                            {
-                                "role": "user",
-                                "content": orjson.dumps(input_payload).decode("utf-8"),
-                            },
-                            {
-                                "role": "assistant",
-                                "content": orjson.dumps(payload).decode("utf-8"),
-                            },
-                        ],
-                    }
-                )
+                        "role": "assistant",
+                        "content": orjson.dumps(parsed_output).decode("utf-8"),
+                    },
+                ],
+            }
+            if payload.get("speculative"):
+                speculative.setdefault(step, []).append(record)
+            else:
+                yield record
+            continue
+
+        if event_type.endswith("_input"):
+            role = event_type.replace("_input", "")
+            role_inputs[(role, step)] = payload
+            continue
+
+        if event_type.endswith("_output"):
+            role = event_type.replace("_output", "")
+            input_payload = role_inputs.pop((role, step), {})
+            yield {
+                "run_id": run_id,
+                "step": step,
+                "role": role,
+                "source_event": event_type,
+                "messages": [
+                    {"role": "system", "content": f"{role} role boundary trace"},
+                    {
+                        "role": "user",
+                        "content": orjson.dumps(input_payload).decode("utf-8"),
+                    },
+                    {
+                        "role": "assistant",
+                        "content": orjson.dumps(payload).decode("utf-8"),
+                    },
+                ],
+            }
 
-    return records
 
+def iter_sft_records(trace_dir: Path) -> Iterator[dict[str, Any]]:
+    for run_dir in iter_run_dirs(trace_dir):
+        yield from iter_run_records(run_dir)
 
-def write_jsonl(path: Path, rows: list[dict[str, Any]]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "wb") as f:
-        for row in rows:
-            f.write(orjson.dumps(row))
-            f.write(b"\n")
+
+def build_sft_records(trace_dir: Path) -> list[dict[str, Any]]:
+    return list(iter_sft_records(trace_dir))
 
 
-def build_trajectory_dataset(trace_dir: str, output_path: str) -> dict[str, Any]:
+def write_jsonl(path: Path, rows: Iterable[dict[str, Any]]) -> int:
+    """Write ``rows`` incrementally via a temp file that replaces ``path`` on success."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    count = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            for row in rows:
+                f.write(orjson.dumps(row))
+                f.write(b"\n")
+                count += 1
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return count
+
+
+def build_trajectory_dataset(
+    trace_dir: str,
+    output_path: str,
+    *,
+    progress: ProgressHook | None = None,
+    progress_every: int = 100,
+) -> dict[str, Any]:
     trace_path = Path(trace_dir)
     out_path = Path(output_path)
+    run_dirs = iter_run_dirs(trace_path)
+    start_time = time.perf_counter()
+    stats = {"runs_done": 0, "num_records": 0}
+
+    def _records() -> Iterator[dict[str, Any]]:
+        for run_dir in run_dirs:
+            for record in iter_run_records(run_dir):
+                stats["num_records"] += 1
+                yield record
+            stats["runs_done"] += 1
+            if progress is not None and (
+                stats["runs_done"] % max(1, progress_every) == 0 or stats["runs_done"] == len(run_dirs)
+            ):
+                progress(
+                    {
+                        "runs_done": stats["runs_done"],
+                        "runs_total": len(run_dirs),
+                        "num_records": stats["num_records"],
+                        "elapsed_seconds": round(time.perf_counter() - start_time, 3),
+                    }
+                )
 
-    records = build_sft_records(trace_path)
-    write_jsonl(out_path, records)
+    num_records = write_jsonl(out_path, _records())
+    elapsed = time.perf_counter() - start_time
 
     return {
         "trace_dir": str(trace_path),
         "output_path": str(out_path),
-        "num_records": len(records),
+        "num_records": num_records,
+        "num_runs": len(run_dirs),
+        "elapsed_seconds": round(elapsed, 3),
+        "records_per_second": round(num_records / elapsed, 1) if elapsed > 0 else 0.0,
     }
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from manus_three_agent.tracing.reader import event_segment_paths
+from manus_three_agent.training.build_sft_data import ProgressHook, iter_run_dirs, iter_run_records, write_jsonl
+from manus_three_agent.utils.io import write_json
+
+MANIFEST_VERSION = 1
+
+
+def run_fingerprint(run_dir: Path) -> list[list[Any]]:
+    """Cheap change detector: ``[name, size, mtime_ns]`` for every event segment."""
+    out: list[list[Any]] = []
+    for path in event_segment_paths(run_dir):
+        stat = path.stat()
+        out.append([path.name, stat.st_size, stat.st_mtime_ns])
+    return out
+
+
+def run_content_hash(run_dir: Path) -> str:
+    digest = hashlib.sha256()
+    for path in event_segment_paths(run_dir):
+        digest.update(path.name.encode("utf-8"))
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return {"version": MANIFEST_VERSION, "runs": {}}
+    manifest = orjson.loads(path.read_bytes())
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "runs": {}}
+    return manifest
+
+
+def _export_run(run_dir: str, shard_path: str) -> int:
+    return write_jsonl(Path(shard_path), iter_run_records(Path(run_dir)))
+
+
+def build_trajectory_dataset_incremental(
+    trace_dir: str,
+    output_path: str,
+    *,
+    workers: int = 1,
+    manifest_path: str = "",
+    progress: ProgressHook | None = None,
+    progress_every: int = 100,
+) -> dict[str, Any]:
+    """Export only new or changed runs, then merge per-run shards in run order.
+
+    Each run is exported to ``.<output>.shards/<run_id>.jsonl`` and tracked in a manifest
+    with its segment fingerprint, content hash, and record count. Unchanged runs reuse their
+    shard; changed runs are exported across a process pool. Fingerprints and hashes are taken
+    before a run is exported, so a run still being appended is picked up again next time.
+    """
+    trace_path = Path(trace_dir)
+    out_path = Path(output_path)
+    shard_dir = out_path.parent / f".{out_path.name}.shards"
+    manifest_file = Path(manifest_path) if manifest_path else out_path.with_name(f"{out_path.name}.manifest.json")
+    start_time = time.perf_counter()
+
+    manifest = load_manifest(manifest_file)
+    previous: dict[str, dict[str, Any]] = manifest.get("runs", {})
+    current: dict[str, dict[str, Any]] = {}
+    pending: list[tuple[str, Path, Path, dict[str, Any]]] = []
+    run_dirs = iter_run_dirs(trace_path)
+
+    for run_dir in run_dirs:
+        run_id = run_dir.name
+        shard_path = shard_dir / f"{run_id}.jsonl"
+        fingerprint = run_fingerprint(run_dir)
+        entry = previous.get(run_id)
+        if entry is not None and shard_path.exists() and entry.get("fingerprint") == fingerprint:
+            current[run_id] = entry
+            continue
+        content_hash = run_content_hash(run_dir)
+        if entry is not None and shard_path.exists() and entry.get("hash") == content_hash:
+            current[run_id] = {**entry, "fingerprint": fingerprint}
+            continue
+        pending.append((run_id, run_dir, shard_path, {"fingerprint": fingerprint, "hash": content_hash}))
+
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    if pending:
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            if executor is not None:
+                futures = [executor.submit(_export_run, str(run_dir), str(shard)) for _, run_dir, shard, _ in pending]
+                record_counts = (future.result() for future in futures)
+            else:
+                record_counts = (_export_run(str(run_dir), str(shard)) for _, run_dir, shard, _ in pending)
+
+            for done, ((run_id, _, _, scanned), record_count) in enumerate(zip(pending, record_counts), start=1):
+                current[run_id] = {**scanned, "record_count": record_count}
+                if progress is not None and (done % max(1, progress_every) == 0 or done == len(pending)):
+                    progress(
+                        {
+                            "runs_done": done,
+                            "runs_total": len(pending),
+                            "num_records": sum(int(e["record_count"]) for e in current.values()),
+                            "elapsed_seconds": round(time.perf_counter() - start_time, 3),
+                        }
+                    )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    removed = sorted(set(previous) - set(current))
+    for run_id in removed:
+        (shard_dir / f"{run_id}.jsonl").unlink(missing_ok=True)
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(f".{out_path.name}.tmp")
+    try:
+        with open(tmp_path, "wb") as out:
+            for run_id in sorted(current):
+                with open(shard_dir / f"{run_id}.jsonl", "rb") as shard:
+                    shutil.copyfileobj(shard, out)
+        os.replace(tmp_path, out_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    write_json(manifest_file, {"version": MANIFEST_VERSION, "trace_dir": str(trace_path), "runs": current})
+
+    num_records = sum(int(entry["record_count"]) for entry in current.values())
+    elapsed = time.perf_counter() - start_time
+    return {
+        "trace_dir": str(trace_path),
+        "output_path": str(out_path),
+        "manifest_path": str(manifest_file),
+        "num_records": num_records,
+        "num_runs": len(run_dirs),
+        "processed_runs": len(pending),
+        "skipped_runs": len(run_dirs) - len(pending),
+        "removed_runs": len(removed),
+        "elapsed_seconds": round(elapsed, 3),
+        "records_per_second": round(num_records / elapsed, 1) if elapsed > 0 else 0.0,
+    }
@@ -1,4 +1,4 @@
-from manus_three_agent.utils.io import append_jsonl, load_yaml, write_json
+from manus_three_agent.utils.io import append_jsonl, iter_jsonl, load_yaml, write_json
 from manus_three_agent.utils.seeding import set_seed
 
-__all__ = ["append_jsonl", "load_yaml", "set_seed", "write_json"]
+__all__ = ["append_jsonl", "iter_jsonl", "load_yaml", "set_seed", "write_json"]
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from typing import Any
+
+from manus_three_agent.core.types import ModelConfig
+from manus_three_agent.tracing import TraceCollector
+from manus_three_agent.utils.deadline import DeadlineExceeded
+from manus_three_agent.utils.llm import LLMClient, OutputRejectedError, OutputValidator
+
+
+def confidence_of(raw: dict[str, Any]) -> float | None:
+    """Self-reported ``confidence``; for macro outputs, the lowest confidence among the actions."""
+    values = [raw.get("confidence")]
+    values += [action.get("confidence") for action in raw.get("actions") or [] if isinstance(action, dict)]
+    numbers = [float(v) for v in values if isinstance(v, (int, float)) and not isinstance(v, bool)]
+    return min(numbers) if numbers else None
+
+
+class CascadeStats:
+    """Per-episode escalation counters and estimated savings, shared by the three agents.
+
+    Savings compare each call with sending it straight to the role's final model: cost uses
+    ``cost_per_1k_tokens`` and the cheap tier's token count, latency uses the mean latency of
+    that role's final-model calls so far. Escalated calls count their wasted tiers as negative savings.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._roles: dict[str, dict[str, Any]] = {}
+
+    def expected_latency_ms(self, role: str) -> float | None:
+        with self._lock:
+            entry = self._roles.get(role)
+            if entry is None or not entry["final_calls"]:
+                return None
+            return entry["final_latency_ms"] / entry["final_calls"]
+
+    def record(
+        self,
+        role: str,
+        *,
+        escalations: list[str],
+        accepted_tier: int,
+        final_tier: int,
+        final_latency_ms: float | None,
+        saved_cost: float | None,
+        saved_latency_ms: float | None,
+    ) -> None:
+        with self._lock:
+            entry = self._roles.setdefault(
+                role,
+                {
+                    "calls": 0,
+                    "accepted_cheap": 0,
+                    "escalations": Counter(),
+                    "final_calls": 0,
+                    "final_latency_ms": 0.0,
+                    "saved_cost": 0.0,
+                    "saved_latency_ms": 0.0,
+                },
+            )
+            entry["calls"] += 1
+            entry["accepted_cheap"] += int(accepted_tier < final_tier)
+            entry["escalations"].update(escalations)
+            if final_latency_ms is not None:
+                entry["final_calls"] += 1
+                entry["final_latency_ms"] += final_latency_ms
+            entry["saved_cost"] += saved_cost or 0.0
+            entry["saved_latency_ms"] += saved_latency_ms or 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                role: {
+                    "calls": entry["calls"],
+                    "accepted_cheap": entry["accepted_cheap"],
+                    "escalation_rate": round(1 - entry["accepted_cheap"] / entry["calls"], 3),
+                    "escalations": dict(entry["escalations"]),
+                    "saved_cost": round(entry["saved_cost"], 6),
+                    "saved_latency_ms": round(entry["saved_latency_ms"], 3),
+                }
+                for role, entry in self._roles.items()
+            }
+
+
+class ModelCascade:
+    """Try a role's cheaper ``cascade.models`` in order before its ``model``.
+
+    A tier's answer is kept unless it fails validation, errors, or reports a ``confidence``
+    below ``cascade.confidence_threshold``; the final model's answer is always kept. Cheap
+    tiers get one parse attempt, since escalating beats re-asking a model that already
+    produced invalid output. Without cascade models this is a plain ``chat_json``.
+    """
+
+    def __init__(
+        self,
+        llm: LLMClient,
+        model_config: ModelConfig,
+        *,
+        role: str,
+        tracer: TraceCollector | None = None,
+        stats: CascadeStats | None = None,
+    ) -> None:
+        self.llm = llm
+        self.model_config = model_config
+        self.role = role
+        self.tracer = tracer
+        self.stats = stats
+
+    @property
+    def tiers(self) -> list[str]:
+        return [*self.model_config.cascade.models, self.model_config.model]
+
+    def prompt_vars(self, subject: str) -> dict[str, str]:
+        """Prompt variables; ``confidence_field`` asks for a confidence only when cheap tiers will read it."""
+        if not self.model_config.cascade.models:
+            return {"confidence_field": ""}
+        return {"confidence_field": f"- confidence: number from 0 to 1, how sure you are {subject}"}
+
+    def chat_json(
+        self,
+        *,
+        system_prompt: str,
+        user_prompt: str,
+        trace_context: dict[str, Any],
+        validate: OutputValidator | None = None,
+        accept: OutputValidator | None = None,
+    ) -> dict[str, Any]:
+        """``accept`` is an extra check applied only to cheap tiers, for roles whose final call is lenient."""
+        generation_config = self.model_config.to_openai_chat_params()
+        tiers = self.tiers
+        if len(tiers) == 1:
+            return self.llm.chat_json(
+                model=tiers[0],
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                generation_config=generation_config,
+                trace_context=trace_context,
+                validate=validate,
+            )
+
+        threshold = self.model_config.cascade.confidence_threshold
+        cheap_retry = self.llm.retry_config.model_copy(update={"parse_attempts": 1})
+        attempts: list[dict[str, Any]] = []
+        for index, model in enumerate(tiers):
+            is_final = index == len(tiers) - 1
+            calls: list[dict[str, Any]] = []
+            attempt: dict[str, Any] = {"model": model}
+            attempts.append(attempt)
+            started = time.perf_counter()
+            try:
+                raw = self.llm.chat_json(
+                    model=model,
+                    system_prompt=system_prompt,
+                    user_prompt=user_prompt,
+                    generation_config=generation_config,
+                    trace_context={**trace_context, "cascade": {"tier": index, "tiers": len(tiers)}},
+                    validate=validate if is_final else _both(_both(validate, accept), _confident(attempt, threshold)),
+                    observe=calls.append,
+                    retry_config=None if is_final else cheap_retry,
+                )
+            except DeadlineExceeded:
+                raise
+            except Exception as exc:
+                if is_final:
+                    raise
+                if isinstance(exc, OutputRejectedError):
+                    attempt["outcome"] = "low_confidence"
+                else:
+                    attempt["outcome"] = "invalid_output" if isinstance(exc, ValueError) else "error"
+                continue
+            finally:
+                attempt["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+                attempt["total_tokens"] = sum(int(call.get("usage", {}).get("total_tokens", 0)) for call in calls)
+
+            attempt["confidence"] = confidence_of(raw)
+            attempt["outcome"] = "accepted"
+            self._finish(attempts, trace_context)
+            return raw
+        raise AssertionError("unreachable: the final tier either returns or raises")
+
+    def _finish(self, attempts: list[dict[str, Any]], trace_context: dict[str, Any]) -> None:
+        final_tier = len(self.tiers) - 1
+        accepted_tier = len(attempts) - 1
+        escalations = [attempt["outcome"] for attempt in attempts[:-1]]
+        spent_latency = sum(attempt["latency_ms"] for attempt in attempts)
+        if accepted_tier == final_tier:
+            final_latency: float | None = attempts[-1]["latency_ms"]
+            saved_latency: float | None = attempts[-1]["latency_ms"] - spent_latency
+        else:
+            final_latency = None
+            expected = self.stats.expected_latency_ms(self.role) if self.stats is not None else None
+            saved_latency = expected - spent_latency if expected is not None else None
+        saved_cost = self._saved_cost(attempts)
+
+        if self.stats is not None:
+            self.stats.record(
+                self.role,
+                escalations=escalations,
+                accepted_tier=accepted_tier,
+                final_tier=final_tier,
+                final_latency_ms=final_latency,
+                saved_cost=saved_cost,
+                saved_latency_ms=saved_latency,
+            )
+        if self.tracer:
+            self.tracer.log_event(
+                event_type="model_cascade",
+                step=int(trace_context.get("step", 0)),
+                payload={
+                    "agent": self.role,
+                    "model": attempts[-1]["model"],
+                    "tier": accepted_tier,
+                    "escalations": escalations,
+                    "attempts": attempts,
+                    "saved_cost": round(saved_cost, 6) if saved_cost is not None else None,
+                    "saved_latency_ms": round(saved_latency, 3) if saved_latency is not None else None,
+                },
+            )
+
+    def _saved_cost(self, attempts: list[dict[str, Any]]) -> float | None:
+        prices = self.model_config.cascade.cost_per_1k_tokens
+        if any(attempt["model"] not in prices for attempt in attempts) or self.model_config.model not in prices:
+            return None
+        spent = sum(attempt["total_tokens"] * prices[attempt["model"]] for attempt in attempts) / 1000
+        baseline = attempts[-1]["total_tokens"] * prices[self.model_config.model] / 1000
+        return baseline - spent
+
+
+def _confident(attempt: dict[str, Any], threshold: float | None) -> OutputValidator:
+    """Reject a cheap tier's answer below ``threshold`` inside the call, so its trace is not marked a success."""
+
+    def _validate(raw: dict[str, Any]) -> None:
+        confidence = attempt["confidence"] = confidence_of(raw)
+        if threshold is not None and confidence is not None and confidence < threshold:
+            raise OutputRejectedError(f"confidence {confidence} is below the cascade threshold {threshold}")
+
+    return _validate
+
+
+def _both(first: OutputValidator | None, second: OutputValidator | None) -> OutputValidator | None:
+    if first is None or second is None:
+        return first or second
+
+    def _validate(raw: dict[str, Any]) -> None:
+        first(raw)
+        second(raw)
+
+    return _validate
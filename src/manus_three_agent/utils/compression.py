@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import gzip
+import io
+from pathlib import Path
+from typing import BinaryIO
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+CODEC_SUFFIXES = {
+    "none": "",
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+
+def resolve_codec(name: str) -> str:
+    """Normalize a codec name, falling back from zstd to gzip when zstandard is missing."""
+    codec = name.strip().lower() or "none"
+    if codec in {"gz"}:
+        codec = "gzip"
+    if codec in {"zst", "zstandard"}:
+        codec = "zstd"
+    if codec not in CODEC_SUFFIXES:
+        raise ValueError(f"Unsupported compression codec '{name}'. Use none, gzip or zstd.")
+    if codec == "zstd" and zstandard is None:
+        return "gzip"
+    return codec
+
+
+def compress_chunk(data: bytes, codec: str) -> bytes:
+    """Compress ``data`` as a self-contained frame/member that can be appended to a file."""
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return data
+
+
+def codec_for_path(path: Path) -> str:
+    for codec, suffix in CODEC_SUFFIXES.items():
+        if suffix and path.name.endswith(suffix):
+            return codec
+    return "none"
+
+
+def open_binary_reader(path: Path) -> BinaryIO:
+    """Open ``path`` for line-oriented reading, decompressing ``.gz``/``.zst`` transparently."""
+    codec = codec_for_path(path)
+    if codec == "gzip":
+        return gzip.open(path, "rb")
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError(f"Reading {path} requires the 'zstandard' package")
+        raw = open(path, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        return io.BufferedReader(reader)
+    return open(path, "rb")
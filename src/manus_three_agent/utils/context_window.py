@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import re
+from collections import deque
+from collections.abc import Sequence
+from typing import Any
+
+from manus_three_agent.core.types import ContextPolicyConfig
+
+_TOKEN_PIECES = re.compile(r"\w+|[^\w\s]")
+_SUMMARY_ITEM_TOKENS = 32
+
+
+def estimate_tokens(text: str) -> int:
+    """Offline BPE-style estimate: one token per word or symbol, plus one per extra 6 chars."""
+    return sum(1 + (len(piece) - 1) // 6 for piece in _TOKEN_PIECES.findall(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    total = 0
+    for match in _TOKEN_PIECES.finditer(text):
+        total += 1 + (len(match.group()) - 1) // 6
+        if total > max_tokens:
+            omitted = estimate_tokens(text[match.start() :])
+            return f"{text[: match.start()].rstrip()} ...[truncated ~{omitted} tokens]"
+    return text
+
+
+class HistoryWindow:
+    """Render an append-only action history as a rolling summary plus the last K actions.
+
+    Steps that leave the window are folded into the summary once, and each action's token
+    estimate is computed once, so rendering costs O(K) per call rather than O(history).
+    """
+
+    def __init__(self, policy: ContextPolicyConfig) -> None:
+        self.policy = policy
+        self._reset()
+
+    def render(self, history: Sequence[dict[str, Any]]) -> tuple[Any, dict[str, Any]]:
+        """Return ``(prompt_value, stats)``; the history is passed through when the policy is off."""
+        if not self.policy.enabled:
+            return history, {}
+
+        size = len(history)
+        if size < self._seen or (size and history[0] is not self._first):
+            self._reset()
+        for item in history[self._seen : size]:
+            self._full_tokens += estimate_tokens(repr(item))
+        self._seen = size
+        self._first = history[0] if size else None
+
+        cut = max(0, size - self.policy.window_last_k)
+        for index in range(self._summarized, cut):
+            self._fold(index, history[index])
+        self._summarized = max(self._summarized, cut)
+
+        recent = [self._compact(item) for item in history[cut:size]]
+        lines: list[str] = []
+        if self._summary or self._dropped:
+            omitted = f"({self._dropped} earlier steps omitted) " if self._dropped else ""
+            lines.append(f"Earlier steps (summarized): {omitted}{' | '.join(self._summary)}")
+        lines.append(f"Recent actions: {recent}")
+        rendered = "\n".join(lines)
+
+        full_tokens = self._full_tokens + 2
+        rendered_tokens = estimate_tokens(rendered)
+        return rendered, {
+            "history_items": size,
+            "window_items": size - cut,
+            "summarized_items": cut,
+            "full_tokens": full_tokens,
+            "rendered_tokens": rendered_tokens,
+            "tokens_saved": max(0, full_tokens - rendered_tokens),
+        }
+
+    def _fold(self, index: int, item: dict[str, Any]) -> None:
+        marker = " [final]" if item.get("is_final") else ""
+        line = truncate_to_tokens(f"#{index + 1} {item.get('summary', '')}{marker}", _SUMMARY_ITEM_TOKENS)
+        self._summary.append(line)
+        self._summary_tokens += estimate_tokens(line)
+        while self._summary and self._summary_tokens > self.policy.summary_max_tokens:
+            self._summary_tokens -= estimate_tokens(self._summary.popleft())
+            self._dropped += 1
+
+    def _compact(self, item: dict[str, Any]) -> dict[str, Any]:
+        budget = self.policy.tool_output_max_tokens
+        return {key: truncate_to_tokens(value, budget) if isinstance(value, str) else value for key, value in item.items()}
+
+    def _reset(self) -> None:
+        self._first: Any = None
+        self._seen = 0
+        self._full_tokens = 0
+        self._summarized = 0
+        self._summary: deque[str] = deque()
+        self._summary_tokens = 0
+        self._dropped = 0
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import time
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when an episode's wall-clock budget runs out before or during a call."""
+
+
+class Deadline:
+    """Wall-clock budget for one episode, measured from construction.
+
+    Every LLM and tool call asks for ``budget(timeout)`` so its own timeout never
+    outlives the episode.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self._started = time.monotonic()
+
+    @classmethod
+    def after(cls, seconds: float | None) -> Deadline | None:
+        return cls(seconds) if seconds is not None else None
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started
+
+    def remaining(self) -> float:
+        return self.seconds - self.elapsed()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def check(self) -> None:
+        if self.expired():
+            raise DeadlineExceeded(f"episode deadline of {self.seconds}s exceeded")
+
+    def budget(self, timeout: float | None) -> float:
+        """Clamp ``timeout`` to the remaining time; raises once nothing is left."""
+        self.check()
+        remaining = self.remaining()
+        return remaining if timeout is None else min(timeout, remaining)
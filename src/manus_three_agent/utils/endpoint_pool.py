@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from manus_three_agent.core.types import EndpointPoolConfig
+
+
+@dataclass
+class PoolEndpoint:
+    name: str
+    base_url: str
+    api_key: str
+    weight: float = 1.0
+    models: frozenset[str] = frozenset()
+    outstanding: int = 0
+    ewma_ms: float | None = None
+    consecutive_failures: int = 0
+    open_until: float = 0.0
+    probing: bool = False
+    calls: int = 0
+    failures: int = 0
+
+    def serves(self, model: str) -> bool:
+        return not self.models or model in self.models
+
+
+@dataclass
+class EndpointLease:
+    pool: EndpointPool
+    endpoint: PoolEndpoint
+    trial: bool = False
+    started: float = field(default_factory=time.monotonic)
+
+    def finish(self, *, failed: bool) -> None:
+        latency_ms = (time.monotonic() - self.started) * 1000
+        self.pool.complete(self.endpoint, latency_ms=latency_ms, failed=failed, trial=self.trial)
+
+
+class EndpointPool:
+    """Weighted OpenAI-compatible endpoints with load-aware routing and per-endpoint circuit breakers.
+
+    ``least_outstanding`` picks the endpoint with the fewest in-flight requests per unit of
+    weight; ``ewma`` additionally multiplies by its latency EWMA, so unmeasured endpoints are
+    tried first. After ``failure_threshold`` consecutive failures an endpoint is skipped for
+    ``cooldown_seconds``. Once the cooldown expires the circuit is half-open: a single trial
+    call is let through while concurrent calls keep avoiding the endpoint, and the trial's
+    outcome either closes the circuit or reopens it for another cooldown.
+    """
+
+    def __init__(self, config: EndpointPoolConfig) -> None:
+        self.config = config
+        self._lock = threading.Lock()
+        self.endpoints: list[PoolEndpoint] = []
+        for endpoint in config.endpoints:
+            api_key = os.getenv(endpoint.api_key_env, "").strip() if endpoint.api_key_env else "EMPTY"
+            if not api_key:
+                continue
+            self.endpoints.append(
+                PoolEndpoint(
+                    name=endpoint.name,
+                    base_url=endpoint.base_url,
+                    api_key=api_key,
+                    weight=endpoint.weight,
+                    models=frozenset(endpoint.models),
+                )
+            )
+
+    def lease(self, model: str, exclude: tuple[str, ...] | list[str] = ()) -> EndpointLease | None:
+        with self._lock:
+            candidates = [e for e in self.endpoints if e.serves(model) and e.name not in exclude]
+            if not candidates:
+                return None
+            now = time.monotonic()
+            # When every circuit is open, fail open on the endpoint that recovers soonest.
+            healthy = [e for e in candidates if self._admits(e, now)] or [
+                min(candidates, key=lambda e: e.open_until)
+            ]
+            chosen = min(healthy, key=self._load)
+            trial = self._half_open(chosen, now) and not chosen.probing
+            if trial:
+                chosen.probing = True
+            chosen.outstanding += 1
+            chosen.calls += 1
+            return EndpointLease(self, chosen, trial=trial)
+
+    def has_candidate(self, model: str, exclude: tuple[str, ...] | list[str] = ()) -> bool:
+        with self._lock:
+            return any(e.serves(model) and e.name not in exclude for e in self.endpoints)
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                e.name: {
+                    "calls": e.calls,
+                    "failures": e.failures,
+                    "outstanding": e.outstanding,
+                    "ewma_ms": round(e.ewma_ms, 3) if e.ewma_ms is not None else None,
+                    "circuit": "open" if e.open_until > now else "half_open" if self._half_open(e, now) else "closed",
+                }
+                for e in self.endpoints
+            }
+
+    def _half_open(self, endpoint: PoolEndpoint, now: float) -> bool:
+        return endpoint.consecutive_failures >= self.config.failure_threshold and endpoint.open_until <= now
+
+    def _admits(self, endpoint: PoolEndpoint, now: float) -> bool:
+        if endpoint.open_until > now:
+            return False
+        return not (endpoint.probing and self._half_open(endpoint, now))
+
+    def _load(self, endpoint: PoolEndpoint) -> float:
+        load = (endpoint.outstanding + 1) / endpoint.weight
+        if self.config.routing == "ewma":
+            load *= endpoint.ewma_ms or 0.0
+        return load
+
+    def complete(self, endpoint: PoolEndpoint, *, latency_ms: float, failed: bool, trial: bool = False) -> None:
+        """``trial`` marks the half-open probe; only its completion lets another probe through."""
+        with self._lock:
+            endpoint.outstanding -= 1
+            if trial:
+                endpoint.probing = False
+            if failed:
+                endpoint.failures += 1
+                endpoint.consecutive_failures += 1
+                if endpoint.consecutive_failures >= self.config.failure_threshold:
+                    endpoint.open_until = time.monotonic() + self.config.cooldown_seconds
+                return
+            endpoint.consecutive_failures = 0
+            if endpoint.ewma_ms is None:
+                endpoint.ewma_ms = latency_ms
+            else:
+                alpha = self.config.ewma_alpha
+                endpoint.ewma_ms = alpha * latency_ms + (1 - alpha) * endpoint.ewma_ms
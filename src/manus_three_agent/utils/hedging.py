@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import math
+import threading
+from collections import deque
+from typing import Any
+
+from manus_three_agent.core.types import HedgingConfig
+
+
+class RequestHedger:
+    """Latency windows per ``agent/model`` that decide when to send a duplicate request.
+
+    A hedge fires once the first request has run longer than the configured quantile
+    of recent latencies for the same key. Keys without ``min_samples`` observations are
+    never hedged, so the first calls of a run only collect latencies.
+    """
+
+    def __init__(self, config: HedgingConfig) -> None:
+        self.config = config
+        self._lock = threading.Lock()
+        self._windows: dict[str, deque[float]] = {}
+        self.fired = 0
+        self.hedge_wins = 0
+
+    def accepts(self, agent: str) -> bool:
+        return agent in self.config.roles
+
+    def delay_for(self, key: str) -> float | None:
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or len(window) < self.config.min_samples:
+                return None
+            ordered = sorted(window)
+        index = min(len(ordered) - 1, math.ceil(self.config.quantile * len(ordered)) - 1)
+        return max(self.config.min_delay_seconds, ordered[index])
+
+    def observe(self, key: str, latency_s: float) -> None:
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None:
+                window = self._windows[key] = deque(maxlen=self.config.window_size)
+            window.append(latency_s)
+
+    def record(self, *, fired: bool, hedge_won: bool) -> None:
+        with self._lock:
+            self.fired += int(fired)
+            self.hedge_wins += int(hedge_won)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "fired": self.fired,
+                "hedge_wins": self.hedge_wins,
+                "keys": {key: len(window) for key, window in self._windows.items()},
+            }
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
 import orjson
 import yaml
 
+from manus_three_agent.utils.compression import open_binary_reader
+
 
 def load_yaml(path: str) -> dict[str, Any]:
     with open(path, "r", encoding="utf-8") as f:
@@ -23,3 +26,14 @@ def append_jsonl(path: Path, payload: dict[str, Any]) -> None:
     with open(path, "ab") as f:
         f.write(orjson.dumps(payload))
         f.write(b"\n")
+
+
+def iter_jsonl(path: Path) -> Iterator[dict[str, Any]]:
+    if not path.exists():
+        return
+    with open_binary_reader(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            yield orjson.loads(line)
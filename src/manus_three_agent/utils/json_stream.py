@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+_FENCE = "```json"
+_BARE_CHARS = frozenset(" \t\r\n0123456789+-.eE:,truefalsn")
+_CLOSERS = {"}": "{", "]": "["}
+
+
+class JSONStreamError(ValueError):
+    """Raised as soon as a streamed completion can no longer become a JSON object."""
+
+
+class IncrementalJSONParser:
+    """Scan streamed text for the first top-level JSON object without re-parsing the prefix.
+
+    Only structure is tracked (bracket nesting, strings, escapes, and bare-token characters),
+    so each ``feed`` is linear in the chunk size. The object is decoded once, when its closing
+    brace arrives. With ``strict=True`` anything other than whitespace or a ```` ```json ````
+    fence before the opening brace is an error; otherwise leading prose is skipped, and a
+    candidate that turns out not to be JSON (``Here is {the} plan: {...}``) is dropped and the
+    scan resumes at the next ``{`` after its opening brace.
+    """
+
+    def __init__(self, *, strict: bool = True) -> None:
+        self.strict = strict
+        self.value: dict[str, Any] | None = None
+        self._parts: list[str] = []
+        self._prefix = ""
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._offset = 0
+
+    @property
+    def complete(self) -> bool:
+        return self.value is not None
+
+    def feed(self, chunk: str) -> dict[str, Any] | None:
+        """Consume ``chunk``; returns the decoded object once it is complete."""
+        if self.complete:
+            return self.value
+
+        while True:
+            try:
+                return self._scan(chunk)
+            except JSONStreamError:
+                if self.strict:
+                    raise
+                chunk = ("".join(self._parts) + chunk[self._offset :])[1:]
+                self._reset()
+
+    def _scan(self, chunk: str) -> dict[str, Any] | None:
+        self._offset = 0
+        if not self._stack:
+            for offset, char in enumerate(chunk):
+                if char == "{":
+                    self._offset = offset
+                    break
+                self._check_prefix(char)
+            else:
+                return None
+
+        offset = self._offset
+        for idx in range(offset, len(chunk)):
+            char = chunk[idx]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                elif char < " ":
+                    raise JSONStreamError("Unescaped control character inside a JSON string")
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._stack.append(char)
+            elif char in _CLOSERS:
+                if not self._stack or self._stack[-1] != _CLOSERS[char]:
+                    raise JSONStreamError(f"Unbalanced '{char}' in streamed JSON")
+                self._stack.pop()
+                if not self._stack:
+                    return self._decode(chunk[offset : idx + 1])
+            elif char not in _BARE_CHARS:
+                raise JSONStreamError(f"Unexpected character {char!r} in streamed JSON")
+
+        self._parts.append(chunk[offset:])
+        return None
+
+    def _reset(self) -> None:
+        self._parts = []
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+
+    def _check_prefix(self, char: str) -> None:
+        if not self.strict or char.isspace():
+            return
+        self._prefix += char
+        if not _FENCE.startswith(self._prefix.lower()):
+            raise JSONStreamError(f"Streamed output does not start with a JSON object: {self._prefix!r}")
+
+    def _decode(self, tail: str) -> dict[str, Any]:
+        try:
+            value = json.loads("".join(self._parts) + tail)
+        except json.JSONDecodeError as exc:
+            raise JSONStreamError(f"Streamed JSON object is invalid: {exc}") from exc
+        if not isinstance(value, dict):
+            raise JSONStreamError("Streamed JSON value is not an object")
+        self.value = value
+        return value
@@ -1,41 +1,141 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
+import random
 import re
+import threading
 import time
-from collections.abc import Callable
+import weakref
+from collections import Counter
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field, replace
 from typing import Any
 
-from openai import BadRequestError, OpenAI
-from tenacity import retry, stop_after_attempt, wait_exponential
+import httpx
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    AsyncOpenAI,
+    AuthenticationError,
+    BadRequestError,
+    DefaultAsyncHttpxClient,
+    DefaultHttpxClient,
+    NotFoundError,
+    OpenAI,
+    PermissionDeniedError,
+    RateLimitError,
+)
+from tenacity import AsyncRetrying, RetryCallState, Retrying, retry_if_exception
+
+from manus_three_agent.core.types import LLMRetryConfig
+from manus_three_agent.utils.context_window import estimate_tokens
+from manus_three_agent.utils.deadline import Deadline, DeadlineExceeded
+from manus_three_agent.utils.endpoint_pool import EndpointLease, EndpointPool, PoolEndpoint
+from manus_three_agent.utils.hedging import RequestHedger
+from manus_three_agent.utils.json_stream import IncrementalJSONParser
+from manus_three_agent.utils.llm_capabilities import JSON_OBJECT, ProviderCapabilityCache
+from manus_three_agent.utils.llm_cache import LLMResponseCache, llm_cache_key
+from manus_three_agent.utils.llm_runtime import LLMRuntime
+from manus_three_agent.utils.rate_limit import Permit, RateLimiterRegistry, retry_after_seconds
+from manus_three_agent.utils.replay import ReplayDivergenceError, ReplayStore
+from manus_three_agent.utils.single_flight import FlightHandle, SingleFlight
 
 LLMTraceHook = Callable[[dict[str, Any]], None]
+OutputValidator = Callable[[dict[str, Any]], Any]
 _SECRET_PATTERNS = (
     re.compile(r"sk-proj-[A-Za-z0-9_-]+"),
     re.compile(r"sk-[A-Za-z0-9_-]+"),
     re.compile(r"hf_[A-Za-z0-9]{20,}"),
 )
+_DEFAULT_MAX_CONNECTIONS = 64
+_DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 32
+_ENDPOINT_ERRORS = (AuthenticationError, PermissionDeniedError, NotFoundError)
+
+# Process-wide client pools keyed by (api_key, base_url). Async clients are additionally
+# scoped to their event loop because httpx connections cannot cross loops.
+_POOL_LOCK = threading.Lock()
+_SYNC_CLIENTS: dict[tuple[str, str], OpenAI] = {}
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple[str, str], AsyncOpenAI]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class OutputRejectedError(ValueError):
+    """Raised by a validator for a well-formed answer the caller will not use; traced as ``rejected``."""
 
 
 class LLMClient:
-    def __init__(self, trace_hook: LLMTraceHook | None = None) -> None:
+    def __init__(
+        self,
+        trace_hook: LLMTraceHook | None = None,
+        replay: ReplayStore | None = None,
+        deadline: Deadline | None = None,
+        runtime: LLMRuntime | None = None,
+    ) -> None:
         self.provider = _normalize_provider(os.getenv("LLM_PROVIDER", ""))
         self.api_key = _resolve_api_key(self.provider)
         self.base_url = _resolve_base_url(self.provider)
         self.trace_hook = trace_hook
+        self.replay = replay
+        self.deadline = deadline
+        self.runtime = runtime if runtime is not None else LLMRuntime()
+
+    @property
+    def cache(self) -> LLMResponseCache | None:
+        return self.runtime.cache
+
+    @property
+    def retry_config(self) -> LLMRetryConfig:
+        return self.runtime.retry
+
+    @property
+    def capabilities(self) -> ProviderCapabilityCache:
+        return self.runtime.capabilities
+
+    @property
+    def single_flight(self) -> SingleFlight | None:
+        return self.runtime.single_flight
+
+    @property
+    def rate_limiter(self) -> RateLimiterRegistry | None:
+        return self.runtime.rate_limiter
+
+    @property
+    def endpoint_pool(self) -> EndpointPool | None:
+        return self.runtime.endpoint_pool
+
+    @property
+    def hedger(self) -> RequestHedger | None:
+        return self.runtime.hedger
+
+    @property
+    def endpoint(self) -> str:
+        return self.base_url or self.provider
+
+    @property
+    def has_upstream(self) -> bool:
+        return bool(self.api_key) or self.endpoint_pool is not None
 
     @property
     def enabled(self) -> bool:
-        return bool(self.api_key)
+        return self.has_upstream or self.replay is not None
 
     def _build_client(self) -> OpenAI:
-        kwargs: dict[str, Any] = {"api_key": self.api_key}
-        if self.base_url:
-            kwargs["base_url"] = self.base_url
-        return OpenAI(**kwargs)
+        return get_shared_client(self.api_key, self.base_url)
+
+    def _build_async_client(self) -> AsyncOpenAI:
+        return get_shared_async_client(self.api_key, self.base_url)
+
+    def _build_endpoint_client(self, endpoint: PoolEndpoint) -> OpenAI:
+        return get_shared_client(endpoint.api_key, endpoint.base_url)
+
+    def _build_async_endpoint_client(self, endpoint: PoolEndpoint) -> AsyncOpenAI:
+        return get_shared_async_client(endpoint.api_key, endpoint.base_url)
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=6))
     def chat_json(
         self,
         *,
@@ -44,81 +144,907 @@ class LLMClient:
         user_prompt: str,
         generation_config: dict[str, Any] | None = None,
         trace_context: dict[str, Any] | None = None,
+        validate: OutputValidator | None = None,
+        observe: LLMTraceHook | None = None,
+        retry_config: LLMRetryConfig | None = None,
     ) -> dict[str, Any]:
         if not self.enabled:
             raise RuntimeError("OPENAI_API_KEY is not set")
 
-        client = self._build_client()
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ]
-        start_time = time.perf_counter()
-        raw_content = ""
-        parsed_output: dict[str, Any] | None = None
-        usage: dict[str, int] = {}
-        used_response_format = True
-        status = "success"
-        error = ""
-        request_generation_config = {
-            k: v
-            for k, v in (generation_config or {}).items()
-            if v is not None and k not in {"model", "messages", "response_format"}
-        }
+        budget = _RetryBudget(retry_config or self.retry_config, self.deadline)
+        with _deadline_errors(self.deadline):
+            for attempt in budget.retrying():
+                with attempt:
+                    record = _CallRecord.start(
+                        model=model,
+                        system_prompt=system_prompt,
+                        user_prompt=user_prompt,
+                        generation_config=generation_config,
+                        trace_context=trace_context,
+                        deadline=self.deadline,
+                        observer=observe,
+                    )
+                    budget.annotate(record)
+                    return self._chat_once(record, validate)
+        raise AssertionError("unreachable: retrying() re-raises the last error")
 
-        def _request(*, with_response_format: bool) -> tuple[str, dict[str, int]]:
-            request_kwargs: dict[str, Any] = {
-                "model": model,
-                "messages": messages,
-                **request_generation_config,
-            }
-            if with_response_format:
-                request_kwargs["response_format"] = {"type": "json_object"}
-            response = client.chat.completions.create(**request_kwargs)
-            content = response.choices[0].message.content or "{}"
-            return content, _extract_usage(response)
+    async def achat_json(
+        self,
+        *,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        generation_config: dict[str, Any] | None = None,
+        trace_context: dict[str, Any] | None = None,
+        validate: OutputValidator | None = None,
+        observe: LLMTraceHook | None = None,
+        retry_config: LLMRetryConfig | None = None,
+    ) -> dict[str, Any]:
+        if not self.enabled:
+            raise RuntimeError("OPENAI_API_KEY is not set")
+
+        budget = _RetryBudget(retry_config or self.retry_config, self.deadline)
+        with _deadline_errors(self.deadline):
+            async for attempt in budget.async_retrying():
+                with attempt:
+                    record = _CallRecord.start(
+                        model=model,
+                        system_prompt=system_prompt,
+                        user_prompt=user_prompt,
+                        generation_config=generation_config,
+                        trace_context=trace_context,
+                        deadline=self.deadline,
+                        observer=observe,
+                    )
+                    budget.annotate(record)
+                    return await self._achat_once(record, validate)
+        raise AssertionError("unreachable: async_retrying() re-raises the last error")
+
+    def _chat_once(self, record: _CallRecord, validate: OutputValidator | None) -> dict[str, Any]:
+        served = self._serve_local(record)
+        if served is not None:
+            return served
+
+        flight = self._join_flight(record)
+        if flight is not None and not flight.is_leader:
+            started = time.perf_counter()
+            try:
+                return self._follow(record, flight.wait(timeout=self._remaining()), validate, started=started)
+            except Exception as exc:
+                record.fail(exc)
+                raise
+            finally:
+                self._emit_trace(record)
 
         try:
+            self._call_upstream(record, validate)
+            result = self._finish(record, validate)
+            if flight is not None:
+                flight.publish(record.shared_result())
+            return result
+        except Exception as exc:
+            if flight is not None:
+                flight.fail(exc)
+            record.fail(exc)
+            raise
+        finally:
+            if flight is not None:
+                flight.release()
+                record.annotations["single_flight"] = {"role": "leader", "followers": flight.followers}
+            self._emit_trace(record)
+
+    async def _achat_once(self, record: _CallRecord, validate: OutputValidator | None) -> dict[str, Any]:
+        served = self._serve_local(record)
+        if served is not None:
+            return served
+
+        flight = self._join_flight(record)
+        if flight is not None and not flight.is_leader:
+            started = time.perf_counter()
             try:
-                raw_content, usage = _request(with_response_format=True)
+                shared = await flight.async_wait(timeout=self._remaining())
+                return self._follow(record, shared, validate, started=started)
+            except Exception as exc:
+                record.fail(exc)
+                raise
+            finally:
+                self._emit_trace(record)
+
+        try:
+            await self._acall_upstream(record, validate)
+            result = self._finish(record, validate)
+            if flight is not None:
+                flight.publish(record.shared_result())
+            return result
+        except Exception as exc:
+            if flight is not None:
+                flight.fail(exc)
+            record.fail(exc)
+            raise
+        finally:
+            if flight is not None:
+                flight.release()
+                record.annotations["single_flight"] = {"role": "leader", "followers": flight.followers}
+            self._emit_trace(record)
+
+    def _call_upstream(self, record: _CallRecord, validate: OutputValidator | None) -> None:
+        hedger, key = self._hedge_key(record)
+        if hedger is None:
+            self._upstream(record, validate)
+            return
+        delay = hedger.delay_for(key)
+        if delay is not None:
+            self._hedged_upstream(record, validate, hedger, key, delay)
+            return
+        started = time.perf_counter()
+        self._upstream(record, validate)
+        hedger.observe(key, time.perf_counter() - started)
+
+    async def _acall_upstream(self, record: _CallRecord, validate: OutputValidator | None) -> None:
+        hedger, key = self._hedge_key(record)
+        if hedger is None:
+            await self._aupstream(record, validate)
+            return
+        delay = hedger.delay_for(key)
+        if delay is not None:
+            await self._ahedged_upstream(record, validate, hedger, key, delay)
+            return
+        started = time.perf_counter()
+        await self._aupstream(record, validate)
+        hedger.observe(key, time.perf_counter() - started)
+
+    def _hedge_key(self, record: _CallRecord) -> tuple[RequestHedger | None, str]:
+        hedger = self.hedger
+        agent = str(record.trace_context.get("agent", ""))
+        if hedger is None or not hedger.accepts(agent):
+            return None, ""
+        return hedger, f"{agent}/{record.model}"
+
+    def _hedged_upstream(
+        self, record: _CallRecord, validate: OutputValidator | None, hedger: RequestHedger, key: str, delay: float
+    ) -> None:
+        """Send the request, and a duplicate if it is still running after ``delay``; keep the first success.
+
+        Sync calls cannot be cancelled, so the slower request is abandoned and finishes in the background.
+        Only the primary request's latency feeds the hedger: a hedge that wins early would otherwise cut
+        the tail off the window and pull the hedge delay down until nearly every call is duplicated.
+        """
+        attempts = [record.fork()]
+        started = time.perf_counter()
+
+        def _observe_primary(future: Future[None]) -> None:
+            if future.exception() is None:
+                hedger.observe(key, time.perf_counter() - started)
+
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="llm-hedge")
+        try:
+            futures = [executor.submit(self._upstream, attempts[0], validate)]
+            futures[0].add_done_callback(_observe_primary)
+            done, _ = wait(futures, timeout=delay)
+            if not done:
+                attempts.append(record.fork())
+                futures.append(executor.submit(self._upstream, attempts[1], validate))
+            winner = _first_success(futures)
+        finally:
+            executor.shutdown(wait=False)
+        self._adopt_hedge(record, attempts, winner, hedger, delay)
+
+    async def _ahedged_upstream(
+        self, record: _CallRecord, validate: OutputValidator | None, hedger: RequestHedger, key: str, delay: float
+    ) -> None:
+        attempts = [record.fork()]
+        started = time.perf_counter()
+
+        def _observe_primary(task: asyncio.Task[None]) -> None:
+            # A primary cancelled because the hedge won took at least this long (and longer than ``delay``).
+            if task.cancelled() or task.exception() is None:
+                hedger.observe(key, time.perf_counter() - started)
+
+        tasks = [asyncio.create_task(self._aupstream(attempts[0], validate))]
+        tasks[0].add_done_callback(_observe_primary)
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                attempts.append(record.fork())
+                tasks.append(asyncio.create_task(self._aupstream(attempts[1], validate)))
+            pending = set(tasks)
+            winner = -1
+            error: BaseException | None = None
+            while pending and winner < 0:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = tasks.index(task)
+                        break
+                    error = task.exception()
+            if winner < 0:
+                assert error is not None
+                raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+        self._adopt_hedge(record, attempts, winner, hedger, delay)
+
+    def _adopt_hedge(
+        self,
+        record: _CallRecord,
+        attempts: list[_CallRecord],
+        winner: int,
+        hedger: RequestHedger,
+        delay: float,
+    ) -> None:
+        record.adopt(attempts[winner])
+        fired = len(attempts) > 1
+        hedger.record(fired=fired, hedge_won=winner == 1)
+        record.annotations["hedge"] = {
+            "delay_ms": round(delay * 1000, 3),
+            "fired": fired,
+            "winner": "hedge" if winner == 1 else "primary",
+        }
+
+    def _upstream(self, record: _CallRecord, validate: OutputValidator | None) -> None:
+        tried: list[str] = []
+        while True:
+            lease = self._lease_endpoint(record, tried)
+            try:
+                self._exchange(lease, record, validate)
+                return
+            except Exception as exc:
+                if not self._fail_over(lease, record, exc, tried):
+                    raise
+
+    async def _aupstream(self, record: _CallRecord, validate: OutputValidator | None) -> None:
+        tried: list[str] = []
+        while True:
+            lease = self._lease_endpoint(record, tried)
+            try:
+                await self._aexchange(lease, record, validate)
+                return
+            except asyncio.CancelledError:
+                # A losing hedge is cancelled; give its endpoint slot back without counting a failure.
+                if lease is not None:
+                    lease.finish(failed=False)
+                raise
+            except Exception as exc:
+                if not self._fail_over(lease, record, exc, tried):
+                    raise
+
+    def _exchange(self, lease: EndpointLease | None, record: _CallRecord, validate: OutputValidator | None) -> None:
+        route = self._route(lease, record)
+        client = self._build_client() if lease is None else self._build_endpoint_client(lease.endpoint)
+        use_format = self._plan_response_format(record, route)
+        with self._rate_limited(record, route):
+            try:
+                record.raw_content, record.usage = _send(client, record, validate, with_response_format=use_format)
             except BadRequestError as exc:
-                if "response_format" not in str(exc):
+                if not self._response_format_rejected(record, route, exc):
                     raise
-                used_response_format = False
-                raw_content, usage = _request(with_response_format=False)
-
-            parsed_output = _parse_json_content(raw_content)
-            return parsed_output
-        except BadRequestError as exc:
-            status = "api_error"
-            error = f"{type(exc).__name__}: {exc}"
+                record.raw_content, record.usage = _send(client, record, validate, with_response_format=False)
+        self._learn_response_format(record, route)
+        if lease is not None:
+            lease.finish(failed=False)
+
+    async def _aexchange(
+        self, lease: EndpointLease | None, record: _CallRecord, validate: OutputValidator | None
+    ) -> None:
+        route = self._route(lease, record)
+        client = self._build_async_client() if lease is None else self._build_async_endpoint_client(lease.endpoint)
+        use_format = self._plan_response_format(record, route)
+        async with self._arate_limited(record, route):
+            try:
+                record.raw_content, record.usage = await _asend(
+                    client, record, validate, with_response_format=use_format
+                )
+            except BadRequestError as exc:
+                if not self._response_format_rejected(record, route, exc):
+                    raise
+                record.raw_content, record.usage = await _asend(client, record, validate, with_response_format=False)
+        self._learn_response_format(record, route)
+        if lease is not None:
+            lease.finish(failed=False)
+
+    def _route(self, lease: EndpointLease | None, record: _CallRecord) -> _Route:
+        if lease is None:
+            route = _Route(name=self.provider, key=self.endpoint)
+        else:
+            route = _Route(name=lease.endpoint.name, key=lease.endpoint.base_url)
+        record.annotations["endpoint"] = route.name
+        return route
+
+    def _lease_endpoint(self, record: _CallRecord, tried: list[str]) -> EndpointLease | None:
+        pool = self.endpoint_pool
+        return pool.lease(record.model, exclude=tried) if pool is not None else None
+
+    def _fail_over(
+        self, lease: EndpointLease | None, record: _CallRecord, exc: Exception, tried: list[str]
+    ) -> bool:
+        """Mark a pool endpoint's failure; True when the request should move to another endpoint.
+
+        Besides transport errors and 429s, a rejected key (401/403) or a route that does not
+        serve the model (404) is specific to this endpoint, so another one may still succeed.
+        """
+        if lease is None:
+            return False
+        unhealthy = classify_llm_error(exc) in {"transport", "rate_limit"} or isinstance(exc, _ENDPOINT_ERRORS)
+        lease.finish(failed=unhealthy)
+        if not unhealthy:
+            return False
+        tried.append(lease.endpoint.name)
+        record.annotations.setdefault("failover", []).append(
+            {"endpoint": lease.endpoint.name, "error": f"{type(exc).__name__}: {exc}"}
+        )
+        pool = self.endpoint_pool
+        return pool is not None and pool.has_candidate(record.model, exclude=tried)
+
+    def _plan_response_format(self, record: _CallRecord, route: _Route) -> bool:
+        """Send ``response_format`` unless this endpoint/model is known to reject it."""
+        known = self.capabilities.get(route.key, record.model, JSON_OBJECT)
+        record.used_response_format = known is not False
+        record.annotations["capabilities"] = {"json_object": known, "source": "probe" if known is None else "cache"}
+        return record.used_response_format
+
+    def _response_format_rejected(self, record: _CallRecord, route: _Route, exc: BadRequestError) -> bool:
+        if not record.used_response_format or "response_format" not in str(exc):
+            return False
+        self.capabilities.set(route.key, record.model, JSON_OBJECT, False)
+        record.used_response_format = False
+        record.annotations["capabilities"]["json_object"] = False
+        return True
+
+    def _learn_response_format(self, record: _CallRecord, route: _Route) -> None:
+        if record.used_response_format and record.annotations["capabilities"]["json_object"] is None:
+            self.capabilities.set(route.key, record.model, JSON_OBJECT, True)
+            record.annotations["capabilities"]["json_object"] = True
+
+    @contextmanager
+    def _rate_limited(self, record: _CallRecord, route: _Route) -> Iterator[None]:
+        limiter = self.rate_limiter.get(route.name, record.model) if self.rate_limiter else None
+        if limiter is None:
+            yield
+            return
+        permit = limiter.acquire(_estimate_request_tokens(record), self.deadline)
+        record.annotations["rate_limit"] = permit.describe()
+        try:
+            yield
+        except BaseException as exc:
+            _release_failed(permit, exc)
             raise
-        except Exception as exc:
-            status = "parse_error" if isinstance(exc, ValueError) else "error"
-            error = f"{type(exc).__name__}: {exc}"
+        permit.release(used_tokens=record.usage.get("total_tokens"))
+
+    @asynccontextmanager
+    async def _arate_limited(self, record: _CallRecord, route: _Route) -> AsyncIterator[None]:
+        limiter = self.rate_limiter.get(route.name, record.model) if self.rate_limiter else None
+        if limiter is None:
+            yield
+            return
+        permit = await limiter.aacquire(_estimate_request_tokens(record), self.deadline)
+        record.annotations["rate_limit"] = permit.describe()
+        try:
+            yield
+        except BaseException as exc:
+            _release_failed(permit, exc)
             raise
-        finally:
-            self._emit_trace(
-                {
-                    **(trace_context or {}),
-                    "status": status,
-                    "error": error,
-                    "model": model,
-                    "generation_config": request_generation_config,
-                    "used_response_format_json_object": used_response_format,
-                    "latency_ms": round((time.perf_counter() - start_time) * 1000, 3),
-                    "usage": usage,
-                    "system_prompt": _redact_secrets(system_prompt),
-                    "user_prompt": _redact_secrets(user_prompt),
-                    "raw_response": _redact_secrets(raw_content),
-                    "parsed_output": parsed_output,
-                }
-            )
+        permit.release(used_tokens=record.usage.get("total_tokens"))
+
+    def _remaining(self) -> float | None:
+        return self.deadline.budget(None) if self.deadline is not None else None
+
+    def _join_flight(self, record: _CallRecord) -> FlightHandle | None:
+        single_flight = self.single_flight
+        if single_flight is None or not single_flight.accepts(record.generation_config):
+            return None
+        key = llm_cache_key(
+            model=f"{self.endpoint}|{record.model}",
+            system_prompt=record.system_prompt,
+            user_prompt=record.user_prompt,
+            generation_config=record.generation_config,
+        )
+        return single_flight.join(key)
+
+    def _follow(
+        self,
+        record: _CallRecord,
+        shared: dict[str, Any],
+        validate: OutputValidator | None,
+        *,
+        started: float,
+    ) -> dict[str, Any]:
+        """Adopt the leader's response; usage stays empty because no tokens were spent on this call."""
+        record.raw_content = str(shared["raw_content"])
+        record.used_response_format = bool(shared["used_response_format"])
+        record.annotations["single_flight"] = {
+            "role": "follower",
+            "waited_ms": round((time.perf_counter() - started) * 1000, 3),
+            "leader_usage": dict(shared["usage"]),
+        }
+        record.parsed_output = shared["parsed_output"]
+        if validate is not None:
+            validate(record.parsed_output)
+        return record.parsed_output
+
+    def _finish(self, record: _CallRecord, validate: OutputValidator | None) -> dict[str, Any]:
+        if record.streamed_output is not None:
+            record.parsed_output = record.streamed_output
+        else:
+            record.parsed_output = _parse_json_content(record.raw_content)
+            if validate is not None:
+                validate(record.parsed_output)
+        self._cache_store(record)
+        return record.parsed_output
+
+    def _serve_local(self, record: _CallRecord) -> dict[str, Any] | None:
+        """Answer from the replay recording or the response cache without a network call."""
+        try:
+            served = self._replay_lookup(record)
+        except ReplayDivergenceError as exc:
+            record.fail(exc)
+            self._emit_trace(record)
+            raise
+        if served is None:
+            served = self._cache_lookup(record)
+        if served is not None:
+            self._emit_trace(record)
+        return served
+
+    def _replay_lookup(self, record: _CallRecord) -> dict[str, Any] | None:
+        if self.replay is None:
+            return None
+
+        entry, match = self.replay.lookup(
+            agent=str(record.trace_context.get("agent", "unknown")),
+            step=int(record.trace_context.get("step", 0)),
+            system_prompt=_redact_secrets(record.system_prompt),
+            user_prompt=_redact_secrets(record.user_prompt),
+        )
+        record.annotations["replay"] = {"source": self.replay.source, "match": match or "miss"}
+        if entry is None:
+            if not self.has_upstream:
+                raise ReplayDivergenceError(
+                    f"Replay has no recording for agent={record.trace_context.get('agent')} "
+                    f"step={record.trace_context.get('step')} and no API key is configured"
+                )
+            return None
+
+        record.raw_content = entry["raw_response"]
+        record.usage = dict(entry["usage"])
+        record.parsed_output = entry["parsed_output"]
+        return record.parsed_output
+
+    def _cache_lookup(self, record: _CallRecord) -> dict[str, Any] | None:
+        cache = self.cache
+        if cache is None or not cache.accepts(record.generation_config):
+            return None
+
+        record.cache_key = llm_cache_key(
+            model=record.model,
+            system_prompt=record.system_prompt,
+            user_prompt=record.user_prompt,
+            generation_config=record.generation_config,
+        )
+        value, tier = cache.get(record.cache_key)
+        record.annotations["cache"] = {"hit": value is not None, "tier": tier, **cache.stats()}
+        if value is None:
+            return None
+
+        record.raw_content = str(value.get("raw_content", ""))
+        record.usage = dict(value.get("usage", {}))
+        record.parsed_output = value.get("parsed_output")
+        record.used_response_format = bool(value.get("used_response_format", True))
+        return record.parsed_output
+
+    def _cache_store(self, record: _CallRecord) -> None:
+        cache = self.cache
+        if cache is None or not record.cache_key:
+            return
+        cache.put(record.cache_key, record.shared_result())
+
+    def _emit_trace(self, record: _CallRecord) -> None:
+        if self.trace_hook is None and record.observer is None:
+            return
+        payload = record.to_trace_payload()
+        if self.trace_hook is not None:
+            self.trace_hook(payload)
+        if record.observer is not None:
+            record.observer(payload)
+
+
+@dataclass(frozen=True)
+class _Route:
+    """Where one request goes: ``name`` keys the rate limiter, ``key`` the capability cache."""
+
+    name: str
+    key: str
+
+
+def _send(
+    client: OpenAI, record: _CallRecord, validate: OutputValidator | None, *, with_response_format: bool
+) -> tuple[str, dict[str, int]]:
+    if not record.stream:
+        response = client.chat.completions.create(**record.request_kwargs(with_response_format))
+        content = response.choices[0].message.content or "{}"
+        return content, _extract_usage(response)
+
+    consumer = _StreamConsumer(record, strict=with_response_format, validate=validate)
+    stream = client.chat.completions.create(**record.request_kwargs(with_response_format))
+    try:
+        for chunk in stream:
+            consumer.add(chunk)
+    finally:
+        stream.close()
+        record.raw_content = consumer.text
+    return consumer.text, consumer.usage
+
+
+async def _asend(
+    client: AsyncOpenAI, record: _CallRecord, validate: OutputValidator | None, *, with_response_format: bool
+) -> tuple[str, dict[str, int]]:
+    if not record.stream:
+        response = await client.chat.completions.create(**record.request_kwargs(with_response_format))
+        content = response.choices[0].message.content or "{}"
+        return content, _extract_usage(response)
+
+    consumer = _StreamConsumer(record, strict=with_response_format, validate=validate)
+    stream = await client.chat.completions.create(**record.request_kwargs(with_response_format))
+    try:
+        async for chunk in stream:
+            consumer.add(chunk)
+    finally:
+        await stream.close()
+        record.raw_content = consumer.text
+    return consumer.text, consumer.usage
+
+
+def _first_success(futures: list[Future[None]]) -> int:
+    """Index of the first future to finish without error; re-raises the last error if all fail."""
+    pending = set(futures)
+    error: BaseException | None = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return futures.index(future)
+            error = future.exception()
+    assert error is not None
+    raise error
+
+
+@contextmanager
+def _deadline_errors(deadline: Deadline | None) -> Iterator[None]:
+    """Report a call that failed because the episode ran out of time as ``DeadlineExceeded``."""
+    try:
+        yield
+    except DeadlineExceeded:
+        raise
+    except Exception as exc:
+        if deadline is not None and deadline.expired():
+            raise DeadlineExceeded(f"episode deadline of {deadline.seconds}s exceeded during an LLM call") from exc
+        raise
+
+
+def classify_llm_error(exc: BaseException | None) -> str | None:
+    """Retry class of a failed call: ``rate_limit``, ``transport``, ``parse``, or ``None`` (not retried)."""
+    if isinstance(exc, RateLimitError):
+        return "rate_limit"
+    if isinstance(exc, (APIConnectionError, httpx.TransportError)):
+        return "transport"
+    if isinstance(exc, APIStatusError) and exc.status_code >= 500:
+        return "transport"
+    if isinstance(exc, ValueError):
+        return "parse"
+    return None
+
+
+class _RetryBudget:
+    """Per-call retry state with a separate attempt budget and backoff for each failure class.
+
+    Transport errors back off exponentially, rate limits back off longer with full jitter so
+    concurrent callers spread out, and parse failures re-ask immediately.
+    """
+
+    def __init__(self, config: LLMRetryConfig, deadline: Deadline | None = None) -> None:
+        self.config = config
+        self.deadline = deadline
+        self.failures: Counter[str] = Counter()
+        self.last_failure = ""
+
+    def retrying(self) -> Retrying:
+        return Retrying(stop=self._stop, wait=self._wait, retry=retry_if_exception(_is_retryable), reraise=True)
+
+    def async_retrying(self) -> AsyncRetrying:
+        return AsyncRetrying(stop=self._stop, wait=self._wait, retry=retry_if_exception(_is_retryable), reraise=True)
+
+    def annotate(self, record: _CallRecord) -> None:
+        if self.failures:
+            record.annotations["retry"] = {
+                "attempt": sum(self.failures.values()) + 1,
+                "after": self.last_failure,
+                "failures": dict(self.failures),
+            }
+
+    def _stop(self, retry_state: RetryCallState) -> bool:
+        kind = classify_llm_error(retry_state.outcome.exception() if retry_state.outcome else None) or "fatal"
+        self.failures[kind] += 1
+        self.last_failure = kind
+        budget = {
+            "transport": self.config.transport_attempts,
+            "rate_limit": self.config.rate_limit_attempts,
+            "parse": self.config.parse_attempts,
+        }.get(kind, 1)
+        if self.deadline is not None and self.deadline.expired():
+            return True
+        return self.failures[kind] >= budget
+
+    def _wait(self, retry_state: RetryCallState) -> float:
+        delay = self._backoff(retry_state)
+        if self.deadline is not None:
+            delay = min(delay, max(0.0, self.deadline.remaining()))
+        return delay
+
+    def _backoff(self, retry_state: RetryCallState) -> float:
+        count = self.failures[self.last_failure]
+        if self.last_failure == "transport":
+            return min(self.config.backoff_max_seconds, self.config.backoff_min_seconds * 2 ** (count - 1))
+        if self.last_failure == "rate_limit":
+            retry_after = _retry_after(retry_state.outcome.exception() if retry_state.outcome else None)
+            if retry_after is not None:
+                return min(self.config.rate_limit_backoff_max_seconds, retry_after)
+            ceiling = min(self.config.rate_limit_backoff_max_seconds, self.config.backoff_min_seconds * 2**count)
+            return random.uniform(0.0, ceiling)
+        return 0.0
 
-    def _emit_trace(self, payload: dict[str, Any]) -> None:
-        if self.trace_hook is None:
+
+def _release_failed(permit: Permit, exc: BaseException) -> None:
+    kind = classify_llm_error(exc)
+    permit.release(
+        rate_limited=kind == "rate_limit",
+        failed=True,
+        overloaded=kind == "transport",
+        retry_after=_retry_after(exc),
+    )
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    return classify_llm_error(exc) is not None
+
+
+def _retry_after(exc: BaseException | None) -> float | None:
+    response = getattr(exc, "response", None) if isinstance(exc, APIStatusError) else None
+    return retry_after_seconds(response.headers) if response is not None else None
+
+
+def _estimate_request_tokens(record: _CallRecord) -> int:
+    completion_budget = record.generation_config.get("max_completion_tokens") or 0
+    return estimate_tokens(record.system_prompt) + estimate_tokens(record.user_prompt) + int(completion_budget)
+
+
+@dataclass
+class _CallRecord:
+    """Mutable bookkeeping for one chat call, flushed to the trace hook at the end."""
+
+    model: str
+    system_prompt: str
+    user_prompt: str
+    generation_config: dict[str, Any]
+    trace_context: dict[str, Any]
+    start_time: float
+    raw_content: str = ""
+    parsed_output: dict[str, Any] | None = None
+    usage: dict[str, int] = field(default_factory=dict)
+    used_response_format: bool = True
+    status: str = "success"
+    error: str = ""
+    cache_key: str = ""
+    stream: bool = False
+    streamed_output: dict[str, Any] | None = None
+    deadline: Deadline | None = None
+    observer: LLMTraceHook | None = None
+    annotations: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def start(
+        cls,
+        *,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        generation_config: dict[str, Any] | None,
+        trace_context: dict[str, Any] | None,
+        deadline: Deadline | None = None,
+        observer: LLMTraceHook | None = None,
+    ) -> "_CallRecord":
+        if deadline is not None:
+            deadline.check()
+        return cls(
+            model=model,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            generation_config=_clean_generation_config(generation_config),
+            trace_context=dict(trace_context or {}),
+            start_time=time.perf_counter(),
+            stream=bool((generation_config or {}).get("stream")),
+            deadline=deadline,
+            observer=observer,
+        )
+
+    @property
+    def messages(self) -> list[dict[str, str]]:
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": self.user_prompt},
+        ]
+
+    def request_kwargs(self, with_response_format: bool) -> dict[str, Any]:
+        request_kwargs: dict[str, Any] = {
+            "model": self.model,
+            "messages": self.messages,
+            **self.generation_config,
+        }
+        if self.deadline is not None:
+            # Budgeted per send, so time spent queued, waiting on a hedge, or failing over is not reused.
+            request_kwargs["timeout"] = self.deadline.budget(self.generation_config.get("timeout"))
+        if with_response_format:
+            request_kwargs["response_format"] = {"type": "json_object"}
+        if self.stream:
+            request_kwargs["stream"] = True
+            request_kwargs["stream_options"] = {"include_usage": True}
+        return request_kwargs
+
+    def shared_result(self) -> dict[str, Any]:
+        return {
+            "parsed_output": self.parsed_output,
+            "raw_content": self.raw_content,
+            "usage": self.usage,
+            "used_response_format": self.used_response_format,
+        }
+
+    def fork(self) -> "_CallRecord":
+        """Blank copy of this request for a hedged attempt, so concurrent sends do not share state."""
+        return replace(self, raw_content="", usage={}, streamed_output=None, annotations=dict(self.annotations))
+
+    def adopt(self, other: "_CallRecord") -> None:
+        self.raw_content = other.raw_content
+        self.usage = other.usage
+        self.used_response_format = other.used_response_format
+        self.streamed_output = other.streamed_output
+        self.annotations.update(other.annotations)
+
+    def fail(self, exc: BaseException) -> None:
+        if isinstance(exc, BadRequestError):
+            self.status = "api_error"
+        elif isinstance(exc, RateLimitError):
+            self.status = "rate_limited"
+        elif isinstance(exc, OutputRejectedError):
+            self.status = "rejected"
+        elif isinstance(exc, ValueError):
+            self.status = "parse_error"
+        else:
+            self.status = "error"
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    def to_trace_payload(self) -> dict[str, Any]:
+        return {
+            **self.trace_context,
+            "status": self.status,
+            "error": self.error,
+            "model": self.model,
+            "generation_config": self.generation_config,
+            "used_response_format_json_object": self.used_response_format,
+            "latency_ms": round((time.perf_counter() - self.start_time) * 1000, 3),
+            "usage": self.usage,
+            "system_prompt": _redact_secrets(self.system_prompt),
+            "user_prompt": _redact_secrets(self.user_prompt),
+            "raw_response": _redact_secrets(self.raw_content),
+            "parsed_output": self.parsed_output,
+            **self.annotations,
+        }
+
+
+class _StreamConsumer:
+    """Feed streamed deltas to an incremental parser, timing first token and first valid object.
+
+    Parse or validation errors propagate out of ``add`` so the caller aborts the stream
+    instead of waiting for the remaining tokens.
+    """
+
+    def __init__(self, record: _CallRecord, *, strict: bool, validate: OutputValidator | None) -> None:
+        self.record = record
+        self.parser = IncrementalJSONParser(strict=strict)
+        self.validate = validate
+        self.usage: dict[str, int] = {}
+        self._parts: list[str] = []
+        self._stats: dict[str, Any] = {"time_to_first_token_ms": None, "time_to_valid_object_ms": None, "chunks": 0}
+        record.annotations["stream"] = self._stats
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def add(self, chunk: Any) -> None:
+        usage = _extract_usage(chunk)
+        if usage:
+            self.usage = usage
+        choices = getattr(chunk, "choices", None) or []
+        delta = getattr(choices[0].delta, "content", None) if choices else None
+        if not delta:
+            return
+
+        self._stats["chunks"] += 1
+        if self._stats["time_to_first_token_ms"] is None:
+            self._stats["time_to_first_token_ms"] = self._elapsed_ms()
+        self._parts.append(delta)
+        if self.parser.complete:
             return
-        self.trace_hook(payload)
+
+        value = self.parser.feed(delta)
+        if value is not None:
+            if self.validate is not None:
+                self.validate(value)
+            self.record.streamed_output = value
+            self._stats["time_to_valid_object_ms"] = self._elapsed_ms()
+
+    def _elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self.record.start_time) * 1000, 3)
+
+
+def get_shared_client(api_key: str, base_url: str = "") -> OpenAI:
+    """Return the process-wide keep-alive client for ``(api_key, base_url)``."""
+    key = (api_key, base_url)
+    with _POOL_LOCK:
+        client = _SYNC_CLIENTS.get(key)
+        if client is None:
+            client = OpenAI(**_client_kwargs(api_key, base_url), http_client=DefaultHttpxClient(limits=_pool_limits()))
+            _SYNC_CLIENTS[key] = client
+        return client
+
+
+def get_shared_async_client(api_key: str, base_url: str = "") -> AsyncOpenAI:
+    """Return the keep-alive async client for ``(api_key, base_url)`` on the running loop."""
+    loop = asyncio.get_running_loop()
+    key = (api_key, base_url)
+    with _POOL_LOCK:
+        loop_clients = _ASYNC_CLIENTS.setdefault(loop, {})
+        client = loop_clients.get(key)
+        if client is None:
+            client = AsyncOpenAI(
+                **_client_kwargs(api_key, base_url),
+                http_client=DefaultAsyncHttpxClient(limits=_pool_limits()),
+            )
+            loop_clients[key] = client
+        return client
+
+
+def close_shared_clients() -> None:
+    with _POOL_LOCK:
+        clients = list(_SYNC_CLIENTS.values())
+        _SYNC_CLIENTS.clear()
+        _ASYNC_CLIENTS.clear()
+    for client in clients:
+        client.close()
+
+
+def _client_kwargs(api_key: str, base_url: str) -> dict[str, Any]:
+    # Retries (and Retry-After) are handled by ``_RetryBudget`` and the rate limiter, not the SDK.
+    kwargs: dict[str, Any] = {"api_key": api_key, "max_retries": 0}
+    if base_url:
+        kwargs["base_url"] = base_url
+    return kwargs
+
+
+def _pool_limits() -> httpx.Limits:
+    max_connections = int(os.getenv("LLM_MAX_CONNECTIONS", "") or _DEFAULT_MAX_CONNECTIONS)
+    max_keepalive = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "") or _DEFAULT_MAX_KEEPALIVE_CONNECTIONS)
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=min(max_keepalive, max_connections),
+    )
+
+
+def _clean_generation_config(generation_config: dict[str, Any] | None) -> dict[str, Any]:
+    return {
+        k: v
+        for k, v in (generation_config or {}).items()
+        if v is not None and k not in {"model", "messages", "response_format", "stream", "stream_options"}
+    }
 
 
 def _normalize_provider(raw: str) -> str:
@@ -158,14 +1084,13 @@ def _parse_json_content(content: str) -> dict[str, Any]:
     except json.JSONDecodeError:
         pass
 
-    fenced = re.search(r"```(?:json)?\\s*(\{.*\})\\s*```", content, flags=re.DOTALL | re.IGNORECASE)
+    fenced = re.search(r"```(?:json)?\s*(\{.*\})\s*```", content, flags=re.DOTALL | re.IGNORECASE)
     if fenced:
         return json.loads(fenced.group(1))
 
-    start = content.find("{")
-    end = content.rfind("}")
-    if start != -1 and end != -1 and end > start:
-        return json.loads(content[start : end + 1])
+    value = IncrementalJSONParser(strict=False).feed(content)
+    if value is not None:
+        return value
 
     raise ValueError(f"Model output is not valid JSON: {content}")
 
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from manus_three_agent.core.types import LLMCacheConfig
+
+
+def llm_cache_key(
+    *,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    generation_config: dict[str, Any],
+) -> str:
+    payload = orjson.dumps(
+        {
+            "model": model,
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt,
+            "generation_config": generation_config,
+        },
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+class LLMResponseCache:
+    """Two-tier (memory LRU + optional SQLite) cache of parsed chat responses."""
+
+    def __init__(self, config: LLMCacheConfig) -> None:
+        self.config = config
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._db: sqlite3.Connection | None = None
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+
+        if config.disk_path:
+            db_path = Path(config.disk_path)
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, created_at REAL NOT NULL, value BLOB NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_created_at ON llm_cache(created_at)")
+            self._db.commit()
+
+    def accepts(self, generation_config: dict[str, Any]) -> bool:
+        if not self.config.enabled:
+            return False
+        if self.config.deterministic_only:
+            return generation_config.get("temperature", 1.0) == 0
+        return True
+
+    def get(self, key: str) -> tuple[dict[str, Any] | None, str]:
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                created_at, value = cached
+                if self._is_fresh(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return value, "memory"
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT created_at, value FROM llm_cache WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is not None:
+                    created_at, blob = row
+                    if self._is_fresh(created_at, now):
+                        value = orjson.loads(blob)
+                        self._put_memory(key, created_at, value)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return value, "disk"
+                    self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.misses += 1
+            return None, ""
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        created_at = time.time()
+        with self._lock:
+            self._put_memory(key, created_at, value)
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, created_at, value) VALUES (?, ?, ?)",
+                (key, created_at, orjson.dumps(value)),
+            )
+            if self.config.max_disk_entries is not None:
+                self._db.execute(
+                    "DELETE FROM llm_cache WHERE key IN ("
+                    "SELECT key FROM llm_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.config.max_disk_entries,),
+                )
+            self._db.commit()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "memory_entries": len(self._memory),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _put_memory(self, key: str, created_at: float, value: dict[str, Any]) -> None:
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.config.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _is_fresh(self, created_at: float, now: float) -> bool:
+        ttl = self.config.ttl_seconds
+        return ttl is None or now - created_at <= ttl
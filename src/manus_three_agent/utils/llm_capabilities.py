@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+JSON_OBJECT = "response_format_json_object"
+
+
+class ProviderCapabilityCache:
+    """What each ``(endpoint, model)`` accepts, learned from live calls and optionally persisted.
+
+    Unknown capabilities are ``None`` and get probed by the next call; the answer is then
+    reused by every client of the run (and by later runs when ``path`` is set).
+    """
+
+    def __init__(self, path: str = "") -> None:
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        if self.path is not None and self.path.exists():
+            try:
+                loaded = orjson.loads(self.path.read_bytes())
+            except orjson.JSONDecodeError:
+                loaded = {}
+            if isinstance(loaded, dict):
+                self._entries = {key: dict(value) for key, value in loaded.items() if isinstance(value, dict)}
+
+    def get(self, endpoint: str, model: str, capability: str) -> bool | None:
+        with self._lock:
+            value = self._entries.get(_entry_key(endpoint, model), {}).get(capability)
+        return value if isinstance(value, bool) else None
+
+    def set(self, endpoint: str, model: str, capability: str, supported: bool) -> None:
+        key = _entry_key(endpoint, model)
+        with self._lock:
+            entry = self._entries.setdefault(key, {})
+            if entry.get(capability) is supported:
+                return
+            entry[capability] = supported
+            entry["updated_at"] = time.time()
+            if self.path is not None:
+                self._persist_unlocked(self.path)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {key: dict(value) for key, value in self._entries.items()}
+
+    def _persist_unlocked(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(orjson.dumps(self._entries, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+        os.replace(tmp_path, path)
+
+
+def _entry_key(endpoint: str, model: str) -> str:
+    return f"{endpoint}|{model}"
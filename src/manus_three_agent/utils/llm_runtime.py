@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from manus_three_agent.core.types import LLMRetryConfig, RuntimeConfig
+from manus_three_agent.utils.endpoint_pool import EndpointPool
+from manus_three_agent.utils.hedging import RequestHedger
+from manus_three_agent.utils.llm_cache import LLMResponseCache
+from manus_three_agent.utils.llm_capabilities import ProviderCapabilityCache
+from manus_three_agent.utils.rate_limit import RateLimiterRegistry
+from manus_three_agent.utils.single_flight import SingleFlight
+
+
+@dataclass
+class LLMRuntime:
+    """State shared by every ``LLMClient`` of one run: retry policy, caches, limiters, and pools.
+
+    The CLI builds one from ``RuntimeConfig`` and hands it to the agents; a client created
+    without one gets an empty runtime, so nothing leaks between runs or tests.
+    """
+
+    retry: LLMRetryConfig = field(default_factory=LLMRetryConfig)
+    capabilities: ProviderCapabilityCache = field(default_factory=ProviderCapabilityCache)
+    cache: LLMResponseCache | None = None
+    single_flight: SingleFlight | None = None
+    rate_limiter: RateLimiterRegistry | None = None
+    endpoint_pool: EndpointPool | None = None
+    hedger: RequestHedger | None = None
+
+    @classmethod
+    def from_config(cls, config: RuntimeConfig) -> LLMRuntime:
+        pool = EndpointPool(config.llm_endpoints) if config.llm_endpoints.enabled else None
+        return cls(
+            retry=config.llm_retry,
+            capabilities=ProviderCapabilityCache(config.provider_capabilities.path),
+            cache=LLMResponseCache(config.llm_cache) if config.llm_cache.enabled else None,
+            single_flight=SingleFlight(config.llm_single_flight) if config.llm_single_flight.enabled else None,
+            rate_limiter=RateLimiterRegistry(config.llm_rate_limit) if config.llm_rate_limit.enabled else None,
+            endpoint_pool=pool if pool is not None and pool.endpoints else None,
+            hedger=RequestHedger(config.llm_hedging) if config.llm_hedging.enabled else None,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "llm_cache": self.cache.stats() if self.cache else {},
+            "llm_single_flight": self.single_flight.stats() if self.single_flight else {},
+            "llm_rate_limit": self.rate_limiter.stats() if self.rate_limiter else {},
+            "llm_endpoints": self.endpoint_pool.stats() if self.endpoint_pool else {},
+            "llm_hedging": self.hedger.stats() if self.hedger else {},
+        }
+
+    def close(self) -> None:
+        if self.cache is not None:
+            self.cache.close()
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from manus_three_agent.core.types import PlanLibraryConfig
+from manus_three_agent.tracing.reader import iter_run_events
+
+_WORDS = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _WORDS.findall(text.lower())
+
+
+@dataclass
+class PlanRecord:
+    goal: str
+    steps: list[dict[str, Any]]
+    agentic_mode: str = ""
+    run_id: str = ""
+    source: str = ""
+    vector: dict[str, float] = field(default_factory=dict, repr=False)
+
+
+class PlanLibrary:
+    """Plans from successful episodes, retrieved by TF-IDF cosine similarity over goals.
+
+    Everything is local: the index is an inverted list of ``term -> [(record, weight)]``, so a
+    lookup only touches records sharing a term with the query. Records with the same
+    normalized goal are deduplicated, keeping the most recently loaded one.
+    """
+
+    def __init__(self, records: list[PlanRecord], *, source: str = "") -> None:
+        self.source = source
+        by_goal: dict[tuple[str, ...], PlanRecord] = {}
+        for record in records:
+            by_goal[tuple(tokenize(record.goal))] = record
+        self.records = [record for key, record in by_goal.items() if key and record.steps]
+
+        doc_freq: Counter[str] = Counter()
+        for record in self.records:
+            doc_freq.update(set(tokenize(record.goal)))
+        self._num_docs = len(self.records)
+        self._idf = {term: self._smoothed_idf(df) for term, df in doc_freq.items()}
+        self._postings: dict[str, list[tuple[int, float]]] = defaultdict(list)
+        for index, record in enumerate(self.records):
+            record.vector = self._vectorize(tokenize(record.goal))
+            for term, weight in record.vector.items():
+                self._postings[term].append((index, weight))
+
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.reuses = 0
+        self.warm_starts = 0
+
+    @classmethod
+    def from_config(cls, config: PlanLibraryConfig) -> "PlanLibrary":
+        records: list[PlanRecord] = []
+        for report_dir in config.report_dirs:
+            records.extend(load_report_plans(report_dir))
+        for trace_dir in config.trace_dirs:
+            records.extend(load_trace_plans(trace_dir))
+        return cls(records, source=",".join([*config.report_dirs, *config.trace_dirs]))
+
+    def lookup(self, goal: str, *, agentic_mode: str = "") -> tuple[PlanRecord | None, float]:
+        """Return the most similar recorded plan and its cosine score in ``[0, 1]``."""
+        query = self._vectorize(tokenize(goal))
+        scores: dict[int, float] = defaultdict(float)
+        for term, weight in query.items():
+            for index, doc_weight in self._postings.get(term, ()):
+                scores[index] += weight * doc_weight
+
+        best: PlanRecord | None = None
+        best_score = 0.0
+        for index, score in scores.items():
+            record = self.records[index]
+            if agentic_mode and record.agentic_mode and record.agentic_mode != agentic_mode:
+                continue
+            if score > best_score:
+                best, best_score = record, score
+        return best, min(1.0, best_score)
+
+    def record_outcome(self, outcome: str) -> dict[str, Any]:
+        with self._lock:
+            self.lookups += 1
+            if outcome == "reuse":
+                self.reuses += 1
+            elif outcome == "warm_start":
+                self.warm_starts += 1
+            return self._stats_unlocked()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return self._stats_unlocked()
+
+    def _stats_unlocked(self) -> dict[str, Any]:
+        hits = self.reuses + self.warm_starts
+        return {
+            "records": len(self.records),
+            "lookups": self.lookups,
+            "reuses": self.reuses,
+            "warm_starts": self.warm_starts,
+            "hit_rate": round(hits / self.lookups, 4) if self.lookups else 0.0,
+        }
+
+    def _smoothed_idf(self, df: int) -> float:
+        return math.log((1 + self._num_docs) / (1 + df)) + 1.0
+
+    def _vectorize(self, tokens: list[str]) -> dict[str, float]:
+        # Unseen query terms keep the maximum idf so they lower the score instead of vanishing.
+        unseen_idf = self._smoothed_idf(0)
+        weights = {term: count * self._idf.get(term, unseen_idf) for term, count in Counter(tokens).items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        return {term: weight / norm for term, weight in weights.items()} if norm else {}
+
+
+def load_report_plans(report_dir: str | Path) -> list[PlanRecord]:
+    """Read successful ``episode_*.json`` reports (batch reports are nested one level deeper)."""
+    root = Path(report_dir)
+    if not root.exists():
+        return []
+
+    records: list[PlanRecord] = []
+    for path in sorted(root.rglob("episode_*.json")):
+        try:
+            report = orjson.loads(path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            continue
+        final_state = report.get("final_state", {})
+        if not final_state.get("success"):
+            continue
+        records.append(
+            PlanRecord(
+                goal=str(final_state.get("goal", "")),
+                steps=list(final_state.get("plan", [])),
+                agentic_mode=str(report.get("config", {}).get("agentic_mode", "")),
+                run_id=str(report.get("artifact", {}).get("run_id", "")),
+                source=str(path),
+            )
+        )
+    return records
+
+
+def load_trace_plans(trace_dir: str | Path) -> list[PlanRecord]:
+    """Read the last ``architect_output`` plan of every successful traced run."""
+    root = Path(trace_dir)
+    if not root.exists():
+        return []
+
+    records: list[PlanRecord] = []
+    for run_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+        session_path = run_dir / "session.json"
+        if not session_path.exists():
+            continue
+        try:
+            session = orjson.loads(session_path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            continue
+        if session.get("status") != "completed" or not session.get("summary", {}).get("success"):
+            continue
+
+        steps: list[dict[str, Any]] = []
+        try:
+            for event in iter_run_events(run_dir):
+                if event.get("event_type") == "architect_output":
+                    steps = list(event.get("payload", {}).get("steps", []))
+        except (OSError, orjson.JSONDecodeError):
+            continue
+        records.append(
+            PlanRecord(
+                goal=str(session.get("goal", "")),
+                steps=steps,
+                agentic_mode=str(session.get("runtime_config", {}).get("agentic_mode", "")),
+                run_id=str(session.get("run_id", run_dir.name)),
+                source=str(run_dir),
+            )
+        )
+    return records
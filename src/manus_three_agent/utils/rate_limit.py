@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+from manus_three_agent.core.types import RateLimitConfig
+from manus_three_agent.utils.deadline import Deadline
+
+_SLOT_POLL_SECONDS = 0.01
+
+
+class TokenBucket:
+    """Reservation-based token bucket: callers debit up front and sleep off any deficit.
+
+    Letting the balance go negative queues callers in arrival order instead of having
+    them poll and race for refills.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: float) -> None:
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Debit ``amount`` and return how many seconds the caller must wait before using it."""
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            return max(0.0, -self._tokens / self.rate)
+
+    def refund(self, amount: float) -> None:
+        """Return (or, when negative, additionally debit) tokens after the real cost is known."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class ProviderLimiter:
+    """Request/s and tokens/min buckets plus an AIMD concurrency limit for one provider and model.
+
+    The concurrency limit grows by ``1/limit`` per success (about +1 per round of requests),
+    shrinks by ``decrease_factor`` on a 429 or an overload failure (transport error, timeout,
+    5xx), and shrinks gently when latency exceeds ``latency_target_ms``. Other failures leave
+    it unchanged. A ``Retry-After`` pauses every caller of this key until it expires.
+    """
+
+    def __init__(self, key: str, config: RateLimitConfig) -> None:
+        self.key = key
+        self.config = config
+        self.requests: TokenBucket | None = None
+        self.tokens: TokenBucket | None = None
+        if config.requests_per_second:
+            self.requests = TokenBucket(config.requests_per_second, max(1.0, config.requests_per_second))
+        if config.tokens_per_minute:
+            self.tokens = TokenBucket(config.tokens_per_minute / 60.0, float(config.tokens_per_minute))
+        self.limit = float(config.initial_concurrency)
+        self.in_flight = 0
+        self.pause_until = 0.0
+        self.rate_limited = 0
+        self.failures = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, estimated_tokens: int, deadline: Deadline | None = None) -> Permit:
+        """Wait for capacity; with a ``deadline``, never wait past it and raise ``DeadlineExceeded`` instead."""
+        started = time.monotonic()
+        wait_s = self._reserve(estimated_tokens)
+        try:
+            time.sleep(_within(wait_s, deadline))
+            with self._cond:
+                while True:
+                    if deadline is not None:
+                        deadline.check()
+                    if self._try_take_slot():
+                        break
+                    delay = max(_SLOT_POLL_SECONDS, self.pause_until - time.monotonic())
+                    self._cond.wait(timeout=_within(delay, deadline))
+        except BaseException:
+            self._unreserve(estimated_tokens)
+            raise
+        return Permit(self, estimated_tokens, waited_s=time.monotonic() - started)
+
+    async def aacquire(self, estimated_tokens: int, deadline: Deadline | None = None) -> Permit:
+        started = time.monotonic()
+        wait_s = self._reserve(estimated_tokens)
+        try:
+            await asyncio.sleep(_within(wait_s, deadline))
+            while True:
+                if deadline is not None:
+                    deadline.check()
+                with self._cond:
+                    if self._try_take_slot():
+                        break
+                    delay = max(_SLOT_POLL_SECONDS, self.pause_until - time.monotonic())
+                await asyncio.sleep(_within(delay, deadline))
+        except BaseException:
+            # Cancelled or out of time before a slot was taken: give the reservation back.
+            self._unreserve(estimated_tokens)
+            raise
+        return Permit(self, estimated_tokens, waited_s=time.monotonic() - started)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "key": self.key,
+                "concurrency_limit": round(self.limit, 3),
+                "in_flight": self.in_flight,
+                "rate_limited": self.rate_limited,
+                "failures": self.failures,
+            }
+
+    def _reserve(self, estimated_tokens: int) -> float:
+        wait_s = max(0.0, self.pause_until - time.monotonic())
+        if self.requests is not None:
+            wait_s = max(wait_s, self.requests.reserve(1))
+        if self.tokens is not None:
+            wait_s = max(wait_s, self.tokens.reserve(estimated_tokens))
+        return wait_s
+
+    def _unreserve(self, estimated_tokens: int) -> None:
+        if self.requests is not None:
+            self.requests.refund(1)
+        if self.tokens is not None:
+            self.tokens.refund(estimated_tokens)
+
+    def _try_take_slot(self) -> bool:
+        if time.monotonic() < self.pause_until or self.in_flight >= max(1, math.floor(self.limit)):
+            return False
+        self.in_flight += 1
+        return True
+
+    def complete(
+        self,
+        *,
+        latency_s: float,
+        rate_limited: bool = False,
+        failed: bool = False,
+        overloaded: bool = False,
+        retry_after: float | None = None,
+    ) -> None:
+        cfg = self.config
+        with self._cond:
+            self.in_flight -= 1
+            if rate_limited:
+                self.rate_limited += 1
+                self.limit = max(cfg.min_concurrency, self.limit * cfg.decrease_factor)
+                self.pause_until = max(self.pause_until, time.monotonic() + (retry_after or 0.0))
+            elif failed:
+                self.failures += 1
+                if overloaded:
+                    self.limit = max(cfg.min_concurrency, self.limit * cfg.decrease_factor)
+            elif cfg.latency_target_ms is not None and latency_s * 1000 > cfg.latency_target_ms:
+                self.limit = max(cfg.min_concurrency, self.limit * cfg.latency_decrease_factor)
+            else:
+                self.limit = min(cfg.max_concurrency, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+
+class Permit:
+    def __init__(self, limiter: ProviderLimiter, estimated_tokens: int, *, waited_s: float) -> None:
+        self.limiter = limiter
+        self.estimated_tokens = estimated_tokens
+        self.waited_s = waited_s
+        self._started = time.monotonic()
+
+    def release(
+        self,
+        *,
+        used_tokens: int | None = None,
+        rate_limited: bool = False,
+        failed: bool = False,
+        overloaded: bool = False,
+        retry_after: float | None = None,
+    ) -> None:
+        """``failed`` withholds the concurrency increase; ``overloaded`` failures also shrink the limit."""
+        if self.limiter.tokens is not None and used_tokens is not None:
+            self.limiter.tokens.refund(self.estimated_tokens - used_tokens)
+        self.limiter.complete(
+            latency_s=time.monotonic() - self._started,
+            rate_limited=rate_limited,
+            failed=failed,
+            overloaded=overloaded,
+            retry_after=retry_after,
+        )
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "wait_ms": round(self.waited_s * 1000, 3),
+            "estimated_tokens": self.estimated_tokens,
+            **self.limiter.snapshot(),
+        }
+
+
+class RateLimiterRegistry:
+    """Process-wide limiters, one per ``provider/model``."""
+
+    def __init__(self, config: RateLimitConfig) -> None:
+        self.config = config
+        self._lock = threading.Lock()
+        self._limiters: dict[str, ProviderLimiter] = {}
+
+    def get(self, provider: str, model: str) -> ProviderLimiter:
+        key = f"{provider}/{model}"
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = self._limiters[key] = ProviderLimiter(key, self.config)
+            return limiter
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {limiter.key: limiter.snapshot() for limiter in limiters}
+
+
+def retry_after_seconds(headers: Any) -> float | None:
+    """Parse ``retry-after-ms`` / ``Retry-After`` (seconds or HTTP date) from response headers."""
+    if headers is None:
+        return None
+    raw_ms = headers.get("retry-after-ms")
+    if raw_ms:
+        try:
+            return max(0.0, float(raw_ms) / 1000.0)
+        except ValueError:
+            pass
+    raw = headers.get("retry-after")
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(raw).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _within(delay: float, deadline: Deadline | None) -> float:
+    """Cap a limiter wait at the time left before ``deadline``."""
+    if deadline is None:
+        return delay
+    return max(0.0, min(delay, deadline.remaining()))
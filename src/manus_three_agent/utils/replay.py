@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+from manus_three_agent.tracing.reader import event_segment_paths, iter_run_events
+
+
+class ReplayDivergenceError(RuntimeError):
+    """Raised when a replayed episode asks for an LLM call the recording does not contain."""
+
+
+def prompt_hash(system_prompt: str, user_prompt: str) -> str:
+    return hashlib.sha256(f"{system_prompt}\n\x00\n{user_prompt}".encode("utf-8")).hexdigest()
+
+
+class ReplayStore:
+    """Serve recorded ``llm_call`` responses keyed by (agent, step, prompt hash)."""
+
+    def __init__(self, entries: list[dict[str, Any]], *, source: str = "", strict: bool = False) -> None:
+        self.source = source
+        self.strict = strict
+        self._lock = threading.Lock()
+        self._by_slot: dict[tuple[str, int], list[dict[str, Any]]] = defaultdict(list)
+        for entry in entries:
+            self._by_slot[(entry["agent"], entry["step"])].append(entry)
+        self.served = 0
+        self.diverged = 0
+
+    @classmethod
+    def from_run_dir(cls, run_dir: str | Path, *, strict: bool = False) -> "ReplayStore":
+        run_path = Path(run_dir)
+        if not event_segment_paths(run_path):
+            raise FileNotFoundError(f"Replay events not found under: {run_path}")
+
+        entries: list[dict[str, Any]] = []
+        for event in iter_run_events(run_path):
+            if event.get("event_type") != "llm_call":
+                continue
+            payload = event.get("payload", {})
+            if payload.get("status", "success") != "success" or payload.get("parsed_output") is None:
+                continue
+            entries.append(
+                {
+                    "agent": str(payload.get("agent", "unknown")),
+                    "step": int(payload.get("step", event.get("step", 0))),
+                    "prompt_hash": prompt_hash(
+                        str(payload.get("system_prompt", "")),
+                        str(payload.get("user_prompt", "")),
+                    ),
+                    "parsed_output": payload["parsed_output"],
+                    "raw_response": str(payload.get("raw_response", "")),
+                    "usage": dict(payload.get("usage", {})),
+                    "consumed": False,
+                }
+            )
+        return cls(entries, source=str(run_path), strict=strict)
+
+    def lookup(self, *, agent: str, step: int, system_prompt: str, user_prompt: str) -> tuple[dict[str, Any] | None, str]:
+        """Return ``(entry, match)`` where match is ``exact``, ``slot`` or empty on a miss.
+
+        Strict mode only accepts exact prompt matches and raises on anything else; lenient
+        mode falls back to the next unconsumed recording for the same agent and step.
+        """
+        digest = prompt_hash(system_prompt, user_prompt)
+        with self._lock:
+            candidates = [e for e in self._by_slot.get((agent, step), []) if not e["consumed"]]
+            for entry in candidates:
+                if entry["prompt_hash"] == digest:
+                    entry["consumed"] = True
+                    self.served += 1
+                    return entry, "exact"
+
+            self.diverged += 1
+            if self.strict:
+                reason = "prompt changed" if candidates else "no recorded call"
+                raise ReplayDivergenceError(
+                    f"Replay diverged for agent={agent} step={step}: {reason} (source: {self.source})"
+                )
+            if candidates:
+                entry = candidates[0]
+                entry["consumed"] = True
+                self.served += 1
+                return entry, "slot"
+            return None, ""
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            remaining = sum(1 for entries in self._by_slot.values() for e in entries if not e["consumed"])
+            return {
+                "source": self.source,
+                "strict": self.strict,
+                "served": self.served,
+                "diverged": self.diverged,
+                "unused": remaining,
+            }
+
+
+def find_replay_run_dir(trace_root: str | Path, task_id: str) -> Path | None:
+    """Locate the most recent recorded run for ``task_id`` under a batch trace root.
+
+    Batch runs are named ``<batch_id>_<task_id>``; the batch id is matched exactly so
+    task ``1`` never picks up the recording of task ``x_1``.
+    """
+    root = Path(trace_root)
+    if not root.exists():
+        return None
+    pattern = re.compile(rf"\d{{8}}T\d{{6}}Z_{re.escape(task_id)}")
+    matches = sorted(p for p in root.iterdir() if p.is_dir() and pattern.fullmatch(p.name))
+    return matches[-1] if matches else None
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any
+
+from manus_three_agent.core.types import SingleFlightConfig
+
+
+@dataclass
+class _Flight:
+    future: Future[Any] = field(default_factory=Future)
+    followers: int = 0
+
+
+class FlightHandle:
+    """One caller's view of a flight: the leader runs the call, followers wait for its outcome."""
+
+    def __init__(self, group: SingleFlight, key: str, flight: _Flight, *, is_leader: bool) -> None:
+        self._group = group
+        self._key = key
+        self._flight = flight
+        self.is_leader = is_leader
+
+    @property
+    def followers(self) -> int:
+        return self._flight.followers
+
+    def wait(self, timeout: float | None = None) -> Any:
+        """The leader's outcome; raises ``TimeoutError`` if it takes longer than ``timeout`` seconds."""
+        return self._flight.future.result(timeout=timeout)
+
+    async def async_wait(self, timeout: float | None = None) -> Any:
+        # A concurrent future can be awaited from any loop, so threaded and asyncio callers share flights.
+        # Shielded so a follower giving up does not cancel the flight for the leader and other followers.
+        return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(self._flight.future)), timeout)
+
+    def publish(self, value: Any) -> None:
+        if not self._flight.future.done():
+            self._flight.future.set_result(value)
+
+    def fail(self, exc: BaseException) -> None:
+        if not self._flight.future.done():
+            self._flight.future.set_exception(exc)
+
+    def release(self) -> None:
+        self.fail(RuntimeError("single-flight leader exited without a result"))
+        self._group._release(self._key, self._flight)
+
+
+class SingleFlight:
+    """Deduplicate identical in-flight requests across threads and event loops."""
+
+    def __init__(self, config: SingleFlightConfig) -> None:
+        self.config = config
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def accepts(self, generation_config: dict[str, Any]) -> bool:
+        if not self.config.enabled:
+            return False
+        if self.config.deterministic_only:
+            return generation_config.get("temperature", 1.0) == 0
+        return True
+
+    def join(self, key: str) -> FlightHandle:
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.leaders += 1
+                return FlightHandle(self, key, flight, is_leader=True)
+            flight.followers += 1
+            self.followers += 1
+            return FlightHandle(self, key, flight, is_leader=False)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"leaders": self.leaders, "followers": self.followers, "in_flight": len(self._flights)}
+
+    def _release(self, key: str, flight: _Flight) -> None:
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
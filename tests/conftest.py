@@ -0,0 +1,69 @@
+import inspect
+from types import SimpleNamespace
+
+import pytest
+
+from manus_three_agent.utils.llm import LLMClient
+
+_USAGE = SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+
+
+class _RecordingTracer:
+    """In-memory stand-in for ``TraceCollector`` that keeps every logged event."""
+
+    def __init__(self) -> None:
+        self.events: list[dict] = []
+
+    def log_event(self, *, event_type: str, step: int, payload: dict, meta: dict | None = None) -> None:
+        self.events.append({"event_type": event_type, "step": step, "payload": payload})
+
+
+def _as_response(outcome):
+    """Fake completions may return plain strings; wrap them like an SDK chat completion."""
+    if isinstance(outcome, str):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=outcome))], usage=_USAGE)
+    return outcome
+
+
+class _FakeSDK:
+    """Stands in for ``OpenAI``/``AsyncOpenAI``: forwards ``chat.completions.create`` to the test's fake."""
+
+    def __init__(self, completions) -> None:
+        self._create = getattr(completions, "create", completions)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._dispatch))
+
+    def _dispatch(self, **kwargs):
+        outcome = self._create(**kwargs)
+        if inspect.isawaitable(outcome):
+            return self._resolve(outcome)
+        return _as_response(outcome)
+
+    async def _resolve(self, outcome):
+        return _as_response(await outcome)
+
+
+@pytest.fixture
+def fake_llm_client(monkeypatch):
+    """Build an enabled ``LLMClient`` whose sync and async SDK clients call ``completions``.
+
+    ``completions`` is an object with ``create(**kwargs)`` or the function itself; it may
+    return a content string, an SDK-shaped object (e.g. a stream), or raise.
+    """
+
+    def _build(completions, *, events: list[dict] | None = None, base_url: str = "", **kwargs) -> LLMClient:
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+        monkeypatch.delenv("LLM_PROVIDER", raising=False)
+        if base_url:
+            monkeypatch.setenv("OPENAI_BASE_URL", base_url)
+        client = LLMClient(trace_hook=events.append if events is not None else None, **kwargs)
+        sdk = _FakeSDK(completions)
+        monkeypatch.setattr(client, "_build_client", lambda: sdk)
+        monkeypatch.setattr(client, "_build_async_client", lambda: sdk)
+        return client
+
+    return _build
+
+
+@pytest.fixture
+def recording_tracer() -> _RecordingTracer:
+    return _RecordingTracer()
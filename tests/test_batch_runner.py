@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import orjson
+from typer.testing import CliRunner
+
+from manus_three_agent.eval.batch import BatchTask, load_batch_tasks, run_batch_tasks
+from manus_three_agent.eval.runner import app
+
+
+def test_load_batch_tasks_reads_repo_testing_file() -> None:
+    tasks = load_batch_tasks("data/testing/trajectory_testing_data_v1.jsonl")
+
+    assert len(tasks) == 5
+    assert tasks[0].id == "task_001"
+    assert tasks[1].agentic_mode == "react"
+    assert tasks[0].max_steps == 3
+
+
+def test_run_batch_tasks_preserves_order_and_captures_failures() -> None:
+    tasks = [BatchTask(id=f"t{i}", goal=f"goal {i}") for i in range(6)]
+
+    def _run(task: BatchTask) -> dict:
+        if task.id == "t3":
+            raise RuntimeError("boom")
+        return {"metrics": {"success": True, "step_count": 1}}
+
+    results = run_batch_tasks(tasks, _run, concurrency=3)
+
+    assert [r["task_id"] for r in results] == [t.id for t in tasks]
+    assert results[3]["status"] == "failed"
+    assert "boom" in results[3]["error"]
+    assert all(r["status"] == "completed" for i, r in enumerate(results) if i != 3)
+
+
+def test_run_batch_cli_writes_report_and_per_task_traces(tmp_path: Path) -> None:
+    trace_cfg = tmp_path / "tracing.yaml"
+    trace_cfg.write_text(f"enabled: true\nbase_dir: {tmp_path / 'traces'}\n", encoding="utf-8")
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "run-batch",
+            "--tasks",
+            "data/testing/trajectory_testing_data_v1.jsonl",
+            "--mock",
+            "--concurrency",
+            "3",
+            "--trace-config",
+            str(trace_cfg),
+            "--output-dir",
+            str(tmp_path / "reports"),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+
+    report_paths = list((tmp_path / "reports").glob("batch_*/report.json"))
+    assert len(report_paths) == 1
+    report = orjson.loads(report_paths[0].read_bytes())
+    assert report["summary"]["num_tasks"] == 5
+    assert report["summary"]["completed"] == 5
+    assert len(list(report_paths[0].parent.glob("episodes/episode_*.json"))) == 5
+
+    run_dirs = sorted((tmp_path / "traces").iterdir())
+    assert len(run_dirs) == 5
+    for run_dir in run_dirs:
+        events = (run_dir / "events.jsonl").read_text(encoding="utf-8").strip().splitlines()
+        event_types = {orjson.loads(line)["event_type"] for line in events}
+        assert {"architect_output", "worker_output", "critic_output", "episode_end"} <= event_types
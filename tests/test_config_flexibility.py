@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 import yaml
@@ -155,3 +156,71 @@ def test_mode_prompt_profile_supports_codeact_and_react() -> None:
     assert react_shared["agentic_mode"] == "react"
     assert "worker" in codeact_overrides
     assert "worker" in react_overrides
+
+
+def test_prompt_templates_load_yaml_once_and_hot_reload(tmp_path: Path, monkeypatch) -> None:
+    prompts_dir = tmp_path / "prompts"
+    role_path = prompts_dir / "worker.yaml"
+    _write_yaml(role_path, {"system": "S1", "user_template": "Goal: {goal}"})
+
+    loads: list[str] = []
+    from manus_three_agent.prompts import templates as templates_module
+
+    original_load_yaml = templates_module.load_yaml
+    monkeypatch.setattr(templates_module, "load_yaml", lambda path: loads.append(path) or original_load_yaml(path))
+
+    cached = PromptTemplates(config_dir=str(prompts_dir))
+    for _ in range(5):
+        assert cached.render("worker", goal="g") == ("S1", "Goal: g")
+    assert len(loads) == 1
+
+    reloading = PromptTemplates(config_dir=str(prompts_dir), hot_reload=True)
+    assert reloading.render("worker", goal="g")[0] == "S1"
+    _write_yaml(role_path, {"system": "S2", "user_template": "Goal: {goal}"})
+    os.utime(role_path, ns=(0, role_path.stat().st_mtime_ns + 1_000_000))
+    assert reloading.render("worker", goal="g")[0] == "S2"
+    assert cached.render("worker", goal="g")[0] == "S1"
+
+
+def test_prompt_templates_reject_malformed_template_at_load(tmp_path: Path) -> None:
+    prompts_dir = tmp_path / "prompts"
+    _write_yaml(prompts_dir / "critic.yaml", {"system": "Broken {", "user_template": "x"})
+
+    prompts = PromptTemplates(config_dir=str(prompts_dir))
+    try:
+        prompts.compile("critic")
+        assert False, "Expected ValueError"
+    except ValueError as exc:
+        assert "critic" in str(exc)
+
+
+def test_mode_profiles_and_prompt_overrides_reach_variant_prompts(tmp_path: Path) -> None:
+    override_path = tmp_path / "prompt_override.yaml"
+    _write_yaml(
+        override_path,
+        {"architect": {"system": "Custom architect."}, "worker_macro": {"system": "Custom macro worker."}},
+    )
+    mode_overrides, _ = get_mode_prompt_profile("react")
+    user_overrides, _ = _load_prompt_overrides(str(override_path))
+
+    for variant in ("architect_first_action", "architect_replan", "architect_warm_start"):
+        assert mode_overrides[variant]["system"] == mode_overrides["architect"]["system"]
+        assert user_overrides[variant]["system"] == "Custom architect."
+    assert mode_overrides["worker_macro"]["system"] == mode_overrides["worker"]["system"]
+    assert user_overrides["worker_macro"]["system"] == "Custom macro worker."
+
+    prompts = PromptTemplates(config_dir="configs/prompts", role_overrides=user_overrides)
+    system_prompt, user_prompt = prompts.render(
+        "architect_replan",
+        goal="g",
+        observation="o",
+        action_history=[],
+        completed_steps=[],
+        remaining_steps=[],
+        feedback="f",
+        use_cot=False,
+        agentic_mode="react",
+        confidence_field="",
+    )
+    assert system_prompt == "Custom architect."
+    assert user_prompt.startswith("Task: revise only the remaining part")
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+from manus_three_agent.agents import CriticAgent
+from manus_three_agent.core import AppendLog, ContextPolicyConfig, ModelConfig
+from manus_three_agent.prompts import PromptTemplates
+from manus_three_agent.utils.context_window import HistoryWindow, estimate_tokens, truncate_to_tokens
+
+
+def _history(n: int) -> AppendLog:
+    return AppendLog({"summary": f"step {i}", "output": "result " * 200, "is_final": False} for i in range(n))
+
+
+def test_truncate_to_tokens_respects_budget() -> None:
+    text = "alpha beta gamma " * 100
+
+    out = truncate_to_tokens(text, 20)
+
+    assert estimate_tokens(out) < 40
+    assert "[truncated ~" in out
+    assert truncate_to_tokens("short text", 20) == "short text"
+
+
+def test_history_window_summarizes_beyond_last_k_and_reports_savings() -> None:
+    window = HistoryWindow(ContextPolicyConfig(enabled=True, window_last_k=2, tool_output_max_tokens=16))
+    history = _history(3)
+    window.render(history)
+
+    rendered, stats = window.render(history.extend(_history(3)))
+
+    assert stats["history_items"] == 6
+    assert stats["window_items"] == 2
+    assert stats["summarized_items"] == 4
+    assert stats["tokens_saved"] > 0
+    assert stats["rendered_tokens"] + stats["tokens_saved"] == stats["full_tokens"]
+    assert rendered.startswith("Earlier steps (summarized): #1 step 0 | #2 step 1 | #3 step 2 | #4 step 0")
+
+
+def test_disabled_policy_passes_history_through() -> None:
+    history = _history(2)
+
+    assert HistoryWindow(ContextPolicyConfig()).render(history) == (history, {})
+
+
+def test_critic_records_context_savings_in_llm_trace(monkeypatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    critic = CriticAgent(
+        ModelConfig(model="m"),
+        PromptTemplates(config_dir="configs/prompts"),
+        context_policy=ContextPolicyConfig(enabled=True, window_last_k=1),
+    )
+    events: list[dict] = []
+    critic.llm.trace_hook = events.append
+    response = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content='{"decision": "continue"}'))],
+        usage=None,
+    )
+    completions = SimpleNamespace(create=lambda **kwargs: response)
+    monkeypatch.setattr(critic.llm, "_build_client", lambda: SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+
+    critic.review(goal="g", observation="o", action_history=_history(5), current_step_idx=5, plan_length=6, step=5)
+
+    assert events[0]["context"]["window_items"] == 1
+    assert events[0]["context"]["tokens_saved"] > 0
+    assert "result result" not in events[0]["user_prompt"].split("Recent actions:")[0]
@@ -0,0 +1,73 @@
+import pytest
+
+from manus_three_agent.agents import ArchitectAgent, CriticAgent, WorkerAgent
+from manus_three_agent.core import CriticPolicyConfig, ModelConfig, build_initial_state
+from manus_three_agent.environments.simulator import GenericSimulatorEnvironment
+from manus_three_agent.eval.metrics import compute_episode_metrics
+from manus_three_agent.graph import build_workflow
+from manus_three_agent.prompts import PromptTemplates
+from manus_three_agent.tools import build_default_tool_registry
+
+
+def _critic(**policy) -> CriticAgent:
+    return CriticAgent(
+        ModelConfig(model="mock"),
+        PromptTemplates(config_dir="configs/prompts"),
+        force_mock=True,
+        review_policy=CriticPolicyConfig(**policy),
+    )
+
+
+@pytest.mark.parametrize(
+    ("policy", "observation", "step_idx", "step_count", "escalates"),
+    [
+        ({"mode": "always"}, "fine", 1, 1, True),
+        ({"mode": "gated"}, "fine", 1, 1, False),
+        ({"mode": "gated"}, "tool failed", 1, 1, True),
+        ({"mode": "gated"}, "fine", 3, 3, True),
+        ({"mode": "every_n", "every_n_steps": 3}, "fine", 1, 3, True),
+        ({"mode": "every_n", "every_n_steps": 3}, "fine", 1, 2, False),
+        ({"mode": "on_signal"}, "fine", 3, 3, False),
+        ({"mode": "plan_end"}, "error", 1, 1, False),
+    ],
+)
+def test_fast_path_escalates_per_policy(policy, observation, step_idx, step_count, escalates) -> None:
+    review, reason = _critic(**policy).fast_path(
+        observation=observation,
+        action_history=[{"summary": "s"}],
+        current_step_idx=step_idx,
+        plan_length=3,
+        step_count=step_count,
+    )
+
+    assert (review is None) is escalates
+    assert bool(reason) is not escalates
+
+
+def test_gated_policy_records_skipped_reviews() -> None:
+    prompts = PromptTemplates(config_dir="configs/prompts")
+    model_cfg = ModelConfig(model="mock")
+    critic = _critic(mode="gated")
+    workflow = build_workflow(
+        ArchitectAgent(model_cfg, prompts, force_mock=True),
+        WorkerAgent(model_cfg, prompts, build_default_tool_registry(), force_mock=True),
+        critic,
+        GenericSimulatorEnvironment(),
+    )
+
+    final_state = workflow.invoke(
+        build_initial_state(
+            goal="Draft a reproducibility checklist",
+            observation="Environment ready.",
+            max_steps=6,
+            dynamic_replanning=True,
+            use_cot=False,
+            agentic_mode="codeact",
+        )
+    )
+    metrics = compute_episode_metrics(final_state)
+
+    skipped = [r for r in final_state["review_history"] if r["reviewer"] == "rule"]
+    assert skipped and all(r["skip_reason"] == "rule_gate_passed" for r in skipped)
+    assert metrics["skipped_reviews"] == len(skipped)
+    assert final_state["success"] is True
@@ -0,0 +1,198 @@
+import threading
+import time
+
+import pytest
+
+from manus_three_agent.agents import ArchitectAgent, CriticAgent, WorkerAgent
+from manus_three_agent.core import (
+    HedgingConfig,
+    ModelConfig,
+    RateLimitConfig,
+    SingleFlightConfig,
+    build_initial_state,
+    materialize_state,
+)
+from manus_three_agent.environments.simulator import GenericSimulatorEnvironment
+from manus_three_agent.eval.metrics import compute_episode_metrics
+from manus_three_agent.graph import build_workflow
+from manus_three_agent.prompts import PromptTemplates
+from manus_three_agent.tools import ToolRegistry
+from manus_three_agent.utils.deadline import Deadline, DeadlineExceeded
+from manus_three_agent.utils.hedging import RequestHedger
+from manus_three_agent.utils.llm_runtime import LLMRuntime
+from manus_three_agent.utils.rate_limit import RateLimiterRegistry
+from manus_three_agent.utils.single_flight import SingleFlight
+
+
+def test_episode_stops_with_deadline_reason_when_a_tool_overruns(recording_tracer) -> None:
+    tools = ToolRegistry()
+    tools.register("calculator", lambda arguments: time.sleep(0.3) or {"value": 50})
+    deadline = Deadline(0.1)
+    prompts = PromptTemplates(config_dir="configs/prompts")
+    model_cfg = ModelConfig(model="mock")
+    workflow = build_workflow(
+        ArchitectAgent(model_cfg, prompts, force_mock=True, deadline=deadline),
+        WorkerAgent(model_cfg, prompts, tools, force_mock=True, deadline=deadline),
+        CriticAgent(model_cfg, prompts, force_mock=True, deadline=deadline),
+        GenericSimulatorEnvironment(),
+        recording_tracer,
+    )
+
+    started = time.monotonic()
+    final_state = materialize_state(
+        workflow.invoke(
+            build_initial_state(
+                goal="Summarize a paper",
+                observation="Environment ready.",
+                max_steps=8,
+                dynamic_replanning=True,
+                use_cot=False,
+                agentic_mode="codeact",
+            )
+        )
+    )
+
+    assert time.monotonic() - started < 0.25
+    assert len(final_state["action_history"]) == 1
+    assert "deadline_exceeded" in final_state["action_history"][0]["output"]
+    assert compute_episode_metrics(final_state)["termination_reason"] == "deadline_exceeded"
+    stops = [e["payload"] for e in recording_tracer.events if e["event_type"] == "episode_stop"]
+    assert stops == [{"reason": "deadline_exceeded", "node": "critic", "error": "episode deadline of 0.1s exceeded"}]
+
+
+def test_llm_timeout_is_clamped_to_remaining_episode_time(fake_llm_client) -> None:
+    seen: list[float] = []
+
+    def _create(**kwargs):
+        seen.append(kwargs["timeout"])
+        return '{"ok": true}'
+
+    deadline = Deadline(5.0)
+    client = fake_llm_client(_create, deadline=deadline)
+
+    client.chat_json(model="m", system_prompt="s", user_prompt="u", generation_config={"timeout": 60.0})
+    assert 4.0 < seen[0] <= 5.0
+
+    deadline.seconds = 0.0
+    with pytest.raises(DeadlineExceeded):
+        client.chat_json(model="m", system_prompt="s", user_prompt="u", generation_config={"timeout": 60.0})
+    assert len(seen) == 1
+
+
+def test_llm_timeout_is_budgeted_after_the_rate_limiter_wait(fake_llm_client) -> None:
+    seen: list[float] = []
+
+    def _create(**kwargs):
+        seen.append(kwargs["timeout"])
+        return '{"ok": true}'
+
+    registry = RateLimiterRegistry(RateLimitConfig(enabled=True))
+    registry.get("openai", "m").pause_until = time.monotonic() + 0.3
+    client = fake_llm_client(_create, deadline=Deadline(5.0), runtime=LLMRuntime(rate_limiter=registry))
+
+    client.chat_json(model="m", system_prompt="s", user_prompt="u", generation_config={"timeout": 60.0})
+    assert seen[0] <= 4.75
+
+
+def test_rate_limiter_wait_stops_at_the_deadline(fake_llm_client) -> None:
+    registry = RateLimiterRegistry(RateLimitConfig(enabled=True))
+    registry.get("openai", "m").pause_until = time.monotonic() + 60.0
+    runtime = LLMRuntime(rate_limiter=registry)
+    client = fake_llm_client(lambda **_: '{"ok": true}', deadline=Deadline(0.1), runtime=runtime)
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        client.chat_json(model="m", system_prompt="s", user_prompt="u")
+    assert time.monotonic() - started < 0.5
+
+
+def test_single_flight_follower_stops_waiting_at_the_deadline(fake_llm_client) -> None:
+    release = threading.Event()
+    leader_sent = threading.Event()
+
+    def _create(**kwargs):
+        leader_sent.set()
+        release.wait(5.0)
+        return '{"ok": true}'
+
+    group = SingleFlight(SingleFlightConfig(enabled=True))
+    leader = fake_llm_client(_create, runtime=LLMRuntime(single_flight=group))
+    follower = fake_llm_client(_create, deadline=Deadline(0.1), runtime=LLMRuntime(single_flight=group))
+    kwargs = {"model": "m", "system_prompt": "s", "user_prompt": "u", "generation_config": {"temperature": 0}}
+    thread = threading.Thread(target=lambda: leader.chat_json(**kwargs))
+    thread.start()
+    leader_sent.wait(5.0)
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        follower.chat_json(**kwargs)
+    assert time.monotonic() - started < 0.5
+    release.set()
+    thread.join()
+    assert group.stats()["followers"] == 1
+
+
+def test_slow_critic_call_is_hedged_and_first_response_wins(fake_llm_client) -> None:
+    hedger = RequestHedger(HedgingConfig(enabled=True, min_samples=1, min_delay_seconds=0.0))
+    hedger.observe("critic/m", 0.02)
+    calls = {"count": 0}
+    lock = threading.Lock()
+
+    def _create(**kwargs):
+        with lock:
+            calls["count"] += 1
+            first = calls["count"] == 1
+        time.sleep(0.5 if first else 0.01)
+        return '{"source": "%s"}' % ("primary" if first else "hedge")
+
+    events: list[dict] = []
+    client = fake_llm_client(_create, events=events, runtime=LLMRuntime(hedger=hedger))
+
+    started = time.monotonic()
+    result = client.chat_json(model="m", system_prompt="s", user_prompt="u", trace_context={"agent": "critic"})
+
+    assert time.monotonic() - started < 0.3
+    assert result == {"source": "hedge"}
+    assert events[0]["hedge"]["fired"] and events[0]["hedge"]["winner"] == "hedge"
+    assert hedger.stats()["fired"] == 1 and hedger.stats()["hedge_wins"] == 1
+
+
+def test_hedge_delay_tracks_primary_latency_when_hedges_win(fake_llm_client) -> None:
+    hedger = RequestHedger(
+        HedgingConfig(enabled=True, quantile=0.5, min_samples=4, window_size=4, min_delay_seconds=0.0)
+    )
+    for _ in range(4):
+        hedger.observe("critic/m", 0.05)
+    sends = {"count": 0}
+    lock = threading.Lock()
+
+    def _create(**kwargs):
+        with lock:
+            sends["count"] += 1
+            primary = sends["count"] % 2 == 1
+        time.sleep(0.3 if primary else 0.0)
+        return '{"ok": true}'
+
+    client = fake_llm_client(_create, runtime=LLMRuntime(hedger=hedger))
+    for _ in range(3):
+        client.chat_json(model="m", system_prompt="s", user_prompt="u", trace_context={"agent": "critic"})
+
+    # The hedges answer at ~0.05s, but the abandoned primaries still report their real ~0.3s latency.
+    deadline = time.monotonic() + 2.0
+    while hedger.delay_for("critic/m") < 0.25 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert hedger.delay_for("critic/m") >= 0.25
+    assert hedger.stats()["hedge_wins"] == 3
+
+
+def test_unlisted_roles_and_cold_keys_are_not_hedged(fake_llm_client) -> None:
+    hedger = RequestHedger(HedgingConfig(enabled=True, min_samples=2))
+    events: list[dict] = []
+    client = fake_llm_client(lambda **_: '{"ok": true}', events=events, runtime=LLMRuntime(hedger=hedger))
+
+    client.chat_json(model="m", system_prompt="s", user_prompt="u", trace_context={"agent": "worker"})
+    client.chat_json(model="m", system_prompt="s", user_prompt="u", trace_context={"agent": "critic"})
+
+    assert all("hedge" not in event for event in events)
+    assert hedger.stats()["keys"] == {"critic/m": 1}
+    assert hedger.delay_for("critic/m") is None
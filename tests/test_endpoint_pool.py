@@ -0,0 +1,139 @@
+from types import SimpleNamespace
+
+import httpx
+from openai import APIConnectionError, AuthenticationError
+
+from manus_three_agent.core import EndpointConfig, EndpointPoolConfig, LLMRetryConfig
+from manus_three_agent.utils.endpoint_pool import EndpointPool
+from manus_three_agent.utils.llm import LLMClient
+from manus_three_agent.utils.llm_runtime import LLMRuntime
+
+
+def _pool(monkeypatch, **overrides) -> EndpointPool:
+    monkeypatch.setenv("KEY_A", "sk-a")
+    monkeypatch.setenv("KEY_B", "sk-b")
+    endpoints = [
+        EndpointConfig(name="a", base_url="https://a.test/v1", api_key_env="KEY_A"),
+        EndpointConfig(name="b", base_url="https://b.test/v1", api_key_env="KEY_B", weight=2.0),
+        EndpointConfig(name="missing-key", base_url="https://c.test/v1", api_key_env="KEY_C"),
+        EndpointConfig(name="other-model", base_url="https://d.test/v1", api_key_env="", models=["big"]),
+    ]
+    return EndpointPool(EndpointPoolConfig(enabled=True, endpoints=endpoints, **overrides))
+
+
+def test_least_outstanding_routing_respects_weights_and_model_filters(monkeypatch) -> None:
+    pool = _pool(monkeypatch)
+
+    assert [e.name for e in pool.endpoints] == ["a", "b", "other-model"]
+    leases = [pool.lease("m") for _ in range(3)]
+    assert [lease.endpoint.name for lease in leases] == ["b", "a", "b"]
+    assert pool.lease("big", exclude=["a", "b"]).endpoint.name == "other-model"
+
+
+def test_ewma_routing_prefers_faster_endpoint_and_circuit_opens(monkeypatch) -> None:
+    pool = _pool(monkeypatch, routing="ewma", failure_threshold=2, cooldown_seconds=60)
+    a, b = pool.endpoints[0], pool.endpoints[1]
+    pool.complete(a, latency_ms=10.0, failed=False)
+    pool.complete(b, latency_ms=500.0, failed=False)
+    a.outstanding = b.outstanding = 1
+
+    assert pool.lease("m").endpoint.name == "a"
+
+    pool.complete(a, latency_ms=0.0, failed=True)
+    pool.complete(a, latency_ms=0.0, failed=True)
+    assert pool.stats()["a"]["circuit"] == "open"
+    assert pool.lease("m").endpoint.name == "b"
+
+
+def test_client_fails_over_to_next_endpoint_and_records_choice(monkeypatch) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.delenv("HF_TOKEN", raising=False)
+    pool = _pool(monkeypatch)
+    events: list[dict] = []
+    client = LLMClient(
+        trace_hook=events.append,
+        runtime=LLMRuntime(endpoint_pool=pool, retry=LLMRetryConfig(transport_attempts=1)),
+    )
+    request = httpx.Request("POST", "https://b.test/v1/chat/completions")
+
+    def _endpoint_client(endpoint):
+        def _create(**kwargs):
+            if endpoint.name == "b":
+                raise APIConnectionError(request=request)
+            content = '{"ok": true}'
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+        return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=_create)))
+
+    monkeypatch.setattr(client, "_build_endpoint_client", _endpoint_client)
+
+    assert client.enabled
+    assert client.chat_json(model="m", system_prompt="s", user_prompt="u") == {"ok": True}
+
+    assert len(events) == 1
+    assert events[0]["endpoint"] == "a"
+    assert events[0]["failover"][0]["endpoint"] == "b"
+    stats = pool.stats()
+    assert stats["b"]["failures"] == 1 and stats["a"]["calls"] == 1
+    assert stats["a"]["outstanding"] == stats["b"]["outstanding"] == 0
+
+
+def test_half_open_endpoint_admits_a_single_trial_call(monkeypatch) -> None:
+    pool = _pool(monkeypatch, failure_threshold=1, cooldown_seconds=60)
+    a = pool.endpoints[0]
+    pool.complete(a, latency_ms=0.0, failed=True)
+    a.open_until = 0.0  # cooldown elapsed
+
+    assert pool.stats()["a"]["circuit"] == "half_open"
+    trial = pool.lease("m", exclude=["b"])
+    assert trial.endpoint.name == "a"
+    assert pool.lease("m").endpoint.name == "b"
+    assert pool.lease("m").endpoint.name == "b"
+
+    trial.finish(failed=False)
+    assert pool.stats()["a"]["circuit"] == "closed"
+    assert pool.lease("m", exclude=["b"]).endpoint.name == "a"
+
+
+def test_client_fails_over_when_an_endpoint_rejects_its_key(monkeypatch) -> None:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.delenv("HF_TOKEN", raising=False)
+    pool = _pool(monkeypatch)
+    events: list[dict] = []
+    client = LLMClient(trace_hook=events.append, runtime=LLMRuntime(endpoint_pool=pool))
+    request = httpx.Request("POST", "https://b.test/v1/chat/completions")
+
+    def _endpoint_client(endpoint):
+        def _create(**kwargs):
+            if endpoint.name == "b":
+                raise AuthenticationError("bad key", response=httpx.Response(401, request=request), body=None)
+            content = '{"ok": true}'
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+        return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=_create)))
+
+    monkeypatch.setattr(client, "_build_endpoint_client", _endpoint_client)
+
+    assert client.chat_json(model="m", system_prompt="s", user_prompt="u") == {"ok": True}
+    assert events[0]["endpoint"] == "a"
+    assert events[0]["failover"][0]["error"].startswith("AuthenticationError")
+    assert pool.stats()["b"]["failures"] == 1
+
+
+def test_stale_completion_does_not_admit_a_second_trial(monkeypatch) -> None:
+    pool = _pool(monkeypatch, failure_threshold=1, cooldown_seconds=60)
+    a, b = pool.endpoints[0], pool.endpoints[1]
+    stale = pool.lease("m", exclude=["b"])
+    pool.complete(a, latency_ms=0.0, failed=True)
+    a.open_until = 0.0
+    trial = pool.lease("m", exclude=["b"])
+    assert trial.trial and not stale.trial
+
+    stale.finish(failed=True)  # was in flight before the circuit opened
+    a.open_until = 0.0
+    b.outstanding = 10
+
+    assert a.probing
+    assert pool.lease("m").endpoint.name == "b"
+    trial.finish(failed=False)
+    assert not a.probing
@@ -0,0 +1,84 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from manus_three_agent.tools import HttpFetcher, set_default_fetcher
+from manus_three_agent.tools.builtin import fetch_url_tool
+
+_PAGE = b"<html><head><title>  Cached\n Page </title></head><body>" + b"x" * 200_000 + b"</body></html>"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests_seen: list[dict] = []
+
+    def do_GET(self) -> None:  # noqa: N802
+        _Handler.requests_seen.append({"path": self.path, "if_none_match": self.headers.get("If-None-Match")})
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(_PAGE)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        try:
+            self.wfile.write(_PAGE)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        return
+
+
+@pytest.fixture()
+def server_url():
+    _Handler.requests_seen = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/page"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_fetch_url_caps_body_and_serves_repeat_from_cache(server_url: str) -> None:
+    set_default_fetcher(HttpFetcher(ttl_seconds=60))
+    try:
+        first = fetch_url_tool({"url": server_url, "max_chars": 100})
+        second = fetch_url_tool({"url": server_url, "max_chars": 100})
+    finally:
+        set_default_fetcher(None)
+
+    assert first["ok"] is True
+    assert first["title"] == "Cached Page"
+    assert first["truncated"] is True
+    assert len(first["content_preview"]) <= 100
+    assert (first["cache"], second["cache"]) == ("miss", "hit")
+    assert len(_Handler.requests_seen) == 1
+
+
+def test_stale_entry_is_revalidated_with_etag(server_url: str) -> None:
+    fetcher = HttpFetcher(ttl_seconds=0)
+
+    first = fetcher.fetch(server_url, max_bytes=1024)
+    second = fetcher.fetch(server_url, max_bytes=1024)
+
+    assert (first.cache, second.cache) == ("miss", "revalidated")
+    assert second.status == 200
+    assert second.body == first.body
+    assert _Handler.requests_seen[1]["if_none_match"] == '"v1"'
+
+
+def test_body_of_exactly_max_bytes_is_not_truncated(server_url: str) -> None:
+    fetcher = HttpFetcher(ttl_seconds=60)
+
+    exact = fetcher.fetch(server_url, max_bytes=len(_PAGE))
+    short = HttpFetcher(ttl_seconds=60).fetch(server_url, max_bytes=len(_PAGE) - 1)
+
+    assert exact.truncated is False and exact.body == _PAGE
+    assert short.truncated is True and len(short.body) == len(_PAGE) - 1
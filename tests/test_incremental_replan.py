@@ -0,0 +1,72 @@
+import json
+from types import SimpleNamespace
+
+from manus_three_agent.agents import ArchitectAgent, CriticAgent, WorkerAgent
+from manus_three_agent.core import CriticOutput, ModelConfig, build_initial_state
+from manus_three_agent.environments.simulator import GenericSimulatorEnvironment
+from manus_three_agent.graph import build_workflow
+from manus_three_agent.prompts import PromptTemplates
+from manus_three_agent.tools import build_default_tool_registry
+
+_PLAN = {"steps": [{"title": "a"}, {"title": "b"}, {"title": "c"}]}
+_REVISION = {"keep": 1, "steps": [{"title": "b2"}, {"title": "d"}]}
+
+
+def _architect(monkeypatch, prompts: PromptTemplates, calls: list[str]) -> ArchitectAgent:
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    architect = ArchitectAgent(ModelConfig(model="m"), prompts)
+
+    def _create(**kwargs):
+        incremental = "remaining part" in kwargs["messages"][1]["content"]
+        calls.append("replan" if incremental else "plan")
+        content = json.dumps(_REVISION if incremental else _PLAN)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+    monkeypatch.setattr(
+        architect.llm,
+        "_build_client",
+        lambda: SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=_create))),
+    )
+    return architect
+
+
+def test_incremental_replan_splices_suffix_after_completed_prefix(monkeypatch) -> None:
+    prompts = PromptTemplates(config_dir="configs/prompts")
+    model_cfg = ModelConfig(model="mock")
+    calls: list[str] = []
+    critic = CriticAgent(model_cfg, prompts, force_mock=True)
+    original_review = critic.review
+    critic.review = lambda **kwargs: (
+        CriticOutput(decision="replan", feedback="step a missed a constraint")
+        if kwargs["step"] == 1 and "replan" not in calls
+        else original_review(**kwargs)
+    )
+    workflow = build_workflow(
+        _architect(monkeypatch, prompts, calls),
+        WorkerAgent(model_cfg, prompts, build_default_tool_registry(), force_mock=True),
+        critic,
+        GenericSimulatorEnvironment(),
+    )
+
+    final_state = workflow.invoke(
+        build_initial_state(
+            goal="g",
+            observation="ready",
+            max_steps=8,
+            dynamic_replanning=True,
+            use_cot=False,
+            agentic_mode="codeact",
+            incremental_replanning=True,
+        )
+    )
+
+    assert calls == ["plan", "replan"]
+    assert [step["title"] for step in final_state["plan"]] == ["a", "b", "b2", "d"]
+    assert [action["summary"] for action in final_state["action_history"]] == [
+        "Executed: a",
+        "Executed: b",
+        "Executed: b2",
+        "Executed: d",
+    ]
+    assert final_state["step_count"] == 4
+    assert final_state["current_step_idx"] == 4
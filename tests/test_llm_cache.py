@@ -0,0 +1,82 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+from manus_three_agent.core.types import LLMCacheConfig
+from manus_three_agent.utils.llm import LLMClient
+from manus_three_agent.utils.llm_cache import LLMResponseCache, llm_cache_key
+from manus_three_agent.utils.llm_runtime import LLMRuntime
+
+
+def test_memory_tier_evicts_least_recently_used() -> None:
+    cache = LLMResponseCache(LLMCacheConfig(enabled=True, max_memory_entries=2))
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    assert cache.get("a")[0] == {"v": 1}
+    cache.put("c", {"v": 3})
+
+    assert cache.get("b") == (None, "")
+    assert cache.get("a")[1] == "memory"
+    assert cache.stats()["memory_entries"] == 2
+
+
+def test_ttl_expires_entries(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr("manus_three_agent.utils.llm_cache.time.time", lambda: now[0])
+    cache = LLMResponseCache(LLMCacheConfig(enabled=True, ttl_seconds=10))
+    cache.put("k", {"v": 1})
+
+    now[0] += 5
+    assert cache.get("k")[0] == {"v": 1}
+    now[0] += 6
+    assert cache.get("k")[0] is None
+
+
+def test_disk_tier_persists_across_instances(tmp_path: Path) -> None:
+    cfg = LLMCacheConfig(enabled=True, disk_path=str(tmp_path / "cache.sqlite"))
+    first = LLMResponseCache(cfg)
+    first.put("k", {"parsed_output": {"steps": []}})
+    first.close()
+
+    second = LLMResponseCache(cfg)
+    value, tier = second.get("k")
+    assert value == {"parsed_output": {"steps": []}}
+    assert tier == "disk"
+    assert second.get("k")[1] == "memory"
+
+
+def test_cache_key_is_stable_across_dict_order() -> None:
+    a = llm_cache_key(model="m", system_prompt="s", user_prompt="u", generation_config={"a": 1, "b": 2})
+    b = llm_cache_key(model="m", system_prompt="s", user_prompt="u", generation_config={"b": 2, "a": 1})
+    assert a == b
+
+
+def test_client_serves_repeated_deterministic_call_from_cache(monkeypatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    calls: list[dict] = []
+
+    def _create(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content='{"decision": "end"}'))],
+            usage=None,
+        )
+
+    events: list[dict] = []
+    client = LLMClient(trace_hook=events.append, runtime=LLMRuntime(cache=LLMResponseCache(LLMCacheConfig(enabled=True))))
+    monkeypatch.setattr(
+        client,
+        "_build_client",
+        lambda: SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=_create))),
+    )
+
+    kwargs = dict(model="m", system_prompt="s", user_prompt="u", generation_config={"temperature": 0.0})
+    assert client.chat_json(**kwargs) == {"decision": "end"}
+    assert client.chat_json(**kwargs) == {"decision": "end"}
+    client.chat_json(model="m", system_prompt="s", user_prompt="u", generation_config={"temperature": 0.7})
+
+    assert len(calls) == 2
+    assert events[0]["cache"]["hit"] is False
+    assert events[1]["cache"]["hit"] is True
+    assert events[1]["cache"]["hits"] == 1
+    assert events[1]["parsed_output"] == {"decision": "end"}
+    assert "cache" not in events[2]
@@ -0,0 +1,150 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from manus_three_agent.utils.json_stream import IncrementalJSONParser, JSONStreamError
+from manus_three_agent.utils.llm import _parse_json_content, get_shared_async_client, get_shared_client
+
+
+class _FakeCompletions:
+    def __init__(self, content: str) -> None:
+        self.content = content
+        self.calls: list[dict] = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.content
+
+
+class _FakeAsyncCompletions(_FakeCompletions):
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(0)
+        return self.content
+
+
+def _stream_chunk(content: str | None = None, usage: SimpleNamespace | None = None) -> SimpleNamespace:
+    choices = [] if content is None else [SimpleNamespace(delta=SimpleNamespace(content=content))]
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class _FakeStream:
+    def __init__(self, parts: list[str]) -> None:
+        self.parts = parts
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        for part in self.parts:
+            self.consumed += 1
+            yield _stream_chunk(part)
+        yield _stream_chunk(usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15))
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakeStreamingCompletions:
+    def __init__(self, parts: list[str]) -> None:
+        self.parts = parts
+        self.calls: list[dict] = []
+        self.streams: list[_FakeStream] = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        self.streams.append(_FakeStream(self.parts))
+        return self.streams[-1]
+
+
+def test_shared_client_is_reused_per_endpoint() -> None:
+    first = get_shared_client("sk-a", "https://a.example/v1")
+    second = get_shared_client("sk-a", "https://a.example/v1")
+    other = get_shared_client("sk-b", "https://a.example/v1")
+
+    assert first is second
+    assert first is not other
+
+
+def test_shared_async_client_is_scoped_to_event_loop() -> None:
+    async def _get():
+        return get_shared_async_client("sk-a", ""), get_shared_async_client("sk-a", "")
+
+    first_a, first_b = asyncio.run(_get())
+    second_a, _ = asyncio.run(_get())
+
+    assert first_a is first_b
+    assert first_a is not second_a
+
+
+def test_achat_json_parses_output_and_emits_trace(fake_llm_client) -> None:
+    events: list[dict] = []
+    completions = _FakeAsyncCompletions('{"decision": "continue"}')
+    client = fake_llm_client(completions, events=events)
+
+    out = asyncio.run(
+        client.achat_json(
+            model="m",
+            system_prompt="sys",
+            user_prompt="usr",
+            generation_config={"temperature": 0.0, "top_p": None},
+            trace_context={"agent": "critic", "step": 2},
+        )
+    )
+
+    assert out == {"decision": "continue"}
+    assert completions.calls[0]["response_format"] == {"type": "json_object"}
+    assert "top_p" not in completions.calls[0]
+    assert events[0]["status"] == "success"
+    assert events[0]["agent"] == "critic"
+    assert events[0]["usage"]["total_tokens"] == 15
+
+
+def test_chat_json_streams_and_records_timings(fake_llm_client) -> None:
+    events: list[dict] = []
+    completions = _FakeStreamingCompletions(['{"decision"', ': "continue",', ' "feedback": "ok"}'])
+    client = fake_llm_client(completions, events=events)
+
+    out = client.chat_json(
+        model="m",
+        system_prompt="sys",
+        user_prompt="usr",
+        generation_config={"temperature": 0.0, "stream": True},
+        trace_context={"agent": "critic", "step": 1},
+    )
+
+    assert out == {"decision": "continue", "feedback": "ok"}
+    assert completions.calls[0]["stream"] is True
+    assert completions.streams[0].closed
+    assert events[0]["status"] == "success"
+    assert events[0]["usage"]["total_tokens"] == 15
+    assert events[0]["stream"]["chunks"] == 3
+    assert events[0]["stream"]["time_to_first_token_ms"] <= events[0]["stream"]["time_to_valid_object_ms"]
+    assert "stream" not in events[0]["generation_config"]
+
+
+def test_streaming_fails_fast_on_non_json_and_retries(fake_llm_client) -> None:
+    events: list[dict] = []
+    completions = _FakeStreamingCompletions(["I cannot", " answer that"] + ["."] * 50)
+    client = fake_llm_client(completions, events=events)
+
+    with pytest.raises(JSONStreamError):
+        client.chat_json(model="m", system_prompt="sys", user_prompt="usr", generation_config={"stream": True})
+
+    assert len(completions.calls) == 2
+    assert all(stream.consumed == 1 and stream.closed for stream in completions.streams)
+    assert [e["status"] for e in events] == ["parse_error"] * 2
+    assert events[1]["retry"] == {"attempt": 2, "after": "parse", "failures": {"parse": 1}}
+    assert events[0]["raw_response"] == "I cannot"
+
+
+def test_lenient_parser_skips_brace_prose_like_the_fallback() -> None:
+    response = 'Here is {the} plan: {"decision": "continue", "feedback": "ok"} done.'
+    parser = IncrementalJSONParser(strict=False)
+
+    results = [parser.feed(response[idx : idx + 7]) for idx in range(0, len(response), 7)]
+
+    expected = {"decision": "continue", "feedback": "ok"}
+    assert [value for value in results if value is not None][0] == expected
+    assert _parse_json_content(response) == expected
+    with pytest.raises(JSONStreamError):
+        IncrementalJSONParser(strict=True).feed(response)
@@ -0,0 +1,111 @@
+import httpx
+import pytest
+from openai import APIConnectionError, BadRequestError, RateLimitError
+
+from manus_three_agent.core import LLMRetryConfig
+from manus_three_agent.utils.llm import LLMClient
+from manus_three_agent.utils.llm_capabilities import JSON_OBJECT, ProviderCapabilityCache
+from manus_three_agent.utils.llm_runtime import LLMRuntime
+
+_REQUEST = httpx.Request("POST", "https://llm.test/v1/chat/completions")
+_NO_BACKOFF = LLMRetryConfig(backoff_min_seconds=0.0, backoff_max_seconds=0.0, rate_limit_backoff_max_seconds=0.0)
+
+
+class _ScriptedCompletions:
+    """Return or raise the scripted outcomes in order, recording each request."""
+
+    def __init__(self, outcomes: list) -> None:
+        self.outcomes = list(outcomes)
+        self.calls: list[dict] = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        outcome = self.outcomes.pop(0)
+        if callable(outcome):
+            outcome = outcome(kwargs)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def retry_client(fake_llm_client):
+    def _build(completions: _ScriptedCompletions, events: list[dict], **runtime) -> LLMClient:
+        runtime.setdefault("retry", _NO_BACKOFF)
+        return fake_llm_client(completions, events=events, base_url="https://llm.test/v1", runtime=LLMRuntime(**runtime))
+
+    return _build
+
+
+def _reject_response_format(kwargs: dict):
+    if "response_format" in kwargs:
+        return BadRequestError(
+            "Error code: 400 - response_format is not supported", response=httpx.Response(400, request=_REQUEST), body=None
+        )
+    return '{"ok": true}'
+
+
+def test_response_format_support_is_learned_once_and_persisted(retry_client, tmp_path) -> None:
+    events: list[dict] = []
+    path = tmp_path / "capabilities.json"
+    completions = _ScriptedCompletions([_reject_response_format] * 3)
+    client = retry_client(completions, events, capabilities=ProviderCapabilityCache(str(path)))
+
+    for _ in range(2):
+        assert client.chat_json(model="m", system_prompt="s", user_prompt="u") == {"ok": True}
+
+    assert ["response_format" in call for call in completions.calls] == [True, False, False]
+    assert [e["capabilities"]["source"] for e in events] == ["probe", "cache"]
+    assert all(e["used_response_format_json_object"] is False for e in events)
+    assert ProviderCapabilityCache(str(path)).get("https://llm.test/v1", "m", JSON_OBJECT) is False
+
+
+def test_retry_budgets_are_tracked_per_failure_class(retry_client) -> None:
+    events: list[dict] = []
+    completions = _ScriptedCompletions(
+        [
+            RateLimitError("slow down", response=httpx.Response(429, request=_REQUEST), body=None),
+            APIConnectionError(request=_REQUEST),
+            "not json",
+            '{"ok": true}',
+        ]
+    )
+    client = retry_client(completions, events, capabilities=ProviderCapabilityCache())
+
+    assert client.chat_json(model="m", system_prompt="s", user_prompt="u") == {"ok": True}
+
+    assert [e["status"] for e in events] == ["rate_limited", "error", "parse_error", "success"]
+    assert events[-1]["retry"] == {
+        "attempt": 4,
+        "after": "parse",
+        "failures": {"rate_limit": 1, "transport": 1, "parse": 1},
+    }
+
+
+def test_parse_budget_does_not_spend_transport_attempts(retry_client) -> None:
+    events: list[dict] = []
+    completions = _ScriptedCompletions(["nope", "still nope"])
+    client = retry_client(
+        completions,
+        events,
+        capabilities=ProviderCapabilityCache(),
+        retry=_NO_BACKOFF.model_copy(update={"parse_attempts": 1}),
+    )
+
+    with pytest.raises(ValueError):
+        client.chat_json(model="m", system_prompt="s", user_prompt="u")
+
+    assert len(completions.calls) == 1
+
+
+def test_other_bad_requests_are_not_retried(retry_client) -> None:
+    events: list[dict] = []
+    error = BadRequestError("Error code: 400 - context too long", response=httpx.Response(400, request=_REQUEST), body=None)
+    completions = _ScriptedCompletions([error, '{"ok": true}'])
+    client = retry_client(completions, events, capabilities=ProviderCapabilityCache())
+
+    with pytest.raises(BadRequestError):
+        client.chat_json(model="m", system_prompt="s", user_prompt="u")
+
+    assert len(completions.calls) == 1
+    assert events[0]["status"] == "api_error"
@@ -0,0 +1,101 @@
+from types import SimpleNamespace
+
+from manus_three_agent.agents import ArchitectAgent, CriticAgent, WorkerAgent
+from manus_three_agent.core import ModelConfig, build_initial_state
+from manus_three_agent.environments.simulator import GenericSimulatorEnvironment
+from manus_three_agent.graph import build_workflow
+from manus_three_agent.prompts import PromptTemplates
+from manus_three_agent.tools import build_default_tool_registry
+
+
+class _CountingWorker(WorkerAgent):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.calls: list[int] = []
+
+    def propose(self, **kwargs):
+        self.calls.append(1)
+        return super().propose(**kwargs)
+
+    def propose_many(self, **kwargs):
+        self.calls.append(len(kwargs["plan_steps"]))
+        return super().propose_many(**kwargs)
+
+
+def test_macro_window_applies_each_sub_step_with_its_own_events(recording_tracer) -> None:
+    prompts = PromptTemplates(config_dir="configs/prompts")
+    model_cfg = ModelConfig(model="mock")
+    tools = build_default_tool_registry()
+    worker = _CountingWorker(model_cfg, prompts, tools, tracer=recording_tracer, force_mock=True)
+    workflow = build_workflow(
+        ArchitectAgent(model_cfg, prompts, force_mock=True),
+        worker,
+        CriticAgent(model_cfg, prompts, force_mock=True),
+        GenericSimulatorEnvironment(),
+        recording_tracer,
+    )
+
+    final_state = workflow.invoke(
+        build_initial_state(
+            goal="Draft a reproducibility checklist",
+            observation="Environment ready.",
+            max_steps=8,
+            dynamic_replanning=True,
+            use_cot=False,
+            agentic_mode="codeact",
+            macro_steps=2,
+        )
+    )
+
+    assert worker.calls == [2, 1]
+    assert final_state["step_count"] == 3
+    assert final_state["success"] is True
+    env_steps = [e["step"] for e in recording_tracer.events if e["event_type"] == "environment_step"]
+    assert env_steps == [1, 2, 3]
+    assert sum(1 for e in recording_tracer.events if e["event_type"] == "critic_output") == 2
+    tool_calls = [e for e in recording_tracer.events if e["event_type"] == "tool_call"]
+    assert len(tool_calls) == 1
+
+
+def test_architect_first_action_skips_first_worker_call(monkeypatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    prompts = PromptTemplates(config_dir="configs/prompts")
+    architect = ArchitectAgent(ModelConfig(model="m"), prompts, first_action=True)
+    content = (
+        '{"steps": [{"title": "only step"}], '
+        '"first_action": {"summary": "done", "output": "o", "is_final": true, "final_answer": "42"}}'
+    )
+    requests: list[dict] = []
+
+    def _create(**kwargs):
+        requests.append(kwargs)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+    monkeypatch.setattr(
+        architect.llm,
+        "_build_client",
+        lambda: SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=_create))),
+    )
+    model_cfg = ModelConfig(model="mock")
+    worker = _CountingWorker(model_cfg, prompts, build_default_tool_registry(), force_mock=True)
+    workflow = build_workflow(
+        architect,
+        worker,
+        CriticAgent(model_cfg, prompts, force_mock=True),
+        GenericSimulatorEnvironment(),
+    )
+
+    final_state = workflow.invoke(
+        build_initial_state(
+            goal="Answer",
+            observation="Environment ready.",
+            max_steps=4,
+            dynamic_replanning=True,
+            use_cot=False,
+            agentic_mode="codeact",
+        )
+    )
+
+    assert worker.calls == []
+    assert final_state["final_answer"] == "42"
+    assert "first_action" in requests[0]["messages"][1]["content"]
@@ -1,7 +1,15 @@
 from manus_three_agent.agents import ArchitectAgent, CriticAgent, WorkerAgent
-from manus_three_agent.core import ModelConfig, build_initial_state
+from manus_three_agent.core import (
+    AppendLog,
+    ModelConfig,
+    PlanOutput,
+    PlanStep,
+    WorkerOutput,
+    build_initial_state,
+    materialize_state,
+)
 from manus_three_agent.environments.simulator import GenericSimulatorEnvironment
-from manus_three_agent.graph import build_workflow
+from manus_three_agent.graph import build_workflow, recursion_limit_for
 from manus_three_agent.prompts import PromptTemplates
 from manus_three_agent.tools import build_default_tool_registry
 from manus_three_agent.tracing import TraceCollector
@@ -33,3 +41,44 @@ def test_mock_workflow_reaches_terminal_state() -> None:
     assert final_state["success"] is True
     assert final_state["step_count"] >= 1
     assert final_state["final_answer"] != ""
+
+
+def test_append_log_views_are_isolated_prefixes() -> None:
+    base = AppendLog([1])
+    longer = base.extend([2, 3])
+    branch = base.extend([9])
+
+    assert base == [1]
+    assert longer == [1, 2, 3]
+    assert branch == [1, 9]
+    assert longer[-1] == 3 and longer[1:] == [2, 3]
+
+
+def test_long_episode_accumulates_histories_once_per_step() -> None:
+    prompts = PromptTemplates(config_dir="configs/prompts")
+    model_cfg = ModelConfig(model="mock")
+    architect = ArchitectAgent(model_cfg, prompts, force_mock=True)
+    architect._mock_plan = lambda goal: PlanOutput(steps=[PlanStep(title=f"s{i}") for i in range(100)])
+    worker = WorkerAgent(model_cfg, prompts, build_default_tool_registry(), force_mock=True)
+    worker._mock_execute = lambda plan_step, step_index, total_steps: WorkerOutput(summary=plan_step.title, output="o")
+    critic = CriticAgent(model_cfg, prompts, force_mock=True)
+    workflow = build_workflow(architect, worker, critic, GenericSimulatorEnvironment())
+
+    max_steps = 40
+    final_state = workflow.invoke(
+        build_initial_state(
+            goal="Long run",
+            observation="Environment ready.",
+            max_steps=max_steps,
+            dynamic_replanning=True,
+            use_cot=False,
+            agentic_mode="codeact",
+        ),
+        config={"recursion_limit": recursion_limit_for(max_steps)},
+    )
+    final_state = materialize_state(final_state)
+
+    assert final_state["step_count"] == max_steps
+    assert [a["summary"] for a in final_state["action_history"]] == [f"s{i}" for i in range(max_steps)]
+    assert len(final_state["review_history"]) == max_steps + 1
+    assert isinstance(final_state["notes"], list)
@@ -0,0 +1,130 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import orjson
+
+from manus_three_agent.agents import CriticAgent
+from manus_three_agent.core import CascadeConfig, ModelConfig
+from manus_three_agent.eval.metrics import compute_episode_metrics
+from manus_three_agent.prompts import PromptTemplates
+from manus_three_agent.tracing import TraceCollector, TraceConfig
+from manus_three_agent.training import build_trajectory_dataset
+from manus_three_agent.utils.cascade import CascadeStats, confidence_of
+
+_PRICES = {"small": 0.1, "large": 2.0}
+
+
+def _critic(
+    monkeypatch,
+    replies: dict[str, str],
+    stats: CascadeStats,
+    tracer: TraceCollector,
+    *,
+    cheap_models: tuple[str, ...] = ("small",),
+    user_prompts: list[str] | None = None,
+):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.delenv("LLM_PROVIDER", raising=False)
+    model_cfg = ModelConfig(
+        model="large",
+        cascade=CascadeConfig(models=list(cheap_models), confidence_threshold=0.7, cost_per_1k_tokens=_PRICES),
+    )
+    critic = CriticAgent(model_cfg, PromptTemplates(config_dir="configs/prompts"), tracer=tracer, cascade_stats=stats)
+    calls: list[str] = []
+
+    def _create(**kwargs):
+        calls.append(kwargs["model"])
+        if user_prompts is not None:
+            user_prompts.append(kwargs["messages"][1]["content"])
+        usage = SimpleNamespace(prompt_tokens=400, completion_tokens=100, total_tokens=500)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=replies[kwargs["model"]]))],
+            usage=usage,
+        )
+
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=_create)))
+    monkeypatch.setattr(critic.llm, "_build_client", lambda: fake)
+    return critic, calls
+
+
+def _review(critic: CriticAgent):
+    return critic.review(
+        goal="g",
+        observation="ok",
+        action_history=[],
+        current_step_idx=1,
+        plan_length=3,
+        step=1,
+    )
+
+
+def test_confident_cheap_answer_is_kept_and_savings_are_traced(monkeypatch, recording_tracer) -> None:
+    stats = CascadeStats()
+    replies = {"small": '{"decision": "continue", "confidence": 0.9}'}
+    critic, calls = _critic(monkeypatch, replies, stats, recording_tracer)
+
+    assert _review(critic).decision == "continue"
+
+    assert calls == ["small"]
+    llm_call = next(e["payload"] for e in recording_tracer.events if e["event_type"] == "llm_call")
+    assert llm_call["cascade"] == {"tier": 0, "tiers": 2}
+    cascade = next(e["payload"] for e in recording_tracer.events if e["event_type"] == "model_cascade")
+    assert cascade["model"] == "small" and cascade["escalations"] == []
+    assert abs(cascade["saved_cost"] - (500 * 2.0 - 500 * 0.1) / 1000) < 1e-9
+    assert stats.snapshot()["critic"]["accepted_cheap"] == 1
+
+
+def test_invalid_or_unsure_cheap_answers_escalate_to_final_model(monkeypatch, recording_tracer) -> None:
+    stats = CascadeStats()
+    replies = {"small": '{"decision": "maybe"}', "large": '{"decision": "replan", "confidence": 0.2}'}
+    critic, calls = _critic(monkeypatch, replies, stats, recording_tracer)
+
+    assert _review(critic).decision == "replan"
+    replies["small"] = '{"decision": "end", "confidence": 0.4}'
+    assert _review(critic).decision == "replan"
+
+    # The invalid answer escalates straight away: cheap tiers get no parse retry.
+    assert calls == ["small", "large", "small", "large"]
+    outcomes = [e["payload"]["escalations"] for e in recording_tracer.events if e["event_type"] == "model_cascade"]
+    assert outcomes == [["invalid_output"], ["low_confidence"]]
+    snapshot = stats.snapshot()["critic"]
+    assert snapshot["escalation_rate"] == 1.0
+    assert snapshot["saved_cost"] < 0
+    assert compute_episode_metrics({}, stats.snapshot())["model_cascade"]["critic"]["calls"] == 2
+
+
+def test_confidence_of_reads_top_level_or_lowest_macro_action() -> None:
+    assert confidence_of({"confidence": 0.8}) == 0.8
+    assert confidence_of({"actions": [{"confidence": 0.9}, {"confidence": 0.3}, {}]}) == 0.3
+    assert confidence_of({"confidence": "high"}) is None
+
+
+def test_rejected_cheap_tier_is_not_exported_as_a_training_target(monkeypatch, tmp_path: Path) -> None:
+    tracer = TraceCollector(config=TraceConfig(enabled=True, base_dir=str(tmp_path / "traces")), run_id="run")
+    tracer.start_session(goal="g", environment={}, model_stack={}, runtime_config={})
+    replies = {"small": '{"decision": "end", "confidence": 0.4}', "large": '{"decision": "continue"}'}
+    critic, calls = _critic(monkeypatch, replies, CascadeStats(), tracer)
+
+    assert _review(critic).decision == "continue"
+    tracer.close(status="completed")
+
+    assert calls == ["small", "large"]
+    out_path = tmp_path / "train.jsonl"
+    build_trajectory_dataset(str(tmp_path / "traces"), str(out_path))
+    rows = [orjson.loads(line) for line in out_path.read_bytes().splitlines()]
+    targets = [row["messages"][-1]["content"] for row in rows if row["source_event"] == "llm_call"]
+    assert targets == ['{"decision":"continue"}']
+
+
+
+def test_confidence_is_requested_only_when_the_role_has_cheap_tiers(monkeypatch, recording_tracer) -> None:
+    replies = {"small": '{"decision": "continue", "confidence": 0.9}', "large": '{"decision": "continue"}'}
+    cascaded: list[str] = []
+    plain: list[str] = []
+    critic, _ = _critic(monkeypatch, replies, CascadeStats(), recording_tracer, user_prompts=cascaded)
+    _review(critic)
+    critic, _ = _critic(monkeypatch, replies, CascadeStats(), recording_tracer, cheap_models=(), user_prompts=plain)
+    _review(critic)
+
+    assert "- confidence: number from 0 to 1" in cascaded[0]
+    assert "confidence" not in plain[0]
@@ -0,0 +1,120 @@
+import json
+from types import SimpleNamespace
+
+from manus_three_agent.agents import ArchitectAgent
+from manus_three_agent.core import ModelConfig, PlanLibraryConfig
+from manus_three_agent.prompts import PromptTemplates
+from manus_three_agent.tracing import TraceCollector, TraceConfig
+from manus_three_agent.utils.io import write_json
+from manus_three_agent.utils.plan_library import PlanLibrary, PlanRecord, load_report_plans, load_trace_plans
+
+_STEPS = [{"title": "Search flights", "rationale": ""}, {"title": "Compare fares", "rationale": ""}]
+
+
+def _library() -> PlanLibrary:
+    return PlanLibrary(
+        [
+            PlanRecord(goal="Find the cheapest flight from Paris to Berlin", steps=_STEPS, agentic_mode="codeact", run_id="r1"),
+            PlanRecord(goal="Summarize the quarterly sales report", steps=[{"title": "Read report"}], run_id="r2"),
+            PlanRecord(goal="Write a haiku about autumn", steps=[{"title": "Draft"}], agentic_mode="react", run_id="r3"),
+        ]
+    )
+
+
+def test_lookup_ranks_similar_goals_and_filters_by_mode() -> None:
+    library = _library()
+
+    record, score = library.lookup("find the cheapest flight from Paris to Berlin")
+    assert record is not None and record.run_id == "r1"
+    assert score > 0.999
+
+    record, score = library.lookup("Find the cheapest flight from Paris to Rome")
+    assert record is not None and record.run_id == "r1"
+    assert 0.5 < score < 1.0
+
+    _, unrelated = library.lookup("Plan a garden layout")
+    assert unrelated < 0.3
+
+    record, _ = library.lookup("Write a haiku about autumn", agentic_mode="codeact")
+    assert record is None
+
+
+def test_library_loads_successful_reports_and_traces(tmp_path) -> None:
+    reports = tmp_path / "reports"
+    for run_id, success in (("ok", True), ("bad", False)):
+        write_json(
+            reports / "batch_x" / "episodes" / f"episode_{run_id}.json",
+            {
+                "config": {"agentic_mode": "codeact"},
+                "final_state": {"goal": f"goal {run_id}", "plan": _STEPS, "success": success},
+                "artifact": {"run_id": run_id},
+            },
+        )
+    assert [record.run_id for record in load_report_plans(reports)] == ["ok"]
+
+    traces = tmp_path / "traces"
+    tracer = TraceCollector(config=TraceConfig(enabled=True, base_dir=str(traces)), run_id="t1")
+    tracer.start_session(goal="traced goal", environment={}, model_stack={}, runtime_config={"agentic_mode": "react"})
+    tracer.log_event(event_type="architect_output", step=0, payload={"steps": [{"title": "old"}]})
+    tracer.log_event(event_type="architect_output", step=2, payload={"steps": _STEPS})
+    tracer.close(status="completed", summary={"success": True})
+    (traces / "half_written").mkdir()
+    (traces / "half_written" / "session.json").write_bytes(b'{"status": "compl')
+
+    records = load_trace_plans(traces)
+    assert len(records) == 1
+    assert records[0].goal == "traced goal" and records[0].steps == _STEPS
+    assert records[0].agentic_mode == "react"
+
+
+def test_architect_reuses_library_plan_without_model_call(recording_tracer) -> None:
+    library = _library()
+    architect = ArchitectAgent(
+        ModelConfig(model="mock"),
+        PromptTemplates(config_dir="configs/prompts"),
+        tracer=recording_tracer,
+        force_mock=True,
+        plan_library=library,
+    )
+
+    reused = architect.plan(
+        goal="Find the cheapest flight from Paris to Berlin", observation="", action_history=[], use_cot=False, step=0
+    )
+    fallback = architect.plan(goal="Plan a garden layout", observation="", action_history=[], use_cot=False, step=0)
+
+    assert [step.title for step in reused.steps] == ["Search flights", "Compare fares"]
+    assert fallback.steps[0].title == "Clarify objective and constraints"
+    events = [e["payload"] for e in recording_tracer.events if e["event_type"] == "plan_library"]
+    assert [e["outcome"] for e in events] == ["reuse", "miss"]
+    assert events[0]["match_run_id"] == "r1" and events[0]["latency_ms"] >= 0
+    assert events[-1]["hit_rate"] == 0.5
+
+
+def test_architect_warm_starts_prompt_from_similar_plan(monkeypatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    prompts_seen: list[str] = []
+    architect = ArchitectAgent(
+        ModelConfig(model="m"),
+        PromptTemplates(config_dir="configs/prompts"),
+        plan_library=_library(),
+        plan_library_config=PlanLibraryConfig(reuse_threshold=0.99, warm_start_threshold=0.3),
+    )
+
+    def _create(**kwargs):
+        prompts_seen.append(kwargs["messages"][1]["content"])
+        content = json.dumps({"steps": [{"title": "Search flights to Rome"}]})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+    monkeypatch.setattr(
+        architect.llm,
+        "_build_client",
+        lambda: SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=_create))),
+    )
+
+    plan = architect.plan(
+        goal="Find the cheapest flight from Paris to Rome", observation="", action_history=[], use_cot=False, step=0
+    )
+
+    assert plan.steps[0].title == "Search flights to Rome"
+    assert "Similar solved goal: Find the cheapest flight from Paris to Berlin" in prompts_seen[0]
+    assert "Compare fares" in prompts_seen[0]
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from openai import InternalServerError, RateLimitError
+
+from manus_three_agent.core import LLMRetryConfig, RateLimitConfig
+from manus_three_agent.utils.deadline import Deadline, DeadlineExceeded
+from manus_three_agent.utils.llm import LLMClient
+from manus_three_agent.utils.llm_runtime import LLMRuntime
+from manus_three_agent.utils.rate_limit import RateLimiterRegistry, TokenBucket, retry_after_seconds
+
+_REQUEST = httpx.Request("POST", "https://llm.test/v1/chat/completions")
+
+
+@pytest.fixture
+def limited_client(fake_llm_client):
+    def _build(completions, registry: RateLimiterRegistry, events: list[dict]) -> LLMClient:
+        runtime = LLMRuntime(rate_limiter=registry, retry=LLMRetryConfig(backoff_min_seconds=0.0))
+        return fake_llm_client(completions, events=events, runtime=runtime)
+
+    return _build
+
+
+def test_token_bucket_queues_reservations_beyond_capacity() -> None:
+    bucket = TokenBucket(rate_per_second=100.0, capacity=10.0)
+
+    assert bucket.reserve(10) == 0.0
+    assert abs(bucket.reserve(5) - 0.05) < 0.01
+    assert abs(bucket.reserve(5) - 0.10) < 0.01
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_deadline_aborted_acquire_refunds_its_token_reservation(use_async: bool) -> None:
+    limiter = RateLimiterRegistry(RateLimitConfig(enabled=True, tokens_per_minute=600)).get("p", "m")
+
+    with pytest.raises(DeadlineExceeded):
+        if use_async:
+            asyncio.run(limiter.aacquire(1200, Deadline(0.05)))
+        else:
+            limiter.acquire(1200, Deadline(0.05))
+
+    assert limiter.tokens.reserve(600) == 0.0
+    assert limiter.snapshot()["in_flight"] == 0
+
+
+def test_retry_after_header_forms() -> None:
+    assert retry_after_seconds({"retry-after-ms": "250"}) == 0.25
+    assert retry_after_seconds({"retry-after": "3"}) == 3.0
+    assert retry_after_seconds({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert retry_after_seconds({}) is None
+
+
+def test_concurrency_limit_caps_in_flight_requests(limited_client) -> None:
+    registry = RateLimiterRegistry(RateLimitConfig(enabled=True, initial_concurrency=2, max_concurrency=2))
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def _create(**kwargs):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.03)
+        with lock:
+            state["active"] -= 1
+        return '{"ok": true}'
+
+    events: list[dict] = []
+    client = limited_client(_create, registry, events)
+    threads = [
+        threading.Thread(target=client.chat_json, kwargs={"model": "m", "system_prompt": "s", "user_prompt": str(i)})
+        for i in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert state["peak"] == 2
+    assert len(events) == 6
+    assert max(e["rate_limit"]["wait_ms"] for e in events) > 0
+
+
+def test_rate_limit_response_shrinks_concurrency_and_honours_retry_after(limited_client) -> None:
+    registry = RateLimiterRegistry(RateLimitConfig(enabled=True, initial_concurrency=8))
+    throttled = RateLimitError(
+        "slow down",
+        response=httpx.Response(429, headers={"retry-after-ms": "80"}, request=_REQUEST),
+        body=None,
+    )
+    outcomes = [throttled, '{"ok": true}']
+    events: list[dict] = []
+    completions = lambda **_: _raise_or_return(outcomes.pop(0))
+    client = limited_client(completions, registry, events)
+
+    started = time.monotonic()
+    assert client.chat_json(model="m", system_prompt="s", user_prompt="u") == {"ok": True}
+
+    assert time.monotonic() - started >= 0.08
+    assert [e["status"] for e in events] == ["rate_limited", "success"]
+    limiter = registry.get("openai", "m")
+    assert limiter.rate_limited == 1
+    assert 4.0 <= limiter.limit < 4.5
+
+
+def test_failures_never_grow_the_limit_and_server_errors_shrink_it(limited_client) -> None:
+    registry = RateLimiterRegistry(RateLimitConfig(enabled=True, initial_concurrency=8))
+    unavailable = InternalServerError("unavailable", response=httpx.Response(503, request=_REQUEST), body=None)
+    outcomes = [unavailable, '{"ok": true}']
+    events: list[dict] = []
+    completions = lambda **_: _raise_or_return(outcomes.pop(0))
+    client = limited_client(completions, registry, events)
+
+    assert client.chat_json(model="m", system_prompt="s", user_prompt="u") == {"ok": True}
+    limiter = registry.get("openai", "m")
+    assert limiter.failures == 1 and limiter.rate_limited == 0
+    assert limiter.limit == 4.25
+
+    limiter.in_flight += 1
+    limiter.complete(latency_s=0.0, failed=True)
+    assert limiter.limit == 4.25 and limiter.failures == 2
+
+
+def _raise_or_return(outcome):
+    if isinstance(outcome, Exception):
+        raise outcome
+    return outcome
@@ -0,0 +1,137 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from manus_three_agent.agents import ArchitectAgent, CriticAgent, WorkerAgent
+from manus_three_agent.core import ModelConfig, build_initial_state
+from manus_three_agent.graph import build_workflow
+from manus_three_agent.prompts import PromptTemplates
+from manus_three_agent.tools import build_default_tool_registry
+from manus_three_agent.tracing import TraceCollector, TraceConfig
+from manus_three_agent.utils.llm import LLMClient
+from manus_three_agent.utils.replay import ReplayDivergenceError, ReplayStore, find_replay_run_dir
+
+_RESPONSES = {
+    "ArchitectAgent": {"steps": [{"title": "Gather", "rationale": "r"}, {"title": "Answer", "rationale": "r"}]},
+    "WorkerAgent": {"summary": "s", "output": "o", "is_final": False, "final_answer": "", "tool_requests": []},
+    "CriticAgent": {"decision": "continue", "feedback": "ok", "should_succeed": False},
+}
+
+
+def _write_events(run_dir: Path, events: list[dict]) -> None:
+    run_dir.mkdir(parents=True)
+    with open(run_dir / "events.jsonl", "wb") as f:
+        for event in events:
+            f.write(orjson.dumps(event))
+            f.write(b"\n")
+
+
+def _llm_event(agent: str, step: int, user_prompt: str, output: dict) -> dict:
+    return {
+        "run_id": "rec",
+        "step": step,
+        "event_type": "llm_call",
+        "payload": {
+            "agent": agent,
+            "step": step,
+            "status": "success",
+            "system_prompt": "sys",
+            "user_prompt": user_prompt,
+            "raw_response": orjson.dumps(output).decode("utf-8"),
+            "parsed_output": output,
+        },
+    }
+
+
+def test_replay_store_matches_exact_then_falls_back_to_slot(tmp_path: Path) -> None:
+    _write_events(
+        tmp_path / "rec",
+        [
+            _llm_event("critic", 1, "u1", {"decision": "continue"}),
+            _llm_event("critic", 2, "u2", {"decision": "end"}),
+        ],
+    )
+    store = ReplayStore.from_run_dir(tmp_path / "rec")
+
+    entry, match = store.lookup(agent="critic", step=1, system_prompt="sys", user_prompt="u1")
+    assert match == "exact"
+    assert entry["parsed_output"] == {"decision": "continue"}
+
+    entry, match = store.lookup(agent="critic", step=2, system_prompt="sys", user_prompt="edited")
+    assert match == "slot"
+    assert entry["parsed_output"] == {"decision": "end"}
+    assert store.stats()["diverged"] == 1
+
+
+def test_replay_run_lookup_matches_the_exact_task_id(tmp_path: Path) -> None:
+    for name in ("20260101T000000Z_x_1", "20260102T000000Z_1", "20260103T000000Z_x_1"):
+        (tmp_path / name).mkdir()
+
+    assert find_replay_run_dir(tmp_path, "1") == tmp_path / "20260102T000000Z_1"
+    assert find_replay_run_dir(tmp_path, "x_1") == tmp_path / "20260103T000000Z_x_1"
+    assert find_replay_run_dir(tmp_path, "_1") is None
+
+
+def test_strict_replay_raises_on_divergence(tmp_path: Path) -> None:
+    _write_events(tmp_path / "rec", [_llm_event("critic", 1, "u1", {"decision": "continue"})])
+    store = ReplayStore.from_run_dir(tmp_path / "rec", strict=True)
+
+    with pytest.raises(ReplayDivergenceError):
+        store.lookup(agent="critic", step=1, system_prompt="sys", user_prompt="changed")
+
+
+def _run_traced_episode(trace_dir: Path, run_id: str, replay: ReplayStore | None = None) -> dict:
+    prompts = PromptTemplates(config_dir="configs/prompts")
+    model_cfg = ModelConfig(model="fake", temperature=0.0)
+    tracer = TraceCollector(config=TraceConfig(enabled=True, base_dir=str(trace_dir)), run_id=run_id)
+    tracer.start_session(goal="g", environment={}, model_stack={}, runtime_config={})
+    architect = ArchitectAgent(model_cfg, prompts, tracer=tracer, replay=replay)
+    worker = WorkerAgent(model_cfg, prompts, build_default_tool_registry(), tracer=tracer, replay=replay)
+    critic = CriticAgent(model_cfg, prompts, tracer=tracer, replay=replay)
+    workflow = build_workflow(architect, worker, critic, tracer=tracer)
+    state = build_initial_state(
+        goal="Write a short report",
+        observation="Environment ready.",
+        max_steps=4,
+        dynamic_replanning=True,
+        use_cot=False,
+        agentic_mode="codeact",
+    )
+    final_state = workflow.invoke(state)
+    tracer.close(status="completed")
+    return final_state
+
+
+def test_episode_replays_offline_from_recorded_trace(monkeypatch, tmp_path: Path) -> None:
+    calls: list[str] = []
+
+    def _create(**kwargs):
+        system_prompt = kwargs["messages"][0]["content"]
+        agent = next(name for name in _RESPONSES if name in system_prompt)
+        calls.append(agent)
+        content = orjson.dumps(_RESPONSES[agent]).decode("utf-8")
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+    fake_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=_create)))
+    monkeypatch.setattr(LLMClient, "_build_client", lambda self: fake_client)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    recorded = _run_traced_episode(tmp_path, "rec")
+    live_calls = len(calls)
+    assert live_calls > 0
+
+    monkeypatch.delenv("OPENAI_API_KEY")
+    monkeypatch.delenv("HF_TOKEN", raising=False)
+    replay = ReplayStore.from_run_dir(tmp_path / "rec", strict=True)
+    replayed = _run_traced_episode(tmp_path, "replayed", replay=replay)
+
+    assert len(calls) == live_calls
+    assert replayed["action_history"] == recorded["action_history"]
+    assert replayed["review_history"] == recorded["review_history"]
+    assert replay.stats()["served"] == live_calls
+    assert replay.stats()["unused"] == 0
+
+    events = (tmp_path / "replayed" / "events.jsonl").read_text(encoding="utf-8").splitlines()
+    llm_events = [orjson.loads(line)["payload"] for line in events if '"llm_call"' in line]
+    assert all(event["replay"]["match"] == "exact" for event in llm_events)
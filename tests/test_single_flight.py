@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import time
+
+from manus_three_agent.core import SingleFlightConfig
+from manus_three_agent.utils.llm_runtime import LLMRuntime
+from manus_three_agent.utils.single_flight import SingleFlight
+
+_GENERATION = {"temperature": 0}
+
+
+class _SlowCompletions:
+    def __init__(self) -> None:
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def create(self, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.1)
+        return '{"answer": 42}'
+
+
+class _SlowAsyncCompletions(_SlowCompletions):
+    async def create(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return '{"answer": 42}'
+
+
+def test_concurrent_threads_share_one_upstream_call(fake_llm_client) -> None:
+    events: list[dict] = []
+    group = SingleFlight(SingleFlightConfig(enabled=True))
+    completions = _SlowCompletions()
+    client = fake_llm_client(completions, events=events, runtime=LLMRuntime(single_flight=group))
+    results: list[dict] = []
+
+    def _call() -> None:
+        results.append(client.chat_json(model="m", system_prompt="s", user_prompt="u", generation_config=_GENERATION))
+
+    threads = [threading.Thread(target=_call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert completions.calls == 1
+    assert results == [{"answer": 42}] * 4
+    roles = sorted(e["single_flight"]["role"] for e in events)
+    assert roles == ["follower", "follower", "follower", "leader"]
+    leader = next(e for e in events if e["single_flight"]["role"] == "leader")
+    assert leader["single_flight"]["followers"] == 3 and leader["usage"]["total_tokens"] == 15
+    assert all(e["usage"] == {} for e in events if e["single_flight"]["role"] == "follower")
+    assert group.stats() == {"leaders": 1, "followers": 3, "in_flight": 0}
+
+
+def test_asyncio_callers_share_one_upstream_call(fake_llm_client) -> None:
+    events: list[dict] = []
+    group = SingleFlight(SingleFlightConfig(enabled=True))
+    completions = _SlowAsyncCompletions()
+    client = fake_llm_client(completions, events=events, runtime=LLMRuntime(single_flight=group))
+
+    async def _main() -> list[dict]:
+        calls = [
+            client.achat_json(model="m", system_prompt="s", user_prompt="u", generation_config=_GENERATION)
+            for _ in range(3)
+        ]
+        return await asyncio.gather(*calls)
+
+    assert asyncio.run(_main()) == [{"answer": 42}] * 3
+    assert completions.calls == 1
+    assert sum(e["single_flight"]["role"] == "follower" for e in events) == 2
+
+
+def test_sampled_requests_are_not_coalesced_by_default(fake_llm_client) -> None:
+    events: list[dict] = []
+    group = SingleFlight(SingleFlightConfig(enabled=True))
+    completions = _SlowCompletions()
+    client = fake_llm_client(completions, events=events, runtime=LLMRuntime(single_flight=group))
+
+    threads = [
+        threading.Thread(
+            target=client.chat_json,
+            kwargs={"model": "m", "system_prompt": "s", "user_prompt": "u", "generation_config": {"temperature": 0.7}},
+        )
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert completions.calls == 2
+    assert all("single_flight" not in e for e in events)
@@ -0,0 +1,129 @@
+import threading
+import time
+
+from manus_three_agent.agents import ArchitectAgent, CriticAgent, WorkerAgent
+from manus_three_agent.core import CriticOutput, ModelConfig, build_initial_state, materialize_state
+from manus_three_agent.environments.simulator import GenericSimulatorEnvironment
+from manus_three_agent.eval.metrics import compute_episode_metrics
+from manus_three_agent.graph import build_workflow
+from manus_three_agent.prompts import PromptTemplates
+from manus_three_agent.tools import build_default_tool_registry
+from manus_three_agent.tracing import TraceCollector
+from manus_three_agent.utils.deadline import DeadlineExceeded
+
+
+def _run(*, speculative: bool, critic: CriticAgent | None = None, tracer: TraceCollector | None = None) -> dict:
+    prompts = PromptTemplates(config_dir="configs/prompts")
+    model_cfg = ModelConfig(model="mock")
+    workflow = build_workflow(
+        ArchitectAgent(model_cfg, prompts, force_mock=True),
+        WorkerAgent(model_cfg, prompts, build_default_tool_registry(), force_mock=True),
+        critic or CriticAgent(model_cfg, prompts, force_mock=True),
+        GenericSimulatorEnvironment(),
+        tracer,
+    )
+    final_state = workflow.invoke(
+        build_initial_state(
+            goal="Draft a reproducibility checklist",
+            observation="Environment ready.",
+            max_steps=8,
+            dynamic_replanning=True,
+            use_cot=False,
+            agentic_mode="codeact",
+            speculative=speculative,
+        )
+    )
+    return materialize_state(final_state)
+
+
+def test_speculative_run_commits_proposals_and_matches_serial_run(recording_tracer) -> None:
+
+    serial = _run(speculative=False)
+    speculative = _run(speculative=True, tracer=recording_tracer)
+
+    assert speculative["action_history"] == serial["action_history"]
+    assert speculative["final_answer"] == serial["final_answer"]
+    metrics = compute_episode_metrics(speculative)
+    assert metrics["speculation_attempts"] == 2
+    assert metrics["speculation_hit_rate"] == 1.0
+    worker_inputs = [e["payload"]["speculative"] for e in recording_tracer.events if e["event_type"] == "worker_input"]
+    assert worker_inputs == [False, True, True]
+
+
+def test_speculation_is_discarded_on_replan(recording_tracer) -> None:
+    critic = CriticAgent(ModelConfig(model="mock"), PromptTemplates(config_dir="configs/prompts"), force_mock=True)
+    decisions = iter(["replan"])
+    original = critic.review
+    critic.review = lambda **kwargs: (
+        CriticOutput(decision=next(decisions), feedback="retry") if kwargs["step"] == 1 else original(**kwargs)
+    )
+
+    final_state = _run(speculative=True, critic=critic, tracer=recording_tracer)
+
+    outcomes = [e["payload"]["outcome"] for e in recording_tracer.events if e["event_type"] == "speculation"]
+    assert outcomes[0] == "discarded"
+    assert "committed" in outcomes
+    assert final_state["speculation_misses"] == 1
+    assert final_state["success"] is True
+
+
+def test_speculation_is_joined_when_the_review_raises() -> None:
+    prompts = PromptTemplates(config_dir="configs/prompts")
+    model_cfg = ModelConfig(model="mock")
+    worker = WorkerAgent(model_cfg, prompts, build_default_tool_registry(), force_mock=True)
+    critic = CriticAgent(model_cfg, prompts, force_mock=True)
+    finished: list[int] = []
+    propose = worker.propose
+
+    def _slow_propose(**kwargs):
+        time.sleep(0.2)
+        finished.append(kwargs["step"])
+        return propose(**kwargs)
+
+    def _review(**kwargs):
+        raise DeadlineExceeded("episode deadline of 0.1s exceeded")
+
+    worker.propose = _slow_propose
+    critic.review = _review
+    workflow = build_workflow(
+        ArchitectAgent(model_cfg, prompts, force_mock=True),
+        worker,
+        critic,
+        GenericSimulatorEnvironment(),
+    )
+    final_state = materialize_state(
+        workflow.invoke(
+            build_initial_state(
+                goal="Draft a reproducibility checklist",
+                observation="Environment ready.",
+                max_steps=8,
+                dynamic_replanning=True,
+                use_cot=False,
+                agentic_mode="codeact",
+                speculative=True,
+            )
+        )
+    )
+
+    assert final_state["stop_reason"] == "deadline_exceeded"
+    assert finished == [0, 1]
+
+
+def test_worker_close_stops_its_speculation_thread() -> None:
+    prompts = PromptTemplates(config_dir="configs/prompts")
+    worker = WorkerAgent(ModelConfig(model="mock"), prompts, build_default_tool_registry(), force_mock=True)
+    threads: list[threading.Thread] = []
+    release = threading.Event()
+    worker.propose = lambda **kwargs: threads.append(threading.current_thread()) or release.wait(5.0)
+
+    running = worker.propose_in_background(step=0)
+    queued = worker.propose_in_background(step=1)
+    while not threads:
+        time.sleep(0.01)
+    worker.close()
+    release.set()
+
+    assert queued.cancelled()
+    running.result(timeout=5.0)
+    threads[0].join(timeout=5.0)
+    assert not threads[0].is_alive()
@@ -0,0 +1,84 @@
+import threading
+import time
+
+from manus_three_agent.agents import WorkerAgent
+from manus_three_agent.core import ModelConfig
+from manus_three_agent.core.schemas import ToolRequest, WorkerOutput
+from manus_three_agent.prompts import PromptTemplates
+from manus_three_agent.tools import ToolRegistry
+
+
+def _sleepy_registry(barrier: threading.Barrier | None = None) -> ToolRegistry:
+    registry = ToolRegistry()
+
+    def _sleep(arguments: dict) -> dict:
+        if barrier is not None:
+            barrier.wait(timeout=2)
+        time.sleep(float(arguments["seconds"]))
+        return {"slept": arguments["seconds"]}
+
+    registry.register("sleep", _sleep)
+    registry.register("slow", _sleep, timeout_seconds=0.05)
+    return registry
+
+
+def test_call_many_runs_concurrently_and_preserves_order() -> None:
+    registry = _sleepy_registry(barrier=threading.Barrier(3))
+    requests = [("sleep", {"seconds": 0.03}), ("sleep", {"seconds": 0.0}), ("sleep", {"seconds": 0.01})]
+
+    results = registry.call_many(requests, max_workers=3)
+
+    assert [r["output"]["slept"] for r, _ in results] == [0.03, 0.0, 0.01]
+    assert all(r["ok"] for r, _ in results)
+
+
+def test_call_many_applies_per_tool_timeout() -> None:
+    registry = _sleepy_registry()
+
+    results = registry.call_many([("slow", {"seconds": 0.5}), ("sleep", {"seconds": 0.0})], max_workers=2)
+
+    assert results[0][0]["ok"] is False
+    assert results[0][0]["error"].startswith("timeout:")
+    assert results[1][0]["ok"] is True
+
+
+def test_queued_calls_start_their_timeout_when_dispatched() -> None:
+    registry = ToolRegistry()
+    registry.register("work", lambda arguments: time.sleep(0.12) or {"i": arguments["i"]}, timeout_seconds=0.2)
+    registry.register("hang", lambda arguments: time.sleep(1.0) or {}, timeout_seconds=0.1)
+
+    results = registry.call_many([("work", {"i": i}) for i in range(4)], max_workers=2)
+    assert [r["output"]["i"] for r, _ in results] == [0, 1, 2, 3]
+    assert all(latency < 200 for _, latency in results)
+
+    started = time.monotonic()
+    results = registry.call_many([("hang", {}), ("hang", {}), ("work", {"i": 9})], max_workers=2)
+    assert [r["ok"] for r, _ in results] == [False, False, True]
+    assert time.monotonic() - started < 0.5
+
+
+def test_worker_traces_tool_calls_in_request_order(recording_tracer) -> None:
+    worker = WorkerAgent(
+        ModelConfig(model="mock"),
+        PromptTemplates(config_dir="configs/prompts"),
+        _sleepy_registry(),
+        tracer=recording_tracer,
+        force_mock=True,
+        tool_concurrency=4,
+    )
+    output = WorkerOutput(
+        summary="s",
+        output="o",
+        tool_requests=[
+            ToolRequest(name="sleep", arguments={"seconds": 0.02}),
+            ToolRequest(name="sleep", arguments={"seconds": 0.0}),
+            ToolRequest(name="missing", arguments={}),
+        ],
+    )
+
+    result = worker._run_tools(output, step=3)
+
+    tool_events = [e for e in recording_tracer.events if e["event_type"] == "tool_call"]
+    assert [e["payload"]["index"] for e in tool_events] == [0, 1, 2]
+    assert [e["payload"]["name"] for e in tool_events] == ["sleep", "sleep", "missing"]
+    assert "tool_not_found:missing" in result.output
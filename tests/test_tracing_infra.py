@@ -1,8 +1,10 @@
 from pathlib import Path
 
 import orjson
+import pytest
 
-from manus_three_agent.tracing import TraceCollector, TraceConfig
+from manus_three_agent.tracing import TraceCollector, TraceConfig, event_segment_paths, iter_run_events
+from manus_three_agent.tracing.writer import TraceWriter
 
 
 def test_trace_collector_writes_session_and_events(tmp_path: Path) -> None:
@@ -32,3 +34,93 @@ def test_trace_collector_writes_session_and_events(tmp_path: Path) -> None:
 
     lines = events_path.read_text(encoding="utf-8").strip().splitlines()
     assert len(lines) == 1
+
+
+def test_trace_writer_buffers_until_flush_threshold(tmp_path: Path) -> None:
+    writer = TraceWriter(base_dir=str(tmp_path), run_id="buffered", flush_bytes=10_000, flush_interval_seconds=60)
+    writer.append_event({"i": 0})
+    writer.append_event({"i": 1})
+    assert not writer.events_path.exists()
+
+    writer.flush()
+    assert len(writer.events_path.read_text(encoding="utf-8").splitlines()) == 2
+
+    writer.append_event({"i": 2})
+    writer.close()
+    assert len(writer.events_path.read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_trace_writer_unbuffered_writes_through(tmp_path: Path) -> None:
+    writer = TraceWriter(base_dir=str(tmp_path), run_id="direct", flush_bytes=0)
+    writer.append_event({"i": 0})
+    assert len(writer.events_path.read_text(encoding="utf-8").splitlines()) == 1
+    writer.close()
+
+
+def test_background_trace_writer_preserves_order(tmp_path: Path) -> None:
+    tracer = TraceCollector(
+        config=TraceConfig(enabled=True, base_dir=str(tmp_path), background_writer=True, queue_size=8),
+        run_id="bg",
+    )
+    tracer.start_session(goal="g", environment={}, model_stack={}, runtime_config={})
+    for i in range(200):
+        tracer.log_event(event_type="unit", step=i, payload={"i": i})
+    tracer.close(status="completed")
+
+    lines = (tmp_path / "bg" / "events.jsonl").read_text(encoding="utf-8").strip().splitlines()
+    assert [orjson.loads(line)["payload"]["i"] for line in lines] == list(range(200))
+    session = orjson.loads((tmp_path / "bg" / "session.json").read_bytes())
+    assert session["summary"]["event_count"] == 200
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_trace_writer_drops_events_after_close(tmp_path: Path, background: bool) -> None:
+    writer = TraceWriter(base_dir=str(tmp_path), run_id="late", flush_bytes=0, background=background)
+    writer.append_event({"i": 0})
+    writer.close()
+    writer.append_event({"i": 1})
+    writer.flush()
+
+    assert writer.dropped_events == 1
+    assert writer._handle is None
+    assert len(writer.events_path.read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_background_write_error_surfaces_without_hanging(tmp_path: Path, monkeypatch) -> None:
+    writer = TraceWriter(base_dir=str(tmp_path), run_id="broken", flush_bytes=0, background=True, queue_size=2)
+
+    def _fail(chunk: bytes, codec: str) -> bytes:
+        raise OSError("disk full")
+
+    monkeypatch.setattr("manus_three_agent.tracing.writer.compress_chunk", _fail)
+    for i in range(10):
+        writer.append_event({"i": i})
+    with pytest.raises(RuntimeError, match="trace writer failed") as excinfo:
+        writer.flush()
+    assert isinstance(excinfo.value.__cause__, OSError)
+    assert writer.dropped_events == 10
+    writer.close()
+
+
+@pytest.mark.parametrize("codec", ["gzip", "zstd"])
+def test_compressed_rotated_segments_read_back_in_order(tmp_path: Path, codec: str) -> None:
+    tracer = TraceCollector(
+        config=TraceConfig(
+            enabled=True,
+            base_dir=str(tmp_path),
+            compression=codec,
+            segment_max_bytes=200,
+            flush_bytes=0,
+        ),
+        run_id="zipped",
+    )
+    tracer.start_session(goal="g", environment={}, model_stack={}, runtime_config={})
+    for i in range(50):
+        tracer.log_event(event_type="unit", step=i, payload={"i": i, "text": "x" * 40})
+    tracer.close(status="completed")
+
+    run_dir = tmp_path / "zipped"
+    segments = event_segment_paths(run_dir)
+    assert len(segments) > 1
+    assert all(p.name.startswith("events.") and p.name.endswith((".gz", ".zst")) for p in segments)
+    assert [event["payload"]["i"] for event in iter_run_events(run_dir)] == list(range(50))
@@ -1,8 +1,10 @@
+import shutil
 from pathlib import Path
 
 import orjson
 
-from manus_three_agent.training.build_sft_data import build_trajectory_dataset
+from manus_three_agent.tracing import TraceCollector, TraceConfig
+from manus_three_agent.training import build_trajectory_dataset, build_trajectory_dataset_incremental, incremental
 
 
 def test_build_trajectory_dataset_from_llm_events(tmp_path: Path) -> None:
@@ -15,6 +17,7 @@ def test_build_trajectory_dataset_from_llm_events(tmp_path: Path) -> None:
         "event_type": "llm_call",
         "payload": {
             "agent": "architect",
+            "status": "success",
             "system_prompt": "sys",
             "user_prompt": "usr",
             "parsed_output": {"steps": [{"title": "A", "rationale": "B"}]},
@@ -52,3 +55,151 @@ def test_build_trajectory_dataset_from_llm_events(tmp_path: Path) -> None:
     row = orjson.loads(lines[0].encode("utf-8"))
     assert row["role"] == "architect"
     assert len(row["messages"]) == 3
+
+
+def test_build_trajectory_dataset_reads_compressed_segments(tmp_path: Path) -> None:
+    tracer = TraceCollector(
+        config=TraceConfig(enabled=True, base_dir=str(tmp_path / "traces"), compression="gzip", flush_bytes=0),
+        run_id="runZ",
+    )
+    tracer.start_session(goal="g", environment={}, model_stack={}, runtime_config={})
+    tracer.log_event(
+        event_type="llm_call",
+        step=0,
+        payload={
+            "agent": "critic",
+            "status": "success",
+            "system_prompt": "s",
+            "user_prompt": "u",
+            "parsed_output": {"decision": "end"},
+        },
+    )
+    tracer.close(status="completed")
+    assert (tmp_path / "traces" / "runZ" / "events.jsonl.gz").exists()
+
+    summary = build_trajectory_dataset(str(tmp_path / "traces"), str(tmp_path / "out.jsonl"))
+    assert summary["num_records"] == 1
+
+
+def test_build_trajectory_dataset_streams_and_reports_progress(tmp_path: Path) -> None:
+    for idx in range(5):
+        tracer = TraceCollector(
+            config=TraceConfig(enabled=True, base_dir=str(tmp_path / "traces")),
+            run_id=f"run{idx}",
+        )
+        tracer.start_session(goal="g", environment={}, model_stack={}, runtime_config={})
+        tracer.log_event(event_type="critic_input", step=1, payload={"observation": "o"})
+        tracer.log_event(event_type="critic_output", step=1, payload={"decision": "end"})
+        tracer.close(status="completed")
+
+    updates: list[dict] = []
+    summary = build_trajectory_dataset(
+        str(tmp_path / "traces"),
+        str(tmp_path / "out.jsonl"),
+        progress=updates.append,
+        progress_every=2,
+    )
+
+    assert summary["num_records"] == 5
+    assert summary["num_runs"] == 5
+    assert summary["records_per_second"] > 0
+    assert [u["runs_done"] for u in updates] == [2, 4, 5]
+    assert not (tmp_path / ".out.jsonl.tmp").exists()
+    first = orjson.loads((tmp_path / "out.jsonl").read_bytes().splitlines()[0])
+    assert orjson.loads(first["messages"][1]["content"]) == {"observation": "o"}
+
+
+def _write_run(trace_dir: Path, run_id: str, decisions: list[str]) -> None:
+    tracer = TraceCollector(config=TraceConfig(enabled=True, base_dir=str(trace_dir)), run_id=run_id)
+    tracer.start_session(goal="g", environment={}, model_stack={}, runtime_config={})
+    for step, decision in enumerate(decisions):
+        tracer.log_event(event_type="critic_input", step=step, payload={"run": run_id})
+        tracer.log_event(event_type="critic_output", step=step, payload={"decision": decision})
+    tracer.close(status="completed")
+
+
+def test_incremental_export_skips_unchanged_runs(tmp_path: Path) -> None:
+    traces = tmp_path / "traces"
+    out_path = tmp_path / "out.jsonl"
+    _write_run(traces, "runA", ["continue", "end"])
+    _write_run(traces, "runB", ["end"])
+
+    first = build_trajectory_dataset_incremental(str(traces), str(out_path), workers=2)
+    assert first["processed_runs"] == 2
+    assert first["num_records"] == 3
+    full = build_trajectory_dataset(str(traces), str(tmp_path / "full.jsonl"))
+    assert out_path.read_bytes() == (tmp_path / "full.jsonl").read_bytes()
+    assert full["num_records"] == 3
+
+    _write_run(traces, "runC", ["end"])
+    second = build_trajectory_dataset_incremental(str(traces), str(out_path))
+    assert second["processed_runs"] == 1
+    assert second["skipped_runs"] == 2
+    assert second["num_records"] == 4
+
+    shutil.rmtree(traces / "runA")
+    third = build_trajectory_dataset_incremental(str(traces), str(out_path))
+    assert third["processed_runs"] == 0
+    assert third["removed_runs"] == 1
+    rows = [orjson.loads(line) for line in out_path.read_bytes().splitlines()]
+    assert [row["run_id"] for row in rows] == ["runB", "runC"]
+
+
+def test_run_growing_during_export_is_exported_again(tmp_path: Path, monkeypatch) -> None:
+    traces = tmp_path / "traces"
+    out_path = tmp_path / "out.jsonl"
+    _write_run(traces, "runA", ["continue"])
+    export_run = incremental._export_run
+
+    def _export_then_append(run_dir: str, shard_path: str) -> int:
+        count = export_run(run_dir, shard_path)
+        tracer = TraceCollector(config=TraceConfig(enabled=True, base_dir=str(traces)), run_id="runA")
+        tracer.log_event(event_type="critic_input", step=1, payload={"run": "runA"})
+        tracer.log_event(event_type="critic_output", step=1, payload={"decision": "end"})
+        tracer.close(status="completed")
+        return count
+
+    monkeypatch.setattr(incremental, "_export_run", _export_then_append)
+    assert build_trajectory_dataset_incremental(str(traces), str(out_path))["num_records"] == 1
+
+    monkeypatch.setattr(incremental, "_export_run", export_run)
+    second = build_trajectory_dataset_incremental(str(traces), str(out_path))
+    assert second["processed_runs"] == 1
+    assert second["num_records"] == 2
+
+
+def test_discarded_speculative_worker_calls_are_not_exported(tmp_path: Path) -> None:
+    tracer = TraceCollector(config=TraceConfig(enabled=True, base_dir=str(tmp_path / "traces")), run_id="runS")
+    tracer.start_session(goal="g", environment={}, model_stack={}, runtime_config={})
+    for step, outcome in ((1, "discarded"), (2, "committed")):
+        tracer.log_event(
+            event_type="llm_call",
+            step=step,
+            payload={
+                "agent": "worker",
+                "status": "success",
+                "speculative": True,
+                "system_prompt": "s",
+                "user_prompt": f"step {step}",
+                "parsed_output": {"summary": f"action {step}"},
+            },
+        )
+        tracer.log_event(event_type="speculation", step=step, payload={"outcome": outcome})
+    tracer.log_event(
+        event_type="llm_call",
+        step=3,
+        payload={
+            "agent": "worker",
+            "status": "success",
+            "speculative": True,
+            "system_prompt": "s",
+            "user_prompt": "never resolved",
+            "parsed_output": {"summary": "the review raised before this proposal was resolved"},
+        },
+    )
+    tracer.close(status="completed")
+
+    out_path = tmp_path / "out.jsonl"
+    build_trajectory_dataset(str(tmp_path / "traces"), str(out_path))
+    rows = [orjson.loads(line) for line in out_path.read_bytes().splitlines()]
+    assert [(row["step"], row["source_event"]) for row in rows] == [(2, "llm_call")]